@@ -0,0 +1,72 @@
+"""
+Measure the cost of running semantic actions, predicates and rule values.
+
+Compares the generated code as it is now, where every embedded Python
+expression is compiled once into a module-level code object, against the
+previous scheme, where the expression source was handed to eval() and
+parsed again on every run.
+
+Usage: python benchmarks/bench_actions.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta import builder
+from pymeta.grammar import OMeta, OMetaGrammar
+from pymeta.builder import (TreeBuilder, PythonWriter, SentinelWriter,
+    moduleFromGrammar)
+
+actionGrammar = r"""
+item = anything:x ?(x != ';') !(counts.append(x)) -> (x, len(counts))
+items = item*
+"""
+
+class EvalStringWriter(PythonWriter):
+    """
+    Writer reproducing the old code generation, which passed expression
+    source text to eval().
+    """
+    def compilePythonExpr(self, expr):
+        return self._expr('python', 'eval(%r, self.globals, _locals), None' % (expr,))
+
+def makeGrammar(writerClass, counts):
+    tree = OMetaGrammar(actionGrammar).parseGrammar('ActionGrammar', TreeBuilder)
+    original = builder.writePython
+    def writePython(tree, sentinel=False, trace=False):
+        if sentinel:
+            pw = type(writerClass.__name__, (writerClass, SentinelWriter), {})(tree)
+        else:
+            pw = writerClass(tree)
+        pw.trace = trace
+        return pw.output()
+    builder.writePython = writePython
+    try:
+        return moduleFromGrammar(tree, 'ActionGrammar', OMeta, {'counts': counts})
+    finally:
+        builder.writePython = original
+
+def bench(writerClass, data, repeat=5):
+    best = None
+    for i in range(repeat):
+        counts = []
+        grammar = makeGrammar(writerClass, counts)
+        start = time.time()
+        grammar(data).apply('items')
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    data = 'x' * size
+    # three expressions run per item: a predicate, an action and a value
+    runs = size * 3
+    results = [('eval(source)', bench(EvalStringWriter, data)),
+               ('compiled code', bench(PythonWriter, data))]
+    for label, elapsed in results:
+        print "%-14s %8.3f s total %8.3f us/action" % (
+            label, elapsed, elapsed / runs * 1e6)
+    print "speedup: %.2fx" % (results[0][1] / results[1][1],)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,34 @@
+"""
+Measure parsing the OMeta grammar with rules applied with arguments
+memoized, against applying them again each time.
+
+Usage: python benchmarks/bench_arg_memo.py [repeat]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta import builder
+from pymeta.grammar import OMetaGrammar, ometaGrammar
+
+class Unmemoized(OMetaGrammar):
+    def _argsMemo(self, state, ruleId, args):
+        return None
+
+def bench(G, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        G(ometaGrammar).parseGrammar('Bench', builder.TreeBuilder)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(repeat=5):
+    u = bench(Unmemoized, repeat)
+    m = bench(OMetaGrammar, repeat)
+    print "%d chars: unmemoized %7.3f s  memoized %7.3f s  speedup %.2fx" % (
+        len(ometaGrammar), u, m, u / m)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
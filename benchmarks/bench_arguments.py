@@ -0,0 +1,43 @@
+"""
+Measure applying rules with arguments passed the way the grammar compiler
+chose, against looking at each rule's signature on every call.
+
+Usage: python benchmarks/bench_arguments.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+
+grammar = """
+sep :c = token(c)
+item :open :close = token(open) letter+:ls token(close) -> ''.join(ls)
+items = item('(' ')'):x (sep(',') item('(' ')'))*:xs sep(';') -> [x] + xs
+rows = items* spaces end
+"""
+
+def bench(G, source, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        G(source, diagnostics=False).apply('rows')
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    line = "(ab), (cde) ,(f);\n"
+    source = line * max(1, size // len(line))
+    Compiled = OMeta.makeGrammar(grammar, {}, name="Compiled")
+    class Dynamic(Compiled):
+        def __init__(self, *args, **kwargs):
+            Compiled.__init__(self, *args, **kwargs)
+            self.argumentPassing = False
+    d = bench(Dynamic, source)
+    c = bench(Compiled, source)
+    print "%d chars: dynamic %7.3f s  compiled %7.3f s  speedup %.2fx" % (
+        len(source), d, c, d / c)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,36 @@
+"""
+Measure parsing many small documents in worker processes against parsing
+them one after the other in this process.
+
+Usage: python benchmarks/bench_batch.py [documents] [workers]
+"""
+import multiprocessing, os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+
+grammar = """
+num = <digit+>:d -> int(d)
+pair = token('(') num:a token(',') num:b token(')') -> a * b
+item = spaces (pair | num)
+grammar = item*:xs spaces end -> sum(xs)
+"""
+
+def bench(G, documents, workers):
+    start = time.time()
+    for value, error in G.parseMany(documents, workers=workers):
+        assert error is None
+    return time.time() - start
+
+def main(count=5000, workers=None):
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    G = OMeta.makeGrammar(grammar, {}, name="Documents")
+    documents = ["1 (2,3) 45 (6,78) " * 10] * count
+    serial = bench(G, documents, 1)
+    parallel = bench(G, documents, workers)
+    print "%d documents: serial %7.3f s  %d workers %7.3f s  speedup %.2fx" % (
+        count, serial, workers, parallel, serial / parallel)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,37 @@
+"""
+Measure how long defining a grammar with OMeta.makeGrammar takes with an
+empty grammar cache and with the code already in the cache.
+
+Usage: python benchmarks/bench_cache.py [repeat]
+"""
+import os, shutil, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta, ometaGrammar
+
+def bench(directory, clear, repeat):
+    best = None
+    for i in range(repeat):
+        if clear:
+            shutil.rmtree(directory, True)
+        start = time.time()
+        OMeta.makeGrammar(ometaGrammar, {}, name="CachedGrammar",
+                          cache=directory)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(repeat=5):
+    directory = tempfile.mkdtemp()
+    try:
+        cold = bench(directory, True, repeat)
+        warm = bench(directory, False, repeat)
+    finally:
+        shutil.rmtree(directory, True)
+    print "%-14s %8.1f ms" % ('no cache', cold * 1e3)
+    print "%-14s %8.1f ms" % ('cache hit', warm * 1e3)
+    print "speedup: %.1fx" % (cold / warm,)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
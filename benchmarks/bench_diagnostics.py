@@ -0,0 +1,77 @@
+"""
+Measure parsing well-formed input with and without diagnostics, in both
+failure protocols, and the cost of a failed parse without diagnostics,
+which runs again with them to report the error.
+
+The gain depends on how often alternatives fail: each failure is recorded
+with diagnostics. The small value grammar rarely backtracks. Grammar
+definitions parsed with the OMeta grammar try many alternatives at each
+position, as parsers of programming languages do.
+
+Usage: python benchmarks/bench_diagnostics.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.builder import TreeBuilder
+from pymeta.grammar import OMeta, OMetaGrammar, ometaGrammar
+from pymeta.runtime import ParseError
+
+valueGrammar = r"""
+value = number | string | token("[") values:vs token("]") -> vs
+number = spaces digit+:ds -> int(''.join(ds))
+string = token('"') (~'"' anything)*:cs '"' -> ''.join(cs)
+values = value:first (token(",") value)*:rest -> [first] + rest
+grammar = value:v spaces end -> v
+"""
+
+sample = '[1, "two", [3, 45, "six"], [[7]], "eight nine"], '
+
+def bench(G, source, diagnostics, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        try:
+            G.parse(source, diagnostics=diagnostics)
+        except ParseError:
+            pass
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    source = "[" + sample * max(1, size // len(sample)) + "0]"
+    broken = source[:-2] + "x]"
+    for sentinel in (False, True):
+        G = OMeta.makeGrammar(valueGrammar, {}, name="ValueGrammar",
+                              sentinel=sentinel)
+        label = sentinel and 'sentinel' or 'exceptions'
+        with_ = bench(G, source, True)
+        without = bench(G, source, False)
+        print "%-10s valid input: diagnostics %7.3f s  none %7.3f s  speedup %.2fx" % (
+            label, with_, without, with_ / without)
+        with_ = bench(G, broken, True)
+        without = bench(G, broken, False)
+        print "%-10s failing input: diagnostics %7.3f s  none %7.3f s (with rerun)" % (
+            label, with_, without)
+    rules = ometaGrammar.strip().split('\n\n')
+    source = '\n\n'.join(rules * max(1, size // len(ometaGrammar)))
+    with_ = benchGrammars(source, True)
+    without = benchGrammars(source, False)
+    print "%-10s grammar definitions: diagnostics %7.3f s  none %7.3f s  speedup %.2fx" % (
+        'OMeta', with_, without, with_ / without)
+
+def benchGrammars(source, diagnostics, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        OMetaGrammar(source, diagnostics=diagnostics).parseGrammar(
+            'Grammar', TreeBuilder)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,43 @@
+"""
+Measure the cost of tracking parse failures in choices with many
+alternatives. Each word of the input fails every keyword before the last
+one, so the time per failed alternative should stay flat as the number of
+alternatives grows.
+
+Usage: python benchmarks/bench_errors.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+
+def keywordGrammar(count):
+    keywords = ['kw%03d' % (i,) for i in range(count)]
+    return keywords, """
+keyword = %s
+keywords = keyword* spaces end
+""" % (' | '.join('token("%s")' % (k,) for k in keywords),)
+
+def bench(G, source, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        G(source).apply('keywords')
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    for count in (4, 16, 64):
+        keywords, grammar = keywordGrammar(count)
+        G = OMeta.makeGrammar(grammar, {}, name="KeywordGrammar")
+        words = max(1, size // (len(keywords[-1]) + 1))
+        source = (' ' + keywords[-1]) * words
+        elapsed = bench(G, source)
+        failures = words * (count - 1)
+        print "%3d alternatives %8.3f s total %8.3f us/failed alternative" % (
+            count, elapsed, elapsed / failures * 1e6)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
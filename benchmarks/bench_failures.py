@@ -0,0 +1,62 @@
+"""
+Compare the two failure protocols of generated grammars on backtracking
+workloads: raising _MaybeParseError on every failed match, and returning
+the FAIL sentinel (makeGrammar(..., sentinel=True)).
+
+Usage: python benchmarks/bench_failures.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+
+tokenGrammar = r"""
+ws = ' '*
+keyword = ('if' | 'while' | 'return' | 'def' | 'class'):k ~letterOrDigit -> k
+name = letter letterOrDigit*
+number = digit+
+op = '+' | '-' | '*' | '/' | '(' | ')' | '=' | ':'
+tok = ws (keyword | name | number | op)
+tokens = tok*
+"""
+
+exprGrammar = r"""
+ws = ' '*
+expr = term:a ws '+' expr:b -> a + b
+     | term:a ws '-' expr:b -> a - b
+     | term
+term = factor:a ws '*' term:b -> a * b
+     | factor
+factor = ws (digit+:ds -> int(''.join(ds))
+            | '(' expr:e ws ')' -> e)
+exprs = (expr:e ws ';' -> e)*
+"""
+
+workloads = [
+    ('tokens', tokenGrammar, 'tokens',
+     "def f(x): if x = 10: return x * classy + while_1 / (y - 2) "),
+    ('expressions', exprGrammar, 'exprs', "1 + 2 * (3 - 4) * 5 - 6;"),
+    ]
+
+def bench(grammar, rule, data, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        grammar(data).apply(rule)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    for label, grammar, rule, sample in workloads:
+        data = sample * max(1, size // len(sample))
+        times = []
+        for sentinel in (False, True):
+            G = OMeta.makeGrammar(grammar, {}, name="Bench", sentinel=sentinel)
+            times.append(bench(G, rule, data))
+        print "%-12s exceptions %7.3f s  sentinel %7.3f s  speedup %.2fx" % (
+            label, times[0], times[1], times[0] / times[1])
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,41 @@
+"""
+Measure the time taken by `import pymeta.grammar` in a fresh interpreter,
+against the time the same interpreter then takes to generate the rules the
+import loads ready-made, and fail if the import is not some times faster,
+twice by default. Both are measured on the same machine at the same time,
+so a slow or loaded machine does not make it fail.
+
+Usage: python benchmarks/bench_import.py [minimum speedup]
+"""
+import os, subprocess, sys
+
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+script = """
+import time
+start = time.time()
+import pymeta.grammar
+imported = time.time() - start
+from pymeta.rulesgenerator import RULES_MODULES, generateRules
+start = time.time()
+for module, _, _ in RULES_MODULES:
+    generateRules(module)
+print imported, time.time() - start
+"""
+
+def importTimes():
+    out = subprocess.Popen([sys.executable, '-c', script], cwd=top,
+                           stdout=subprocess.PIPE).communicate()[0]
+    return [float(t) for t in out.split()]
+
+def main(speedup=2, repeat=5):
+    times = [importTimes() for i in range(repeat)]
+    imported = min(t[0] for t in times)
+    generated = min(t[1] for t in times)
+    print "import pymeta.grammar: %.1f ms, generating its rules: %.1f ms" % (
+        imported * 1e3, generated * 1e3)
+    assert imported * speedup < generated, (
+        "import not %dx faster than generating the rules" % (speedup,))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
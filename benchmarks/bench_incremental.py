@@ -0,0 +1,40 @@
+"""
+Measure parsing again after a one-character edit in the middle of a large
+input, with a parse session reusing memo records against a fresh parse.
+
+Usage: python benchmarks/bench_incremental.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.incremental import ParseSession
+
+grammar = """
+num = <digit+>:d -> int(d)
+pair = token('(') num:a token(',') num:b token(')') -> a * b
+item = spaces (pair | num)
+items = item*:xs spaces end -> sum(xs)
+"""
+
+def main(size=20000):
+    G = OMeta.makeGrammar(grammar, {}, name="Items")
+    line = "1 (2,3) 45 (6,78)\n"
+    text = line * max(1, size // len(line))
+    session = ParseSession(G, text, 'items')
+    session.parse()
+    offset = len(text) // 2
+    offset = text.index("45", offset)
+    start = time.time()
+    value = session.edit([(offset, 1, "9")])
+    incremental = time.time() - start
+    start = time.time()
+    assert G(session.text).apply('items')[0] == value
+    fresh = time.time() - start
+    print "%d chars: fresh %7.3f s  incremental %7.3f s  speedup %.1fx" % (
+        len(text), fresh, incremental, fresh / incremental)
+    print "memo records moved %d, dropped %d" % (session.moved,
+                                                 session.dropped)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""
+Measure parsing with small rules inlined at their call sites, against
+applying them.
+
+Usage: python benchmarks/bench_inline.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.optimizer import PassManager
+
+grammar = """
+hspace = ' ' | '\\t'
+comma = ','
+sign = '-' | '+'
+digit = '0'..'9'
+field = sign? digit+
+row = field (hspace* comma hspace* field)* '\\n'
+rows = row* end
+"""
+
+def bench(G, source, repeat=5):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        G(source, diagnostics=False).apply('rows')
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    line = "12, -3 ,\t+45,6\n"
+    source = line * max(1, size // len(line))
+    noInline = PassManager()
+    noInline.passes = [p for p in noInline.passes if p[0] != 'inline']
+    applied = OMeta.makeGrammar(grammar, {}, name="Applied",
+                                optimize=noInline)
+    inlined = OMeta.makeGrammar(grammar, {}, name="Inlined")
+    a = bench(applied, source)
+    i = bench(inlined, source)
+    print "%d chars: applied %7.3f s  inlined %7.3f s  speedup %.2fx" % (
+        len(source), a, i, a / i)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
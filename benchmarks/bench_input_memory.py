@@ -0,0 +1,52 @@
+"""
+Measure the peak memory and the time taken to start parsing a large text
+input.
+
+Compares reading the input from the string itself, as parsers do now,
+against the previous layout, where every character of the input was copied
+into its own character object before parsing started. Each layout is
+measured in a separate process, so that peak memory is not shared.
+
+Usage: python benchmarks/bench_input_memory.py [input size in MB]
+"""
+import os, resource, subprocess, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.runtime import OMetaBase, InputStream, character
+
+sample = "def f(x):\n    return x + 1\n"
+
+def peakMemory():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def measure(layout, size):
+    text = (sample * (size // len(sample) + 1))[:size]
+    before = peakMemory()
+    start = time.time()
+    parser = OMetaBase(text)
+    if layout == 'characters':
+        parser._setInput(InputStream([character(c) for c in text], str))
+    parser.token("def")
+    parser.apply("spaces")
+    elapsed = time.time() - start
+    return elapsed, peakMemory() - before
+
+def main(megabytes=50):
+    size = int(megabytes * 1024 * 1024)
+    results = {}
+    for layout in ('characters', 'text'):
+        out = subprocess.check_output([sys.executable, __file__,
+                                       '--layout', layout, str(size)])
+        elapsed, memory = out.split()
+        results[layout] = float(elapsed), int(memory)
+        print "%-10s %6.1f MB input: startup %7.3f s  peak memory %8.1f MB" % (
+            layout, size / 1048576.0, float(elapsed), int(memory) / 1048576.0)
+    print "memory saved: %.1f MB" % (
+        (results['characters'][1] - results['text'][1]) / 1048576.0,)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--layout']:
+        print "%f %d" % measure(sys.argv[2], int(sys.argv[3]))
+    else:
+        main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,87 @@
+"""
+Report the memory used by packrat memo tables, in bytes per input
+character, for a few of the grammars used in the test suite.
+
+For comparison, the same memo records are also measured in the previous
+layout: one dict per input position keyed by rule name, holding mutable
+[result, end] lists.
+
+Usage: python benchmarks/bench_memo_memory.py [input size]
+"""
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.builder import TreeBuilder
+from pymeta.grammar import OMeta, OMetaGrammar, ometaGrammar
+from pymeta.runtime import ruleNames
+
+def containerSize(obj, seen):
+    """
+    Size of the memo containers and records, not of the parse results they
+    point to.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.iteritems():
+            size += containerSize(v, seen)
+    elif isinstance(obj, list):
+        for v in obj:
+            if isinstance(v, dict):
+                size += containerSize(v, seen)
+    return size
+
+def memoSize(parser):
+    return containerSize(parser.memo, set())
+
+def legacyMemoSize(parser):
+    byPosition = {}
+    for rid, table in enumerate(parser.memo):
+        for position, record in (table or {}).iteritems():
+            if isinstance(record, tuple):
+                record = [record[1:], record[0]]
+            byPosition.setdefault(position, {})[ruleNames[rid]] = record
+    size = 0
+    for position, memo in byPosition.iteritems():
+        size += sys.getsizeof(memo)
+        for name, record in memo.iteritems():
+            size += sys.getsizeof(record)
+            if isinstance(record, list):
+                # the (value, error) pair returned by the rule
+                size += sys.getsizeof(record[0])
+    return size
+
+numberGrammar = OMeta.makeGrammar("""
+num = (num:n digit:d -> n * 10 + d
+       | digit)
+digit = :x ?(x.isdigit()) -> int(x)
+""", {}, name="NumberGrammar")
+
+interpGrammar = OMeta.makeGrammar("""
+digit  = :x ?(x.isdigit()) -> int(x)
+expr = digit:x ('+' expr:y -> x + y
+                | -> x)
+exprs = (expr:e ';' -> e)*
+""", {}, name="InterpGrammar")
+
+def run(label, grammar, rule, data):
+    parser = grammar(data)
+    parser.builder = TreeBuilder(label, parser)
+    parser.apply(rule)
+    size = memoSize(parser)
+    legacy = legacyMemoSize(parser)
+    records = sum(len(table) for table in parser.memo if table)
+    print "%-16s %8d chars %8d records %8.1f bytes/char (was %8.1f)" % (
+        label, len(data), records, float(size) / len(data),
+        float(legacy) / len(data))
+
+def main(size=20000):
+    run('left recursion', numberGrammar, 'num', '7' * (size // 10))
+    run('right recursion', interpGrammar, 'exprs', '1+2+3+4+5+6+7+8;' * (size // 16))
+    text = ometaGrammar * max(1, size // len(ometaGrammar))
+    run('ometa grammar', OMetaGrammar, 'grammar', text)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
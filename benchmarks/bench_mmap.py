@@ -0,0 +1,67 @@
+"""
+Measure the peak memory and the time taken to parse a large file mapped in
+memory, against reading it into a string first, as bytes and as UTF-8
+text.
+
+Each way is measured in a separate process, so that peak memory is not
+shared.
+
+Usage: python benchmarks/bench_mmap.py [input size in MB]
+"""
+import os, resource, shutil, subprocess, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.runtime import MappedInput, WindowMemo
+
+grammar = """
+field = <(~',' ~'\\n' anything)*>
+row = field:f (',' field)* '\\n' -> f
+rows = (row -> None)* end
+"""
+
+sample = u"caf\xe9,12,hello world,3.5\n"
+
+def peakMemory():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def measure(way, path):
+    G = OMeta.makeGrammar(grammar, {})
+    before = peakMemory()
+    start = time.time()
+    if way == 'mmap bytes':
+        source = MappedInput(path)
+    elif way == 'mmap utf8':
+        source = MappedInput(path, 'utf8')
+    elif way == 'read bytes':
+        source = open(path, 'rb').read()
+    else:
+        source = open(path, 'rb').read().decode('utf8')
+    G(source, memoPolicy=WindowMemo(4096)).apply('rows')
+    elapsed = time.time() - start
+    return elapsed, peakMemory() - before
+
+def main(megabytes=1):
+    size = int(megabytes * 1024 * 1024)
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'input.csv')
+        f = open(path, 'wb')
+        f.write((sample * (size // len(sample) + 1)).encode('utf8'))
+        f.close()
+        for way in ('read bytes', 'mmap bytes', 'read utf8', 'mmap utf8'):
+            out = subprocess.check_output([sys.executable, __file__,
+                                           '--way', way, path])
+            elapsed, memory = out.split()
+            print "%-10s %6.1f MB input: %7.3f s  peak memory %8.1f MB" % (
+                way, size / 1048576.0, float(elapsed),
+                int(memory) / 1048576.0)
+    finally:
+        shutil.rmtree(d)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--way']:
+        print "%f %d" % measure(sys.argv[2], sys.argv[3])
+    else:
+        main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,66 @@
+"""
+Microbenchmark of the primitives matching strings and characters: exactly,
+match_string, token, range and the letter/digit rules.
+
+Each primitive is run over the same text input twice: once matching against
+the string itself, as parsers of text do, and once matching one input item
+at a time, as parsers of other sequences do.
+
+Usage: python benchmarks/bench_primitives.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.runtime import OMetaBase, _MaybeParseError
+
+# (label, input, primitive, arguments, whether each call fails)
+cases = [
+    ('exactly', 'x', 'exactly', ('x',), False),
+    ('match_string', 'keyword ', 'match_string', ('keyword ',), False),
+    ('match_string fail', 'keyword ', 'match_string', ('keywork',), True),
+    ('token', '  keyword', 'token', ('keyword',), False),
+    ('token fail', '  keyword', 'token', ('keywork',), True),
+    ('range', 'm', 'range', ('a', 'z'), False),
+    ('letter', 'x', 'letter', (), False),
+    ('digit', '7', 'digit', (), False),
+    ]
+
+def run(parser, name, args, length, fails):
+    primitive = getattr(parser, name)
+    start = time.time()
+    position = 0
+    while position < length:
+        if fails:
+            try:
+                primitive(*args)
+            except _MaybeParseError:
+                pass
+            position += len(args[0])
+            parser.input = position
+        else:
+            primitive(*args)
+            position = parser.input
+    return time.time() - start
+
+def bench(text, name, args, fails, perItem, repeat=5):
+    best = None
+    for i in range(repeat):
+        parser = OMetaBase(text)
+        if perItem:
+            parser.text = None
+        elapsed = run(parser, name, args, len(text), fails)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def main(size=20000):
+    for label, unit, name, args, fails in cases:
+        text = unit * max(1, size // len(unit))
+        calls = len(text) // (fails and len(args[0]) or len(unit))
+        items = bench(text, name, args, fails, True)
+        string = bench(text, name, args, fails, False)
+        print "%-18s per item %7.3f us/call  text %7.3f us/call  speedup %.2fx" % (
+            label, items / calls * 1e6, string / calls * 1e6, items / string)
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
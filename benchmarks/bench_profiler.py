@@ -0,0 +1,39 @@
+"""
+Measure parsing with and without a profiler installed, and show its report.
+Parsers without a profiler run the class's own methods, so they pay
+nothing for it.
+
+Usage: python benchmarks/bench_profiler.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.profiler import Profiler
+
+grammar = """
+num = <digit+>:d -> int(d)
+pair = token('(') num:a token(',') num:b token(')') -> a * b
+item = spaces (pair | num)
+grammar = item*:xs spaces end -> sum(xs)
+"""
+
+def timed(G, text, profiler=None):
+    start = time.time()
+    G.parse(text, profiler=profiler)
+    return time.time() - start
+
+def main(size=20000):
+    G = OMeta.makeGrammar(grammar, {}, name="Items")
+    line = "1 (2,3) 45 (6,78)\n"
+    text = line * max(1, size // len(line))
+    plain = min(timed(G, text) for i in range(3))
+    profiler = Profiler()
+    profiled = min(timed(G, text, profiler) for i in range(3))
+    print "%d chars: plain %7.3f s  profiled %7.3f s" % (len(text), plain,
+                                                        profiled)
+    print
+    print profiler.report(sort='exclusive')
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
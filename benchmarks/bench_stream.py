@@ -0,0 +1,62 @@
+"""
+Measure the peak memory and the time taken to parse a large gzipped file,
+read from a stream against decoded in full before parsing.
+
+Each way is measured in a separate process, so that peak memory is not
+shared.
+
+Usage: python benchmarks/bench_stream.py [input size in MB]
+"""
+import gzip, os, resource, shutil, subprocess, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.runtime import StreamInput
+
+grammar = """
+field = (~',' ~'\\n' anything)*
+row = field (',' field)* '\\n'
+rows = (row -> None)* end
+"""
+
+sample = u"caf\xe9,12,hello world,3.5\n"
+
+def peakMemory():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def measure(way, path):
+    G = OMeta.makeGrammar(grammar, {})
+    before = peakMemory()
+    start = time.time()
+    if way == 'stream':
+        source = StreamInput.open(path, 'utf8', window=4096)
+    else:
+        source = gzip.open(path, 'rb').read().decode('utf8')
+    G(source).apply('rows')
+    elapsed = time.time() - start
+    return elapsed, peakMemory() - before
+
+def main(megabytes=1):
+    size = int(megabytes * 1024 * 1024)
+    d = tempfile.mkdtemp()
+    try:
+        path = os.path.join(d, 'input.csv.gz')
+        f = gzip.open(path, 'wb')
+        f.write((sample * (size // len(sample) + 1)).encode('utf8'))
+        f.close()
+        for way in ('read', 'stream'):
+            out = subprocess.check_output([sys.executable, __file__,
+                                           '--way', way, path])
+            elapsed, memory = out.split()
+            print "%-6s %6.1f MB input: %7.3f s  peak memory %8.1f MB" % (
+                way, size / 1048576.0, float(elapsed),
+                int(memory) / 1048576.0)
+    finally:
+        shutil.rmtree(d)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--way']:
+        print "%f %d" % measure(sys.argv[2], sys.argv[3])
+    else:
+        main(*[float(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,43 @@
+"""
+Measure parsing with a grammar compiled without tracing, with tracing but
+no tracer, and with a tracer counting events.
+
+Usage: python benchmarks/bench_trace.py [input size]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymeta.grammar import OMeta
+from pymeta.trace import Tracer
+
+grammar = """
+num = <digit+>:d -> int(d)
+pair = token('(') num:a token(',') num:b token(')') -> a * b
+item = spaces (pair | num)
+grammar = item*:xs spaces end -> sum(xs)
+"""
+
+class Counter(Tracer):
+    def __init__(self):
+        self.count = 0
+    def enter(self, rule, position):
+        self.count += 1
+
+def timed(G, text, tracer=None):
+    start = time.time()
+    G.parse(text, tracer=tracer)
+    return time.time() - start
+
+def main(size=20000):
+    plain = OMeta.makeGrammar(grammar, {}, name="Items")
+    traced = OMeta.makeGrammar(grammar, {}, name="Items", trace=True)
+    line = "1 (2,3) 45 (6,78)\n"
+    text = line * max(1, size // len(line))
+    counter = Counter()
+    print "%d chars: untraced %7.3f s  no tracer %7.3f s  tracer %7.3f s" % (
+        len(text), min(timed(plain, text) for i in range(3)),
+        min(timed(traced, text) for i in range(3)),
+        min(timed(traced, text, counter) for i in range(3)))
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,493 @@
+"""
+Static analysis of the grammar trees produced by L{TreeBuilder}, used by the
+code generator to decide how each rule should be compiled.
+"""
+import ast
+
+# The annotations a rule definition can be preceded by, as in
+#   @transient
+#   hspace = ' ' | '\t'
+ANNOTATIONS = frozenset(["transient", "memo", "noinline"])
+
+
+def children(node):
+    """
+    Return the sub-expressions of a grammar tree node.
+    """
+    name = node[0]
+    if name in ("Or", "Xor", "And"):
+        return list(node[1:])
+    if name == "Apply":
+        return list(node[3])
+    if name in ("Many", "Many1", "Optional", "Not", "Lookahead",
+                "Predicate", "List", "ConsumedBy", "IndexConsumedBy"):
+        return [node[1]]
+    if name == "Bind":
+        return [node[2]]
+    if name == "Interleave":
+        return [part[1] for part in node[1:]]
+    if name == "Rule":
+        return [node[2]]
+    if name == "Inline":
+        return [node[3]]
+    return []
+
+
+def walk(node):
+    """
+    Iterate over a grammar tree node and all the nodes below it.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(children(node)))
+
+
+def treeSize(node):
+    """
+    Return the number of nodes in a grammar tree, not counting the C{And}
+    nodes the grammar parser wraps around every sequence.
+    """
+    return sum(1 for n in walk(node) if n[0] != "And")
+
+
+def appliedRules(node):
+    """
+    Return the set of rule names applied anywhere in a grammar tree.
+    """
+    return set(n[1] for n in walk(node) if n[0] == "Apply")
+
+
+def recursiveRules(rules):
+    """
+    Return the names of the rules that can apply themselves, directly or
+    through other rules of the same grammar.
+
+    @param rules: A list of C{Rule} nodes.
+    """
+    calls = dict((rule[1], appliedRules(rule[2])) for rule in rules)
+    recursive = set()
+    for name in calls:
+        seen = set()
+        stack = list(calls[name])
+        while stack:
+            callee = stack.pop()
+            if callee == name:
+                recursive.add(name)
+                break
+            if callee in seen or callee not in calls:
+                continue
+            seen.add(callee)
+            stack.extend(calls[callee])
+    return recursive
+
+
+# The rules built into L{OMetaBase} that match input without applying other
+# rules, and those of them that always consume input when they succeed.
+PRIMITIVE_RULES = frozenset(["anything", "exactly", "match_string", "token",
+                             "spaces", "end", "letter", "digit",
+                             "letterOrDigit"])
+_consumingPrimitives = frozenset(["anything", "exactly", "letter", "digit",
+                                  "letterOrDigit"])
+
+# The rules built into L{OMetaBase} that take one Python argument rather
+# than matching their arguments with patterns.
+ARGUMENT_RULES = frozenset(["exactly", "match_string", "token"])
+
+def nullableRules(rules):
+    """
+    Return the names of the rules that might succeed without consuming
+    input. Rules applied with arguments, which they may consume instead, and
+    rules defined outside the grammar other than L{PRIMITIVE_RULES} are
+    assumed to.
+
+    @param rules: A list of C{Rule} nodes.
+    """
+    bodies = dict((rule[1], rule[2]) for rule in rules)
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for name, body in bodies.iteritems():
+            if name not in nullable and _nullable(body, bodies, nullable):
+                nullable.add(name)
+                changed = True
+    return nullable
+
+def _nullable(node, bodies, nullable):
+    kind = node[0]
+    if kind in ("Exactly", "Range", "List"):
+        return False
+    if kind in ("MatchString", "MatchCharacters"):
+        return not node[1]
+    if kind in ("Apply", "Inline"):
+        name = node[1]
+        args = node[3] if kind == "Apply" else ()
+        if name in bodies:
+            return bool(args) or name in nullable
+        if name in ("token", "match_string") and len(args) == 1:
+            tok = literal(args[0])
+            return not (isinstance(tok, basestring) and tok)
+        return name not in _consumingPrimitives
+    if kind == "And":
+        return all(_nullable(n, bodies, nullable) for n in node[1:])
+    if kind in ("Or", "Xor"):
+        return any(_nullable(n, bodies, nullable) for n in node[1:])
+    if kind in ("Many1", "ConsumedBy", "IndexConsumedBy"):
+        return _nullable(node[1], bodies, nullable)
+    if kind == "Bind":
+        return _nullable(node[2], bodies, nullable)
+    # repetition, lookahead, Python code and interleaving
+    return True
+
+
+def leftCalls(node, bodies, nullable):
+    """
+    Return the names of the rules an expression can apply before it
+    consumes input.
+
+    @param bodies: A dict mapping the names of the rules of the grammar to
+    their expressions.
+    @param nullable: The names of the rules that might match without
+    consuming input, as found by L{nullableRules}.
+    """
+    calls = set()
+    _leftCalls(node, bodies, nullable, calls)
+    return calls
+
+def _leftCalls(node, bodies, nullable, calls):
+    kind = node[0]
+    if kind in ("Apply", "Inline"):
+        calls.add(node[1])
+    elif kind == "And":
+        for n in node[1:]:
+            _leftCalls(n, bodies, nullable, calls)
+            if not _nullable(n, bodies, nullable):
+                break
+    elif kind == "List":
+        # the list is parsed as a new input, with memo tables of its own
+        pass
+    else:
+        for n in children(node):
+            _leftCalls(n, bodies, nullable, calls)
+
+
+def leftRecursiveRules(rules):
+    """
+    Return the names of the rules that can be applied again at the position
+    they were applied at, before consuming input: the rules that can apply
+    themselves that way, directly or through other rules of the grammar,
+    and the rules that can apply a rule defined outside the grammar that
+    way, other than L{PRIMITIVE_RULES}, since it might apply them in turn.
+    Such rules need to watch for left recursion when applied.
+
+    Rules applied with arguments may consume them rather than input, so all
+    the rules they apply count. Python code is assumed not to apply rules.
+
+    @param rules: A list of C{Rule} nodes.
+    """
+    bodies = dict((rule[1], rule[2]) for rule in rules)
+    nullable = nullableRules(rules)
+    takeArgs = set(n[1] for rule in rules for n in walk(rule)
+                   if n[0] == "Apply" and n[3])
+    calls = {}
+    for name, body in bodies.iteritems():
+        calls[name] = leftCalls(body, bodies, nullable)
+        if name in takeArgs:
+            calls[name].update(appliedRules(body))
+    recursive = set()
+    for name in bodies:
+        seen = set()
+        stack = list(calls[name])
+        while stack:
+            callee = stack.pop()
+            if callee == name or (callee not in bodies and
+                                  callee not in PRIMITIVE_RULES):
+                recursive.add(name)
+                break
+            if callee in seen or callee not in bodies:
+                continue
+            seen.add(callee)
+            stack.extend(calls[callee])
+    return recursive
+
+
+# Rules at most this big can be made transient by the default heuristic.
+TRANSIENT_SIZE = 6
+
+def transientRules(rules):
+    """
+    Return the names of the rules that should be applied without
+    memoization: the rules annotated with C{@transient}, plus the small,
+    non-recursive ones for which storing a memo record costs more than
+    running the rule again. A rule is small when it has few nodes and no
+    repetition or side-effecting action. C{@memo} keeps a rule memoized
+    regardless of the heuristic.
+
+    @param rules: A list of C{Rule} nodes.
+    """
+    recursive = recursiveRules(rules)
+    transient = set()
+    for rule in rules:
+        name, expr, annotations = rule[1:]
+        if "transient" in annotations:
+            transient.add(name)
+        elif "memo" in annotations or name in recursive:
+            continue
+        elif treeSize(expr) <= TRANSIENT_SIZE and not any(
+                n[0] in ("Many", "Many1", "Interleave", "Action")
+                for n in walk(expr)):
+            transient.add(name)
+    return transient
+
+
+# Rules at most this big are inlined at their call sites.
+INLINE_SIZE = 6
+
+def inlinableRules(rules):
+    """
+    Return the names of the rules whose code can be generated in place of
+    their applications: the transient rules, which are not memoized anyway,
+    that bind no names, run no Python code and do not apply C{super}, so
+    that they need no scope of their own. Rules annotated with C{@noinline}
+    are always applied, and so are the rules that can apply themselves,
+    whose inlined code would never end.
+
+    @param rules: A list of C{Rule} nodes.
+    """
+    transient = transientRules(rules) - recursiveRules(rules)
+    inlinable = set()
+    for rule in rules:
+        name, expr, annotations = rule[1:]
+        if (name not in transient or "noinline" in annotations
+            or treeSize(expr) > INLINE_SIZE):
+            continue
+        if not any(n[0] in ("Bind", "Python", "Action", "Predicate",
+                            "Interleave")
+                   or (n[0] == "Apply" and (n[1] == "super" or n[3]))
+                   for n in walk(expr)):
+            inlinable.add(name)
+    return inlinable
+
+
+# The FIRST set of expressions that can begin with any input item.
+ANY = None
+
+_whitespace = []
+
+def whitespace():
+    """
+    Return the set of the characters skipped by L{OMetaBase.eatWhitespace},
+    in byte strings or in unicode.
+    """
+    if not _whitespace:
+        _whitespace.append(frozenset(
+            [chr(i) for i in range(256) if chr(i).isspace()] +
+            [unichr(i) for i in range(0x10000) if unichr(i).isspace()]))
+    return _whitespace[0]
+
+
+def literal(node):
+    """
+    Return the value of a C{Python} node holding a literal, or C{None}.
+    """
+    if node[0] != "Python":
+        return None
+    try:
+        return ast.literal_eval(node[1])
+    except (ValueError, SyntaxError):
+        return None
+
+
+def _builtinFirst(name, args):
+    """
+    Return the FIRST set and nullability of an application of a rule built
+    into L{OMetaBase} and the names of the methods its matching depends on,
+    or C{None} if they are not known.
+    """
+    if name == "token" and len(args) == 1:
+        tok = literal(args[0])
+        if isinstance(tok, basestring):
+            return ((whitespace() | frozenset(tok[:1]), not tok),
+                    ("rule_token", "tryToken", "eatWhitespace"))
+    elif name == "exactly" and len(args) == 1:
+        c = literal(args[0])
+        if isinstance(c, basestring) and len(c) == 1:
+            return (frozenset([c]), False), ("rule_exactly", "tryExactly")
+    elif name == "spaces" and not args:
+        return (whitespace(), True), ("rule_spaces",)
+    elif name == "end" and not args:
+        return (frozenset(), True), ("rule_end", "tryEnd")
+    return None
+
+
+# The methods used to match the terminals of a grammar tree.
+_terminalMethods = {
+    "Exactly": ("exactly", "tryExactly"),
+    "MatchString": ("match_string", "tryMatchString"),
+    "MatchCharacters": ("matchCharacters", "tryMatchCharacters"),
+    "Range": ("range", "tryRange"),
+    }
+
+# Ranges wider than this are treated as matching any character.
+RANGE_SIZE = 256
+
+def _unionFirst(a, b):
+    if a is ANY or b is ANY:
+        return ANY
+    return a | b
+
+
+class FirstSets(object):
+    """
+    The FIRST sets of the rules of a grammar, on text input: for each rule,
+    the characters a match can begin with, or L{ANY}, and whether the rule
+    can match without consuming input.
+
+    Rules applied with arguments, rules defined outside the grammar except
+    for a few built-in ones, and expressions running Python code before
+    consuming input are assumed to begin with any character.
+    """
+
+    def __init__(self, rules):
+        """
+        @param rules: A list of C{Rule} nodes.
+        """
+        self.bodies = dict((rule[1], rule[2]) for rule in rules)
+        self.rules = dict((name, (frozenset(), False)) for name in self.bodies)
+        changed = True
+        while changed:
+            changed = False
+            for name, body in self.bodies.iteritems():
+                first = self.first(body)
+                if first != self.rules[name]:
+                    self.rules[name] = first
+                    changed = True
+        self.uses = {}
+        for name, body in self.bodies.iteritems():
+            self.uses[name] = used = set()
+            self.first(body, used)
+
+
+    def first(self, node, used=None):
+        """
+        Return the FIRST set of an expression and whether it can match
+        without consuming input.
+
+        @param used: A set the names of the methods the result depends on
+        are added to: the rules of the grammar, as C{rule_name}, and the
+        built-in methods.
+        """
+        if used is None:
+            used = set()
+        kind = node[0]
+        if kind in _terminalMethods:
+            used.update(_terminalMethods[kind])
+        if kind == "Exactly":
+            c = node[1]
+            if isinstance(c, basestring) and len(c) == 1:
+                return frozenset([c]), False
+            return ANY, False
+        if kind in ("MatchString", "MatchCharacters"):
+            return frozenset(node[1][:1]), not node[1]
+        if kind == "Range":
+            c1, c2 = node[1:]
+            if (isinstance(c1, basestring) and isinstance(c2, basestring) and
+                len(c1) == len(c2) == 1 and ord(c2) - ord(c1) < RANGE_SIZE):
+                convert = unichr if isinstance(c1 + c2, unicode) else chr
+                return (frozenset(convert(i)
+                                  for i in range(ord(c1), ord(c2) + 1)),
+                        False)
+            return ANY, False
+        if kind == "Inline":
+            # the rule is applied instead where it is overridden
+            return self.first(["Apply", node[1], node[2], ()], used)
+        if kind == "Apply":
+            name, args = node[1], node[3]
+            if name in self.rules:
+                if args:
+                    return ANY, False
+                used.add("rule_" + name)
+                return self.rules[name]
+            builtin = _builtinFirst(name, args)
+            if builtin is None:
+                return ANY, False
+            used.update(builtin[1])
+            return builtin[0]
+        if kind == "And":
+            first = frozenset()
+            for expr in node[1:]:
+                f, nullable = self.first(expr, used)
+                first = _unionFirst(first, f)
+                if first is ANY or not nullable:
+                    return first, False
+            return first, True
+        if kind in ("Or", "Xor"):
+            first, nullable = frozenset(), False
+            for expr in node[1:]:
+                f, n = self.first(expr, used)
+                first = _unionFirst(first, f)
+                nullable = nullable or n
+            return first, nullable
+        if kind in ("Many", "Optional"):
+            return self.first(node[1], used)[0], True
+        if kind in ("Many1", "ConsumedBy", "IndexConsumedBy"):
+            return self.first(node[1], used)
+        if kind == "Bind":
+            return self.first(node[2], used)
+        if kind == "Lookahead":
+            return self.first(node[1], used)[0], True
+        if kind == "Not":
+            # a negative lookahead only rules input out, unless it runs
+            # Python code
+            if any(n[0] in ("Action", "Python", "Predicate")
+                   for n in walk(node[1])):
+                return ANY, False
+            return frozenset(), True
+        # Python code, list patterns and interleaving
+        return ANY, False
+
+
+    def dependencies(self, used):
+        """
+        Return the names of the methods the FIRST sets found with C{used}
+        depend on, following the rules of the grammar.
+        """
+        result = set()
+        stack = list(used)
+        while stack:
+            name = stack.pop()
+            if name in result:
+                continue
+            result.add(name)
+            if name.startswith("rule_") and name[5:] in self.uses:
+                stack.extend(self.uses[name[5:]])
+        return result
+
+
+def dispatchTable(firstSets, alternatives):
+    """
+    Return which alternatives of an ordered choice can match, by the next
+    character of the input, or C{None} if that rules none of them out.
+
+    @param firstSets: The L{FirstSets} of the grammar.
+    @param alternatives: The expressions of the choice.
+    @return: C{(table, default, methods)}: a dict mapping characters to the
+    indices of the alternatives that can begin with them, the indices of the
+    alternatives to try for other characters and at the end of the input,
+    and the names of the methods this depends on.
+    """
+    used = set()
+    firsts = [firstSets.first(expr, used) for expr in alternatives]
+    default = tuple(i for i, (first, nullable) in enumerate(firsts)
+                    if first is ANY or nullable)
+    if len(default) == len(alternatives):
+        return None
+    table = {}
+    for i, (first, nullable) in enumerate(firsts):
+        if i not in default:
+            for c in first:
+                table.setdefault(c, set(default)).add(i)
+    table = dict((c, tuple(sorted(alts))) for c, alts in table.iteritems())
+    return table, default, sorted(firstSets.dependencies(used))
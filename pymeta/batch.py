@@ -0,0 +1,99 @@
+"""
+Parsing many independent documents with one grammar, in a pool of worker
+processes.
+
+Grammar classes made by L{OMeta.makeGrammar} live in modules that exist
+only in the process that made them, so they cannot be pickled. Each worker
+defines the grammar again from its generated source instead, once, when it
+starts.
+"""
+from itertools import islice
+import multiprocessing
+from pymeta.builder import compileGrammar, moduleFromSource
+
+
+def grammarDefinition(grammarClass):
+    """
+    Return a picklable description of a grammar class, from which
+    L{defineGrammar} makes it again: the class itself if it can be imported,
+    or the generated source, class name, base class description and
+    globals of a grammar made by L{OMeta.makeGrammar}. Its globals must be
+    picklable.
+    """
+    definition = grammarClass.__dict__.get('_G_definition')
+    if definition is None:
+        return grammarClass
+    source, name, superclass, globals = definition
+    return (source, name, grammarDefinition(superclass), globals)
+
+
+def defineGrammar(definition):
+    """
+    Return the grammar class described by L{grammarDefinition}.
+    """
+    if not isinstance(definition, tuple):
+        return definition
+    source, name, superclass, globals = definition
+    return moduleFromSource(source, compileGrammar(source, name), name,
+                            defineGrammar(superclass), globals)
+
+
+def parseDocument(grammarClass, document, rule):
+    """
+    Parse a document as L{OMetaBase.parse} does, returning C{(value, None)},
+    or C{(None, error)} with the L{ParseError} raised if it could not be
+    parsed, or the exception the grammar raised.
+    """
+    try:
+        return grammarClass.parse(document, rule=rule), None
+    except Exception, e:
+        return None, e
+
+
+# The grammar class and start rule of a worker process.
+_worker = None
+
+def _initWorker(definition, rule):
+    global _worker
+    _worker = defineGrammar(definition), rule
+
+def _parseInWorker(document):
+    grammarClass, rule = _worker
+    return parseDocument(grammarClass, document, rule)
+
+
+def parseMany(grammarClass, documents, workers=None, rule='grammar',
+              chunkSize=64):
+    """
+    Parse documents in worker processes, yielding a C{(value, error)} pair
+    for each of them, in order, as described by L{parseDocument}. Documents
+    are sent to the workers in chunks, and only a few chunks per worker are
+    read ahead of the results.
+
+    @param documents: An iterable of documents, which must be picklable,
+    as must the values the grammar returns.
+    @param workers: The number of worker processes, by default one per
+    CPU. With one worker, documents are parsed in this process.
+    @param rule: The name of the rule to parse each document with.
+    @param chunkSize: The number of documents sent to a worker at once.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if workers <= 1:
+        for document in documents:
+            yield parseDocument(grammarClass, document, rule)
+        return
+    pool = multiprocessing.Pool(workers, _initWorker,
+                                (grammarDefinition(grammarClass), rule))
+    try:
+        documents = iter(documents)
+        batchSize = workers * chunkSize * 4
+        while True:
+            batch = list(islice(documents, batchSize))
+            if not batch:
+                break
+            for result in pool.imap(_parseInWorker, batch, chunkSize):
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
@@ -13,11 +13,11 @@ class BootBaseTraits(object):
         self.builder = builder(name, self, *args)
         res, err = self.apply("grammar")
         try:
-            x = self.input.head()
+            x = self.head()
         except EOFError:
             pass
         else:
-            raise ParseError("Grammar parse failed.\n%s" % self.currentError.formatError(''.join(self.input.data)))
+            raise ParseError("Grammar parse failed.\n%s" % self.currentError.formatError(''.join(self.data)))
         return res
 
     def applicationArgs(self):
@@ -39,8 +39,8 @@ class BootBaseTraits(object):
         if args:
             return args
         else:
-            x = str(''.join(self.input.data[max(0, self.input.position-1):]))
-            raise _MaybeParseError(self.input.position, None, "Grammar parse failed.\nLeftover bits:\n%s" % x)
+            x = str(''.join(self.data[max(0, self.position-1):]))
+            raise _MaybeParseError(self.position, None, "Grammar parse failed.\nLeftover bits:\n%s" % x)
 
     def ruleValueExpr(self):
         """
@@ -49,7 +49,7 @@ class BootBaseTraits(object):
         """
         (expr, endchar), err = self.pythonExpr(endChars="\r\n)]")
         if endchar:
-            self.input = self.input.prev()
+            self.input = self.prev()
         return self.builder.expr(expr)
 
     def semanticActionExpr(self):
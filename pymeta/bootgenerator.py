@@ -3,8 +3,9 @@
 if __name__ == '__main__':
     import os, sys
     sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-    from pymeta import builder, grammar
+    from pymeta import builder, grammar, optimizer
     fp = open(os.path.join(os.path.dirname(__file__), 'boot_generated.py'), 'wb')
     ometa_grammar = grammar.OMetaGrammar(grammar.ometaGrammar)
-    tree = ometa_grammar.parseGrammar('BootOMetaGrammar', builder.TreeBuilder)
+    tree = optimizer.optimize(
+        ometa_grammar.parseGrammar('BootOMetaGrammar', builder.TreeBuilder))
     fp.write(builder.writeBoot(tree))
@@ -1,6 +1,13 @@
 # -*- test-case-name: pymeta.test.test_builder -*-
 from types import ModuleType as module
 import linecache, sys
+from pymeta import analysis
+
+# The version of what generated code expects of the runtime, such as the
+# primitives it calls and the class attributes it defines. Bump it whenever
+# code generated before a change no longer runs right after it, so that
+# code cached by L{pymeta.cache} is not reused.
+CODE_FORMAT = 1
 
 class TreeBuilder(object):
     """
@@ -13,8 +20,8 @@ class TreeBuilder(object):
     def makeGrammar(self, rules):
         return ["Grammar", self.name, rules]
 
-    def rule(self, name, expr):
-        return ["Rule", name, expr]
+    def rule(self, name, expr, annotations=()):
+        return ["Rule", name, expr, list(annotations)]
 
     def apply(self, ruleName, codeName, *exprs):
         return ["Apply", ruleName, codeName, exprs]
@@ -80,23 +87,86 @@ class PythonWriter(object):
     """
     Converts an OMeta syntax tree into Python source.
     """
-    def __init__(self, tree):
+    classAttributes = ["globals = globals()"]
+    # Whether the generated code reports parse events to the parser's
+    # tracer, see L{pymeta.trace}.
+    trace = False
+
+    def __init__(self, tree, parent=None):
         self.tree = tree
         self.lines = []
         self.gensymCounter = 0
+        if parent is None:
+            self.expressions = {}
+            self.appliedRules = set()
+            self.transientRules = set()
+            self.directRules = set()
+            self.grammarRules = set()
+            self.dispatchTables = []
+            self.grammarName = None
+            self.firstSets = None
+        else:
+            self.expressions = parent.expressions
+            self.appliedRules = parent.appliedRules
+            self.transientRules = parent.transientRules
+            self.directRules = parent.directRules
+            self.grammarRules = parent.grammarRules
+            self.dispatchTables = parent.dispatchTables
+            self.grammarName = parent.grammarName
+            self.firstSets = parent.firstSets
+            self.trace = parent.trace
 
 
     def _generate(self, retrn=False):
         result = self._generateNode(self.tree)
         if retrn:
-            self.lines.append("return (%s, self.currentError)" % (result,))
+            self.lines.append("return (%s, None)" % (result,))
         elif result:
             self.lines.append(result)
         return self.lines
 
 
     def output(self):
-        return '\n'.join(self._generate())
+        lines = self._generate()
+        return '\n'.join(self._preamble() + lines + self._postamble())
+
+
+    def _preamble(self):
+        """
+        Module-level lines that must run before the generated code: the ids
+        of the applied rules are looked up and each embedded Python
+        expression is compiled once here, at import time.
+        """
+        lines = ["_G_rule_%s = GrammarBase.ruleId(%r)" % (name, name)
+                 for name in sorted(self.appliedRules)]
+        exprs = sorted((number, expr) for expr, number
+                       in self.expressions.iteritems())
+        lines.extend("_G_expr_%s = compile(%r, '<string>', 'eval')" % (number, expr)
+                     for number, expr in exprs)
+        return lines
+
+
+    def _postamble(self):
+        """
+        Module-level lines that must run after the grammar class is
+        defined: the dispatch tables of its ordered choices.
+        """
+        lines = []
+        for number, (table, default, methods) in enumerate(self.dispatchTables):
+            items = sorted(table.iteritems(), key=repr)
+            lines.append("_G_dispatch_%s = GrammarBase.DispatchTable(%s, {%s}, %r, %r)"
+                         % (number + 1, self.grammarName,
+                            ", ".join("%r: %r" % item for item in items),
+                            default, methods))
+        return lines
+
+
+    def _subwriter(self, expr):
+        """
+        Create a writer for a nested function body, sharing this writer's
+        module-level state.
+        """
+        return self.__class__(expr, self)
 
 
     def _generateNode(self, node):
@@ -120,7 +190,7 @@ class PythonWriter(object):
         @param expr: A list of lines of Python code.
         """
         
-        subwriter = self.__class__(expr)
+        subwriter = self._subwriter(expr)
         flines  = subwriter._generate(retrn=True)
         fname = self._gensym(name)
         self._writeFunction(fname, (),  flines)
@@ -134,7 +204,6 @@ class PythonWriter(object):
         """
         name = self._gensym(typ)
         self.lines.append("%s, lastError = %s" % (name, e))
-        self.lines.append("self.considerError(lastError)")
         return name
 
 
@@ -151,37 +220,145 @@ class PythonWriter(object):
         return fname
 
 
+    def _primitive(self, name):
+        """
+        Return the expression for calling the named L{OMetaBase} primitive
+        from generated code.
+        """
+        return "self." + name
+
+
     def compilePythonExpr(self, expr):
         """
-        Generate code for running embedded Python expressions.
+        Generate code for running embedded Python expressions. The
+        expression is compiled once into a module-level code object, so
+        running it does not parse the source again.
         """
-        
-        return self._expr('python', 'eval(%r, self.globals, _locals), None' %(expr,))
+        number = self.expressions.setdefault(expr, len(self.expressions) + 1)
+        return self._expr('python', 'eval(_G_expr_%s, self.globals, _locals), None' % (number,))
+
+
+    def _applyPrimitive(self, ruleName, args):
+        """
+        Return the name of the primitive applying a rule with the given
+        arguments: L{OMetaBase._applyPattern} for the rules of this grammar,
+        which match their arguments with patterns,
+        L{OMetaBase._applyCall} for the built-in rules taking them as
+        Python arguments, and L{OMetaBase._apply}, which looks at the rule's
+        signature, otherwise.
+        """
+        if not args:
+            return '_apply'
+        if ruleName in self.grammarRules:
+            return '_applyPattern'
+        if ruleName in analysis.ARGUMENT_RULES and len(args) == 1:
+            return '_applyCall'
+        return '_apply'
+
+    def _applyExpr(self, primitive, rule, ruleId, args):
+        """
+        Return the expression applying a rule with an apply primitive,
+        through L{OMetaBase._traceApply} when tracing.
+        """
+        if self.trace:
+            return '%s(%s, %s, %s, [%s])' % (self._primitive('_traceApply'),
+                                             primitive, rule, ruleId,
+                                             ', '.join(args))
+        return '%s(%s, %s, [%s])' % (primitive, rule, ruleId, ', '.join(args))
 
 
+    def _alternatives(self, fnames):
+        """
+        Return the expression for the list of alternatives of a choice,
+        passed through L{OMetaBase._traceAlternatives} when tracing.
+        """
+        fns = '[%s]' % (', '.join(fnames),)
+        if self.trace:
+            return '%s(%s)' % (self._primitive('_traceAlternatives'), fns)
+        return fns
+
     def generate_Apply(self, ruleName, codeName, rawArgs):
         """
         Create a call to self.apply(ruleName, *args).
         """
         args = [self._generateNode(x) for x in rawArgs]
         if ruleName == 'super':
-            return self._expr('apply', 'self.superApply("%s", %s)' % (codeName,
+            return self._expr('apply', '%s("%s", %s)' % (self._primitive('superApply'), codeName,
                                                               ', '.join(args)))
-        return self._expr('apply', 'self._apply(self.rule_%s, "%s", [%s])' % (ruleName,
-                                                                              ruleName,
-                                                             ', '.join(args)))
+        primitive = self._primitive(self._applyPrimitive(ruleName, args))
+        if ruleName in self.transientRules:
+            if not args and not self.trace:
+                return self._transientApply(ruleName)
+            if not args:
+                primitive = self._primitive('_callTransient')
+            return self._expr('apply', self._applyExpr(
+                    primitive, 'self.rule_' + ruleName, 'None', args))
+        self.appliedRules.add(ruleName)
+        return self._expr('apply', self._applyExpr(
+                primitive, 'self.rule_' + ruleName, '_G_rule_' + ruleName,
+                args))
+
+    def _transientApply(self, ruleName):
+        """
+        Generate a call to the method of a rule applied without memoization,
+        for parsers of classes that do not override any rule called so, and
+        its application for the others. See L{OMetaBase.directCalls}.
+        """
+        self.directRules.add(ruleName)
+        self.appliedRules.add(ruleName)
+        name = self._gensym('apply')
+        self.lines.append("if self.directCalls:")
+        self.lines.append("    %s, lastError = self.rule_%s()" % (name, ruleName))
+        self.lines.append("else:")
+        self.lines.append("    %s, lastError = %s(self.rule_%s, _G_rule_%s, [])"
+                          % (name, self._primitive('_apply'), ruleName,
+                             ruleName))
+        self._checkFailure(name)
+        return name
+
+    def _checkFailure(self, name):
+        """
+        Generate the code handling the failure of the call whose value is
+        bound to C{name}, which raises in this protocol.
+        """
+
+    def generate_Inline(self, ruleName, codeName, expr):
+        """
+        Generate the code of a rule in place of its application, for parsers
+        of classes that do not override any inlined rule, and the
+        application for the others. See L{OMetaBase.inlining}.
+        """
+        name = self._gensym('inline')
+        self.lines.append("if self.inlining:")
+        start = len(self.lines)
+        v = self._generateNode(expr)
+        self.lines.append("%s = %s" % (name, v))
+        self.lines.append("else:")
+        middle = len(self.lines)
+        v = self.generate_Apply(ruleName, codeName, ())
+        self.lines.append("%s = %s" % (name, v))
+        self.lines[start:middle - 1] = [" " * 4 + line
+                                        for line in self.lines[start:middle - 1]]
+        self.lines[middle:] = [" " * 4 + line for line in self.lines[middle:]]
+        return name
 
     def generate_Exactly(self, literal):
         """
         Create a call to self.exactly(literal).
         """
-        return self._expr('exactly', 'self.exactly(%r)' % (literal,))
+        return self._expr('exactly', '%s(%r)' % (self._primitive('exactly'), literal))
 
     def generate_MatchString(self, literal):
         """
         Create a call to self.match_string(literal).
         """
-        return self._expr('match_string', 'self.match_string(%r)' % (literal,))
+        return self._expr('match_string', '%s(%r)' % (self._primitive('match_string'), literal))
+
+    def generate_MatchCharacters(self, literal):
+        """
+        Create a call to self.matchCharacters(literal).
+        """
+        return self._expr('matchCharacters', '%s(%r)' % (self._primitive('matchCharacters'), literal))
 
 
     def generate_Many(self, expr):
@@ -189,7 +366,7 @@ class PythonWriter(object):
         Create a call to self.many(lambda: expr).
         """
         fname = self._newThunkFor("many", expr)
-        return self._expr('many', 'self.many(%s)' % (fname,))
+        return self._expr('many', '%s(%s)' % (self._primitive('many'), fname))
 
 
     def generate_Many1(self, expr):
@@ -197,7 +374,7 @@ class PythonWriter(object):
         Create a call to self.many(lambda: expr).
         """
         fname = self._newThunkFor("many1", expr)
-        return self._expr('many1', 'self.many(%s, %s())' % (fname, fname))
+        return self._expr('many1', '%s(%s, %s())' % (self._primitive('many'), fname, fname))
 
 
     def generate_Optional(self, expr):
@@ -206,18 +383,30 @@ class PythonWriter(object):
         """
         realf = self._newThunkFor("optional", expr)
         passf = self._gensym("optional")
-        self._writeFunction(passf, (), ["return (None, self.input.nullError())"])
-        return self._expr('or', 'self._or([%s])' % (', '.join([realf, passf])))
+        self._writeFunction(passf, (), ["return (None, None)"])
+        return self._expr('or', '%s(%s)' % (self._primitive('_or'),
+                                            self._alternatives([realf, passf])))
 
 
     def generate_Or(self, *exprs):
         """
         Create a call to
-        self._or([lambda: expr1, lambda: expr2, ... , lambda: exprN]).
+        self._or([lambda: expr1, lambda: expr2, ... , lambda: exprN]), or to
+        self._dispatch(table, [...]) when the alternatives can be told apart
+        by the next input character.
         """
         if len(exprs) > 1:
             fnames = [self._newThunkFor("or", expr) for expr in exprs]
-            return self._expr('or', 'self._or([%s])' % (', '.join(fnames)))
+            table = None
+            if self.firstSets is not None:
+                table = analysis.dispatchTable(self.firstSets, exprs)
+            if table is not None:
+                self.dispatchTables.append(table)
+                return self._expr('or', '%s(_G_dispatch_%s, %s)' % (
+                        self._primitive('_dispatch'), len(self.dispatchTables),
+                        self._alternatives(fnames)))
+            return self._expr('or', '%s(%s)' % (self._primitive('_or'),
+                                                self._alternatives(fnames)))
         else:
             return self._generateNode(exprs[0])
 
@@ -228,7 +417,7 @@ class PythonWriter(object):
         """
         if len(exprs) > 1:
             fnames = [self._newThunkFor("xor", expr) for expr in exprs]
-            return self._expr('xor', 'self._xor([%s])' % (', '.join(fnames)))
+            return self._expr('xor', '%s([%s])' % (self._primitive('_xor'), ', '.join(fnames)))
         else:
             return self._generateNode(exprs[0])
 
@@ -238,7 +427,7 @@ class PythonWriter(object):
         Create a call to self._not(lambda: expr).
         """
         fname = self._newThunkFor("not", expr)
-        return self._expr("not", "self._not(%s)" % (fname,))
+        return self._expr("not", "%s(%s)" % (self._primitive('_not'), fname))
 
 
     def generate_Lookahead(self, expr):
@@ -246,7 +435,7 @@ class PythonWriter(object):
         Create a call to self.lookahead(lambda: expr).
         """
         fname = self._newThunkFor("lookahead", expr)
-        return self._expr("lookahead", "self.lookahead(%s)" %(fname,))
+        return self._expr("lookahead", "%s(%s)" % (self._primitive('lookahead'), fname))
 
     def generate_And(self, *exprs):
         """
@@ -274,7 +463,7 @@ class PythonWriter(object):
         """
 
         fname = self._newThunkFor("pred", expr)
-        return self._expr("pred", "self.pred(%s)" %(fname,))
+        return self._expr("pred", "%s(%s)" % (self._primitive('pred'), fname))
 
 
     def generate_Action(self, expr):
@@ -296,40 +485,64 @@ class PythonWriter(object):
         Generate a call to self.listpattern(lambda: expr).
         """
         fname = self._newThunkFor("listpattern", expr)
-        return  self._expr("listpattern", "self.listpattern(%s)" %(fname,))
+        return  self._expr("listpattern", "%s(%s)" % (self._primitive('listpattern'), fname))
 
 
-    def generate_Rule(self, name, expr):
+    def generate_Rule(self, name, expr, annotations=()):
+        for annotation in annotations:
+            if annotation not in analysis.ANNOTATIONS:
+                raise ValueError("Unknown annotation @%s on rule %s"
+                                 % (annotation, name))
         rulelines = ["_locals = {'self': self}",
                      "self.locals[%r] = _locals" % (name,)]
-        subwriter = self.__class__(expr)
+        subwriter = self._subwriter(expr)
         flines  = subwriter._generate(retrn=True)
         rulelines.extend(flines)
         self._writeFunction("rule_" + name, ("self",), rulelines)
 
     def generate_Grammar(self, name, rules):
         self.lines.append("class %s(GrammarBase):" % (name,))
-        self.lines.append("    globals = globals()")
+        for line in self.classAttributes:
+            self.lines.append("    " + line)
+        if self.trace:
+            self.lines.append("    traced = True")
+        self.transientRules.update(analysis.transientRules(rules))
+        self.grammarRules.update(rule[1] for rule in rules)
+        self.grammarName = name
+        self.firstSets = analysis.FirstSets(rules)
+        inlined = set()
+        for rule in rules:
+            inlined.update(n[1] for n in analysis.walk(rule)
+                           if n[0] == "Inline")
+        if inlined:
+            self.lines.append("    inlinedRules = %r" % (sorted(inlined),))
+        direct = len(self.lines)
+        self.lines.append("    leftRecursiveRules = %r"
+                          % (sorted(analysis.leftRecursiveRules(rules)),))
         start = len(self.lines)
         for rule in rules:
             self._generateNode(rule)
             self.lines.extend(['', ''])
+        if self.directRules:
+            self.lines.insert(direct, "    directRules = %r"
+                              % (sorted(self.directRules),))
+            start += 1
         self.lines[start:] = [line and (' ' * 4 + line) for line in self.lines[start:]]
         del self.lines[-1:]
 
     def generate_ConsumedBy(self, expr):
         fname = self._newThunkFor("consumed_by", expr)
-        return self._expr("consumed_by", "self.consumed_by(%s)" % (fname,))
+        return self._expr("consumed_by", "%s(%s)" % (self._primitive('consumed_by'), fname))
 
     def generate_IndexConsumedBy(self, expr):
         fname = self._newThunkFor("index_consumed_by", expr)
-        return self._expr("index_consumed_by", "self.index_consumed_by(%s)" % (fname,))
+        return self._expr("index_consumed_by", "%s(%s)" % (self._primitive('index_consumed_by'), fname))
 
     def generate_Range(self, c1, c2):
         """
         Create a call to self.range(c1, c2)
         """
-        return self._expr('range', 'self.range(%r, %r)' % (c1, c2))
+        return self._expr('range', '%s(%r, %r)' % (self._primitive('range'), c1, c2))
 
     def generate_Interleave(self, *exprs):
         """
@@ -342,24 +555,124 @@ class PythonWriter(object):
                 args.append(repr(x))
                 args.append(self._newThunkFor("interleave", expr))
                 args.append(repr(name))
-            return self._expr('interleave', 'self._interleave(_locals, %s)' % (', '.join(args)))
+            return self._expr('interleave', '%s(_locals, %s)' % (self._primitive('_interleave'), ', '.join(args)))
         else:
             return self._generateNode(exprs[0])
 
-class BootWriter(PythonWriter):
-    def generate_Grammar(self, name, rules):
-        self.lines.append("from pymeta.bootbase import BootBase as GrammarBase")
-        self.lines.append("import string")
-        super(BootWriter, self).generate_Grammar(name, rules)
+class SentinelWriter(PythonWriter):
+    """
+    Converts an OMeta syntax tree into Python source using the sentinel
+    failure protocol: rules and the primitives they call report failure by
+    returning C{(FAIL, error)} rather than by raising L{_MaybeParseError},
+    and generated code returns early as soon as a call fails.
+    """
+    classAttributes = PythonWriter.classAttributes + ["sentinelFailures = True"]
+
+    primitives = {
+        '_apply': '_tryApply',
+        '_applyPattern': '_tryApplyPattern',
+        '_applyCall': '_tryApplyCall',
+        'superApply': 'trySuperApply',
+        'exactly': 'tryExactly',
+        'match_string': 'tryMatchString',
+        'matchCharacters': 'tryMatchCharacters',
+        'many': 'tryMany',
+        '_or': '_tryOr',
+        '_dispatch': '_tryDispatch',
+        '_xor': '_tryXor',
+        '_not': '_tryNot',
+        'pred': 'tryPred',
+        'listpattern': 'tryListpattern',
+        'consumed_by': 'tryConsumedBy',
+        'index_consumed_by': 'tryIndexConsumedBy',
+        'range': 'tryRange',
+        '_interleave': '_tryInterleave',
+        '_callTransient': '_tryCallTransient',
+        }
+
+    def _primitive(self, name):
+        return "self." + self.primitives.get(name, name)
+
+
+    def _preamble(self):
+        return (["_G_FAIL = GrammarBase.FAIL"] +
+                super(SentinelWriter, self)._preamble())
+
+
+    def _expr(self, typ, e):
+        name = self._gensym(typ)
+        self.lines.append("%s, lastError = %s" % (name, e))
+        if typ != 'python':
+            self._checkFailure(name)
+        return name
+
+    def _checkFailure(self, name):
+        self.lines.append("if %s is _G_FAIL: return (%s, lastError)"
+                          % (name, name))
+
+class ModuleWriter(PythonWriter):
+    """
+    Writer for grammars shipped as modules of the package, which import
+    their base class instead of having it set up by L{moduleFromSource}.
+    """
+    imports = []
+
+    def _preamble(self):
+        return self.imports + super(ModuleWriter, self)._preamble()
+
+class SentinelModuleWriter(ModuleWriter, SentinelWriter):
+    """
+    L{ModuleWriter} for the sentinel failure protocol.
+    """
+
+class BootWriter(ModuleWriter):
+    imports = ["from pymeta.bootbase import BootBase as GrammarBase",
+               "import string"]
+
+class RulesWriter(ModuleWriter):
+    imports = ["from pymeta.runtime import OMetaBase as GrammarBase",
+               "import string"]
 
-def writePython(tree):
-    pw = PythonWriter(tree)
+def writePython(tree, sentinel=False, trace=False):
+    """
+    Return Python source defining the grammar in C{tree}.
+
+    @param sentinel: Whether to generate code for the sentinel failure
+    protocol, see L{SentinelWriter}.
+    @param trace: Whether the generated code reports parse events to the
+    parser's tracer, see L{pymeta.trace}.
+    """
+    if sentinel:
+        pw = SentinelWriter(tree)
+    else:
+        pw = PythonWriter(tree)
+    pw.trace = trace
     return pw.output()
 
 def writeBoot(tree):
     pw = BootWriter(tree)
     return pw.output()
 
+def writeRules(tree):
+    pw = RulesWriter(tree)
+    return pw.output()
+
+def writeModule(tree, imports, sentinel=False):
+    """
+    Return the source of a module defining the grammar in C{tree}.
+
+    @param imports: The lines the module starts with, which must import
+    the base class of the grammar as C{GrammarBase}.
+    @param sentinel: Whether to generate code for the sentinel failure
+    protocol, see L{SentinelWriter}.
+    """
+    if sentinel:
+        pw = SentinelModuleWriter(tree)
+    else:
+        pw = ModuleWriter(tree)
+    pw.imports = list(imports)
+    return pw.output()
+
 class GeneratedCodeLoader(object):
     """
     Object for use as a module's __loader__, to display generated
@@ -370,19 +683,52 @@ class GeneratedCodeLoader(object):
     def get_source(self, name):
         return self.source
 
-def moduleFromGrammar(tree, className, superclass, globalsDict):
-    source = writePython(tree)
+def generatedFilename(className):
+    """
+    Return the file name under which the code generated for a grammar class
+    is compiled, and under which its source is shown in tracebacks.
+    """
+    return "/pymeta_generated_code/pymeta_grammar__" + className + ".py"
+
+def compileGrammar(source, className):
+    """
+    Compile the source generated for a grammar class into a code object.
+    """
+    return compile(source, generatedFilename(className), "exec")
+
+def moduleFromGrammar(tree, className, superclass, globalsDict,
+                      sentinel=False, trace=False):
+    source = writePython(tree, sentinel, trace)
+    return moduleFromSource(source, compileGrammar(source, className),
+                            className, superclass, globalsDict)
+
+def moduleFromSource(source, code, className, superclass, globalsDict):
+    """
+    Run the code generated for a grammar in a new module and return the
+    grammar class it defines.
+
+    @param source: The generated Python source.
+    @param code: C{source} compiled with L{compileGrammar}.
+    """
     modname = "pymeta_grammar__" + className
-    filename = "/pymeta_generated_code/" + modname + ".py"
+    filename = generatedFilename(className)
     mod = module(modname)
     mod.__dict__.update(globalsDict)
     mod.__name__ = modname
     mod.__dict__[superclass.__name__] = superclass
     mod.__dict__["GrammarBase"] = superclass
     mod.__loader__ = GeneratedCodeLoader(source)
-    code = compile(source, filename, "exec")
     eval(code, mod.__dict__)
-    mod.__dict__[className].globals = globalsDict
+    grammarClass = mod.__dict__[className]
+    grammarClass.globals = globalsDict
+    # Python 2 clears a module's namespace when the module object is freed,
+    # and the generated rules look up their compiled expressions there.
+    # Keep the module alive even after another grammar with the same name
+    # replaces it in sys.modules.
+    grammarClass._G_module = mod
+    # What it takes to define the class again in another process, see
+    # L{pymeta.batch.grammarDefinition}.
+    grammarClass._G_definition = (source, className, superclass, globalsDict)
     sys.modules[modname] = mod
     linecache.getlines(filename, mod.__dict__)
-    return mod.__dict__[className]
+    return grammarClass
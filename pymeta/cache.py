@@ -0,0 +1,121 @@
+"""
+An on-disk cache of the code generated for grammars, so that defining a
+grammar that was already compiled once skips parsing it, generating Python
+source for it and compiling that source.
+"""
+import hashlib, imp, marshal, os, tempfile
+import pymeta
+from pymeta import builder
+
+class GrammarCache(object):
+    """
+    A directory of compiled grammars. Each entry holds the generated source
+    and its code object, marshalled the way C{.pyc} files are, in a file
+    named after a hash of everything the generated code depends on: the
+    grammar text, the class name, the base class and metagrammar, the code
+    generation options, the pymeta version, the version of the generated
+    code format, see L{pymeta.builder.CODE_FORMAT}, and the Python bytecode
+    version.
+    Changing any of them selects a different entry, so stale entries are
+    never loaded.
+    """
+
+    def __init__(self, directory):
+        """
+        @param directory: The directory holding the cache entries. It is
+        created when the first entry is stored.
+        """
+        self.directory = directory
+
+
+    def key(self, grammar, name, superclass, **options):
+        """
+        Return the key under which the code for a grammar is cached.
+
+        @param grammar: A string containing a PyMeta grammar.
+        @param name: The name of the class to be generated.
+        @param superclass: The class the grammar is defined on.
+        @param options: The code generation options the grammar is compiled
+        with.
+        """
+        h = hashlib.sha1()
+        if isinstance(grammar, unicode):
+            grammar = grammar.encode('utf-8')
+        for part in (pymeta.__version__, str(builder.CODE_FORMAT),
+                     imp.get_magic(), name,
+                     qualifiedName(superclass),
+                     qualifiedName(superclass.metagrammarClass),
+                     repr(sorted(options.items())), grammar):
+            h.update(part)
+            h.update('\0')
+        return h.hexdigest()
+
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.pymc')
+
+
+    def load(self, key):
+        """
+        Return the C{(source, code)} pair cached under C{key}, or C{None} if
+        there is no usable entry.
+        """
+        try:
+            f = open(self.path(key), 'rb')
+        except IOError:
+            return None
+        try:
+            data = f.read()
+        finally:
+            f.close()
+        magic = imp.get_magic()
+        if not data.startswith(magic):
+            return None
+        try:
+            source, code = marshal.loads(data[len(magic):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return source, code
+
+
+    def store(self, key, source, code):
+        """
+        Cache the generated source for a grammar and its code object under
+        C{key}. Failing to write the entry is not an error: the grammar is
+        then compiled again next time.
+        """
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # Write to a temporary file first, so that a process reading the
+            # cache concurrently never sees a partial entry.
+            fd, tmp = tempfile.mkstemp(dir=self.directory)
+            try:
+                f = os.fdopen(fd, 'wb')
+                try:
+                    f.write(imp.get_magic())
+                    f.write(marshal.dumps((source, code)))
+                finally:
+                    f.close()
+                os.rename(tmp, self.path(key))
+            except:
+                os.unlink(tmp)
+                raise
+        except (IOError, OSError):
+            pass
+
+
+def qualifiedName(cls):
+    return "%s.%s" % (cls.__module__, cls.__name__)
+
+
+def defaultCache():
+    """
+    Return the cache used when a grammar is defined without an explicit one:
+    the directory named by the C{PYMETA_CACHE_DIR} environment variable, if
+    it is set.
+    """
+    directory = os.environ.get('PYMETA_CACHE_DIR')
+    if directory:
+        return GrammarCache(directory)
+    return None
@@ -0,0 +1,106 @@
+"""
+Compile grammar files ahead of time into importable Python modules, so
+that programs using them do not parse grammars or generate code when they
+start.
+
+Usage: python -m pymeta.compiler [options] grammar.ometa
+
+The module is written next to the grammar file, or to the file given with
+C{-o}. It defines one grammar class, subclassing the class given with
+C{--base}. Its embedded Python expressions run in the module's namespace;
+C{--import} adds the lines bringing in the names they use. The output only
+depends on the grammar and the options, so it can be committed and
+diffed. The module refuses to be imported by another version of pymeta
+than the one that generated it.
+"""
+import optparse, os, sys
+import pymeta
+from pymeta.builder import TreeBuilder, writeModule
+from pymeta.optimizer import passManager
+
+DEFAULT_BASE = 'pymeta.grammar.OMeta'
+
+
+def importBase(path):
+    """
+    Return the class named by a dotted path, such as
+    C{pymeta.grammar.OMeta}.
+    """
+    moduleName, _, className = path.rpartition('.')
+    if not moduleName:
+        raise ValueError("Base class %r is not a dotted path" % (path,))
+    __import__(moduleName)
+    return getattr(sys.modules[moduleName], className)
+
+
+def compileModule(grammar, name="Grammar", base=DEFAULT_BASE, imports=(),
+                  sentinel=None, optimize=None):
+    """
+    Return the source of a module defining a grammar class.
+
+    @param grammar: A string containing a PyMeta grammar.
+    @param name: The name of the class to be generated.
+    @param base: The dotted path of the class it subclasses.
+    @param imports: Lines of Python run before the grammar is defined,
+    importing what its expressions use.
+    @param sentinel: Whether the rules use the sentinel failure protocol,
+    see L{OMeta.makeGrammar}. Defaults to the mode of the base class.
+    @param optimize: The optimization level or L{PassManager}, see
+    L{OMeta.makeGrammar}.
+    """
+    baseClass = importBase(base)
+    if sentinel is None:
+        sentinel = baseClass.sentinelFailures
+    moduleName, _, className = base.rpartition('.')
+    g = baseClass.metagrammarClass(grammar)
+    tree = passManager(optimize).optimize(g.parseGrammar(name, TreeBuilder))
+    header = [
+        "# Generated by pymeta %s with pymeta.compiler; do not edit."
+        % (pymeta.__version__,),
+        "import pymeta",
+        "__pymeta_version__ = %r" % (pymeta.__version__,),
+        "if pymeta.__version__ != __pymeta_version__:",
+        "    raise ImportError('%s was generated by pymeta %s, compile it "
+        "again for pymeta %s' % (__name__, __pymeta_version__, "
+        "pymeta.__version__))",
+        "from %s import %s as GrammarBase" % (moduleName, className),
+        "import string"]
+    return writeModule(tree, header + list(imports), sentinel) + "\n"
+
+
+def main(argv=None):
+    parser = optparse.OptionParser(
+        usage="%prog [options] grammar.ometa",
+        description="Compile a grammar file into a Python module.")
+    parser.add_option('-o', '--output', help="the module file to write, by "
+                      "default the grammar file with a .py extension")
+    parser.add_option('-n', '--name', default="Grammar",
+                      help="the name of the grammar class [%default]")
+    parser.add_option('-b', '--base', default=DEFAULT_BASE,
+                      help="the dotted path of its base class [%default]")
+    parser.add_option('-i', '--import', dest='imports', action='append',
+                      default=[], metavar='LINE',
+                      help="a line importing names used by the grammar, "
+                      "such as 'from decimal import Decimal'; repeatable")
+    parser.add_option('-s', '--sentinel', action='store_true', default=None,
+                      help="use the sentinel failure protocol")
+    parser.add_option('-O', '--optimize', type='int', default=None,
+                      help="the optimization level")
+    options, args = parser.parse_args(argv)
+    if len(args) != 1:
+        parser.error("expected one grammar file")
+    path = args[0]
+    output = options.output or os.path.splitext(path)[0] + '.py'
+    grammar = open(path, 'rb').read()
+    source = compileModule(grammar, options.name, options.base,
+                           options.imports, options.sentinel,
+                           options.optimize)
+    fp = open(output, 'wb')
+    try:
+        fp.write(source)
+    finally:
+        fp.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,9 +2,13 @@
 Public interface to OMeta, as well as the grammars used to compile grammar
 definitions.
 """
-from .builder import TreeBuilder, moduleFromGrammar
+from .builder import (TreeBuilder, compileGrammar, moduleFromSource,
+    writePython)
+from .cache import GrammarCache, defaultCache
+from .optimizer import passManager
 from .boot import BootOMetaGrammar
 from .bootbase import BootBaseTraits
+from . import batch
 from .runtime import OMetaBase
 import string
 
@@ -13,7 +17,8 @@ class OMeta(OMetaBase):
     Base class for grammar definitions.
     """
     metagrammarClass = BootOMetaGrammar
-    def makeGrammar(cls, grammar, globals, name="Grammar"):
+    def makeGrammar(cls, grammar, globals, name="Grammar", cache=None,
+                    sentinel=None, optimize=None, trace=False):
         """
         Define a new subclass with the rules in the given grammar.
 
@@ -21,13 +26,60 @@ class OMeta(OMetaBase):
         @param globals: A dict of names that should be accessible by this
         grammar.
         @param name: The name of the class to be generated.
+        @param cache: A L{GrammarCache}, or the path of its directory, in
+        which to look for the code already generated for this grammar and to
+        store it otherwise. Defaults to the directory named by the
+        C{PYMETA_CACHE_DIR} environment variable, if set.
+        @param sentinel: Whether the rules report failure by returning a
+        sentinel value rather than by raising an exception internally, which
+        makes backtracking cheaper. Parse errors are raised the same way in
+        both modes. Defaults to the mode of the grammar being extended.
+        @param optimize: The optimization level the grammar tree is
+        rewritten with before code is generated for it, 0 for none, or a
+        L{PassManager} running the passes to use. Defaults to
+        L{pymeta.optimizer.DEFAULT_LEVEL}.
+        @param trace: Whether the rules report parse events to the tracer of
+        the parser, see L{pymeta.trace}. Grammars compiled without it carry
+        no tracing code.
         """
+        if sentinel is None:
+            sentinel = cls.sentinelFailures
+        passes = passManager(optimize)
+        if cache is None:
+            cache = defaultCache()
+        elif isinstance(cache, basestring):
+            cache = GrammarCache(cache)
+        if cache is not None:
+            options = dict(sentinel=sentinel, passes=passes.names())
+            if trace:
+                # keys of grammars without tracing stay as they were
+                options['trace'] = True
+            key = cache.key(grammar, name, cls, **options)
+            entry = cache.load(key)
+            if entry is not None:
+                source, code = entry
+                return moduleFromSource(source, code, name, cls, globals)
         g = cls.metagrammarClass(grammar)
-        tree = g.parseGrammar(name, TreeBuilder)
-        return moduleFromGrammar(tree, name, cls, globals)
+        tree = passes.optimize(g.parseGrammar(name, TreeBuilder))
+        source = writePython(tree, sentinel, trace)
+        code = compileGrammar(source, name)
+        if cache is not None:
+            cache.store(key, source, code)
+        return moduleFromSource(source, code, name, cls, globals)
     
     makeGrammar = classmethod(makeGrammar)
 
+    def parseMany(cls, documents, workers=None, rule='grammar',
+                  chunkSize=64):
+        """
+        Parse many independent documents with this grammar in a pool of
+        worker processes, yielding a C{(value, error)} pair for each of
+        them, in order. See L{pymeta.batch.parseMany}.
+        """
+        return batch.parseMany(cls, documents, workers, rule, chunkSize)
+
+    parseMany = classmethod(parseMany)
+
 ometaGrammar = r"""
 hspace = (' ' | '\t')
 vspace = ("\r\n" | '\r' | '\n')
@@ -128,14 +180,22 @@ rulePart :requiredName = noindentation name:n ?(n == requiredName)
                             (token("=") expr:e
                                -> self.builder.sequence([args, e])
                             |  -> args)
-rule = noindentation ~~(name:n) rulePart(n):r
-          (rulePart(n)+:rs -> self.builder.rule(n, self.builder._or([r] + rs))
-          |                     -> self.builder.rule(n, r))
+annotation = noindentation '@' name:a -> a
+
+rule = annotation*:ann noindentation ~~(name:n) rulePart(n):r
+          (rulePart(n)+:rs -> self.builder.rule(n, self.builder._or([r] + rs), ann)
+          |                     -> self.builder.rule(n, r, ann))
 
 grammar = rule*:rs spaces -> self.builder.makeGrammar(rs)
 """
 
-class OMetaGrammar(BootBaseTraits, OMeta.makeGrammar(ometaGrammar, globals())):
+# The rules of the grammars below are compiled ahead of time into modules of
+# the package by rulesgenerator.py, which must be run again whenever their
+# text changes.
+from .ometa_rules import OMetaGrammarRules
+from .nulloptimizer_rules import NullOptimizerRules
+
+class OMetaGrammar(BootBaseTraits, OMeta, OMetaGrammarRules):
     """
     The base grammar for parsing grammar definitions.
     """
@@ -166,8 +226,13 @@ opt = ( ['Apply' :ruleName :codeName [anything*:exprs]] -> self.builder.apply(ru
       | ['Interleave' [anything opt anything]*:exprs] -> self.builder.interleave(exprs)
       )
 grammar = ['Grammar' :name [rulePair*:rs]] -> self.builder.makeGrammar(rs)
-rulePair = ['Rule' :name opt:rule] -> self.builder.rule(name, rule)
+rulePair = ['Rule' :name opt:rule :annotations] -> self.builder.rule(name, rule, annotations)
 
 """
 
-NullOptimizer = OMeta.makeGrammar(nullOptimizationGrammar, {}, name="NullOptimizer")
+class NullOptimizer(OMeta, NullOptimizerRules):
+    """
+    A grammar rebuilding the tree of a grammar definition unchanged, meant to
+    be extended by optimizations.
+    """
+
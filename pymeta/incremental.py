@@ -0,0 +1,210 @@
+"""
+Parsing text again after edits, reusing the memo records of the previous
+parse that the edits left valid.
+"""
+from pymeta.runtime import (FAIL, FailureTracker, InputStream, ParseError,
+    _MaybeParseError, _APPLY_METHODS, argsKey)
+
+
+def _report(failures, position, expected):
+    """
+    Record a failure with a failure tracker, as L{FailureTracker.record}
+    does, given the ids of what was expected.
+    """
+    if failures.quiet or not expected or position < failures.position:
+        return
+    if position > failures.position:
+        failures.position = position
+        failures.expected = set(expected)
+    else:
+        failures.expected.update(expected)
+
+
+class _ReadTracker(object):
+    """
+    Text input recording the farthest position read from it, which parsers
+    read through instead of the string itself.
+
+    @ivar farthest: The farthest position read since it was last reset, or
+    -1.
+    """
+    def __init__(self, text):
+        self.text = text
+        self.farthest = -1
+
+    def __getitem__(self, index):
+        if index.__class__ is slice:
+            return self.text[index]
+        if index > self.farthest:
+            self.farthest = index
+        return self.text[index]
+
+
+class ParseSession(object):
+    """
+    A parse of some text that can be run again after the text is edited.
+
+    Each memoized rule application records the farthest position it
+    examined, including its lookahead and the failed matches it tried. An
+    edit drops the memo records of the applications that examined the text
+    it changes, and moves the records after it by the length it added or
+    removed. Parsing again then runs the start rule from the beginning,
+    applying again only the rules whose records were dropped. Reused
+    records report the failures their applications did, so a failed parse
+    raises the error a fresh parse would.
+
+    Values kept in moved records are reused as they are, so grammars whose
+    rules return input positions, as C{<@...>} does, must not be parsed
+    this way.
+
+    @ivar parser: The parser, kept from one parse to the next.
+    @ivar text: The current text.
+    @ivar dropped: The number of memo records dropped by the last edits.
+    @ivar moved: The number of memo records moved by the last edits.
+    """
+
+    def __init__(self, grammarClass, text, rule='grammar'):
+        """
+        @param grammarClass: The grammar class to parse with.
+        @param text: A string.
+        @param rule: The name of the rule to start parsing with.
+        """
+        self.rule = rule
+        self.text = text
+        self.reads = _ReadTracker(text)
+        self.extents = {}
+        self.dropped = self.moved = 0
+        parser = self.parser = grammarClass(text, diagnostics=True)
+        stream = InputStream.fromIterable(text)
+        parser._setInput(InputStream(self.reads, stream.basetype))
+        for name in _APPLY_METHODS:
+            setattr(parser, name, self._tracking(getattr(parser, name)))
+
+    def _tracking(self, apply):
+        """
+        Wrap a method applying rules so that it records what each
+        application examined in L{extents}, keyed by the memo table key of
+        the rule and the position it was applied at: the farthest position
+        it read, and the farthest failure it reported, which is reported
+        again whenever its memo record answers for it, both relative to
+        that position. Applications answered from the memo examine what the
+        application that made the record did.
+        """
+        parser = self.parser
+        reads = self.reads
+        extents = self.extents
+        def tracked(rule, ruleId, args):
+            start = parser.input
+            key = extent = None
+            if start.__class__ is int and ruleId is not None:
+                if args:
+                    key = (argsKey(ruleId, args), start)
+                else:
+                    key = (ruleId, start)
+                try:
+                    extent = extents.get(key)
+                except TypeError:
+                    # unhashable arguments are not memoized
+                    key = None
+            outer = reads.farthest
+            reads.farthest = -1
+            failures = parser.failures
+            tracker = None
+            if key is not None and extent is None:
+                tracker = parser.failures = FailureTracker()
+            try:
+                result = apply(rule, ruleId, args)
+                if tracker is not None and result[0] is FAIL:
+                    tracker.record(*result[1])
+                return result
+            except _MaybeParseError, e:
+                if tracker is not None:
+                    tracker.record(e[0], e[1])
+                raise
+            finally:
+                examined = reads.farthest
+                if tracker is not None:
+                    parser.failures = failures
+                    extent = extents.get(key)
+                    if extent is not None:
+                        examined = max(examined, start + extent[0])
+                    expected = tuple(tracker.expected) or None
+                    extents[key] = (examined - start, tracker.position - start,
+                                    expected)
+                    _report(failures, tracker.position, expected)
+                elif key is not None:
+                    if examined > start + extent[0]:
+                        extents[key] = (examined - start,) + extent[1:]
+                    else:
+                        examined = start + extent[0]
+                    _report(failures, start + extent[1], extent[2])
+                reads.farthest = max(outer, examined)
+        return tracked
+
+    def parse(self):
+        """
+        Parse the current text from the beginning, and return the value of
+        the start rule.
+        """
+        parser = self.parser
+        parser.input = 0
+        parser.failures = FailureTracker()
+        self.reads.farthest = -1
+        try:
+            return parser.apply(self.rule)[0]
+        except _MaybeParseError:
+            raise ParseError(parser.currentError.formatError(self.text))
+
+    def edit(self, edits):
+        """
+        Apply edits to the text and parse it again, reusing the memo records
+        they leave valid. Return the value of the start rule.
+
+        @param edits: A sequence of C{(offset, deleted length, inserted
+        text)} tuples, each applied to the text left by the previous one.
+        """
+        self.dropped = self.moved = 0
+        for offset, deleted, inserted in edits:
+            self.text = (self.text[:offset] + inserted +
+                         self.text[offset + deleted:])
+            self._invalidate(offset, deleted, len(inserted) - deleted)
+        self.reads.text = self.text
+        return self.parse()
+
+    def _invalidate(self, offset, deleted, delta):
+        """
+        Drop the memo records of the applications that examined the
+        replaced text, and move those after it by C{delta}.
+        """
+        parser = self.parser
+        tables = [(ruleId, table) for ruleId, table in enumerate(parser.memo)
+                  if table]
+        tables.extend(parser.argMemo.iteritems())
+        limit = offset + deleted
+        oldExtents = self.extents
+        extents = {}
+        for key, table in tables:
+            records = table.items()
+            table.clear()
+            for position, rec in records:
+                extent = oldExtents.get((key, position))
+                if position >= limit:
+                    if rec.__class__ is tuple:
+                        end, value, error = rec
+                        if end.__class__ is int:
+                            end += delta
+                        if error is not None and error[0] is not None:
+                            error = [error[0] + delta] + list(error[1:])
+                        rec = end, value, error
+                    table[position + delta] = rec
+                    if extent is not None:
+                        extents[key, position + delta] = extent
+                    self.moved += 1
+                elif extent is not None and position + extent[0] < offset:
+                    table[position] = rec
+                    extents[key, position] = extent
+                else:
+                    self.dropped += 1
+        # the same dict is shared with the wrapped methods
+        oldExtents.clear()
+        oldExtents.update(extents)
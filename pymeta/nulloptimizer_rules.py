@@ -0,0 +1,283 @@
+from pymeta.runtime import OMetaBase as GrammarBase
+import string
+_G_rule_anything = GrammarBase.ruleId('anything')
+_G_rule_opt = GrammarBase.ruleId('opt')
+_G_rule_rulePair = GrammarBase.ruleId('rulePair')
+_G_expr_1 = compile('self.builder.apply(ruleName, codeName, *exprs)', '<string>', 'eval')
+_G_expr_2 = compile('self.builder.exactly(expr)', '<string>', 'eval')
+_G_expr_3 = compile('self.builder.match_string(expr)', '<string>', 'eval')
+_G_expr_4 = compile('self.builder.many(expr)', '<string>', 'eval')
+_G_expr_5 = compile('self.builder.many1(expr)', '<string>', 'eval')
+_G_expr_6 = compile('self.builder.optional(expr)', '<string>', 'eval')
+_G_expr_7 = compile('self.builder._or(exprs)', '<string>', 'eval')
+_G_expr_8 = compile('self.builder.sequence(exprs)', '<string>', 'eval')
+_G_expr_9 = compile('self.builder._not(expr)', '<string>', 'eval')
+_G_expr_10 = compile('self.builder.lookahead(expr)', '<string>', 'eval')
+_G_expr_11 = compile('self.builder.bind(expr, name)', '<string>', 'eval')
+_G_expr_12 = compile('self.builder.pred(expr)', '<string>', 'eval')
+_G_expr_13 = compile('self.builder.action(code)', '<string>', 'eval')
+_G_expr_14 = compile('self.builder.expr(code)', '<string>', 'eval')
+_G_expr_15 = compile('self.builder.listpattern(exprs)', '<string>', 'eval')
+_G_expr_16 = compile('self.builder.consumedby(expr)', '<string>', 'eval')
+_G_expr_17 = compile('self.builder.index_consumedby(expr)', '<string>', 'eval')
+_G_expr_18 = compile('self.builder.range(c1, c2)', '<string>', 'eval')
+_G_expr_19 = compile('self.builder.interleave(exprs)', '<string>', 'eval')
+_G_expr_20 = compile('self.builder.makeGrammar(rs)', '<string>', 'eval')
+_G_expr_21 = compile('self.builder.rule(name, rule, annotations)', '<string>', 'eval')
+class NullOptimizerRules(GrammarBase):
+    globals = globals()
+    leftRecursiveRules = []
+    def rule_opt(self):
+        _locals = {'self': self}
+        self.locals['opt'] = _locals
+        def _G_or_1():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Apply')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['ruleName'] = _G_apply_2
+                _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['codeName'] = _G_apply_3
+                def _G_listpattern_4():
+                    def _G_many_1():
+                        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                        return (_G_apply_1, None)
+                    _G_many_2, lastError = self.many(_G_many_1)
+                    _locals['exprs'] = _G_many_2
+                    return (_locals['exprs'], None)
+                _G_listpattern_5, lastError = self.listpattern(_G_listpattern_4)
+                return (_G_listpattern_5, None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_1, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_2():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Exactly')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_2, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_3():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('MatchString')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_3, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_4():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Many')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_4, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_5():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Many1')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_5, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_6():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Optional')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_6, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_7():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Or')
+                def _G_many_2():
+                    _G_apply_1, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                    return (_G_apply_1, None)
+                _G_many_3, lastError = self.many(_G_many_2)
+                _locals['exprs'] = _G_many_3
+                return (_locals['exprs'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_7, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_8():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('And')
+                def _G_many_2():
+                    _G_apply_1, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                    return (_G_apply_1, None)
+                _G_many_3, lastError = self.many(_G_many_2)
+                _locals['exprs'] = _G_many_3
+                return (_locals['exprs'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_8, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_9():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Xor')
+                def _G_many_2():
+                    _G_apply_1, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                    return (_G_apply_1, None)
+                _G_many_3, lastError = self.many(_G_many_2)
+                _locals['exprs'] = _G_many_3
+                return (_locals['exprs'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_8, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_10():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Not')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_9, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_11():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Lookahead')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_10, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_12():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Bind')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['name'] = _G_apply_2
+                _G_apply_3, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_3
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_11, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_13():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Predicate')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_12, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_14():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Action')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['code'] = _G_apply_2
+                return (_locals['code'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_13, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_15():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Python')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['code'] = _G_apply_2
+                return (_locals['code'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_14, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_16():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('List')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['exprs'] = _G_apply_2
+                return (_locals['exprs'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_15, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_17():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('ConsumedBy')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_16, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_18():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('IndexConsumedBy')
+                _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                _locals['expr'] = _G_apply_2
+                return (_locals['expr'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_17, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_19():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Range')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['c1'] = _G_apply_2
+                _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['c2'] = _G_apply_3
+                return (_locals['c2'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_18, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_20():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Interleave')
+                def _G_many_2():
+                    def _G_listpattern_1():
+                        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                        _G_apply_2, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+                        _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                        return (_G_apply_3, None)
+                    _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+                    return (_G_listpattern_2, None)
+                _G_many_3, lastError = self.many(_G_many_2)
+                _locals['exprs'] = _G_many_3
+                return (_locals['exprs'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_19, self.globals, _locals), None
+            return (_G_python_3, None)
+        _G_or_21, lastError = self._or([_G_or_1, _G_or_2, _G_or_3, _G_or_4, _G_or_5, _G_or_6, _G_or_7, _G_or_8, _G_or_9, _G_or_10, _G_or_11, _G_or_12, _G_or_13, _G_or_14, _G_or_15, _G_or_16, _G_or_17, _G_or_18, _G_or_19, _G_or_20])
+        return (_G_or_21, None)
+
+
+    def rule_grammar(self):
+        _locals = {'self': self}
+        self.locals['grammar'] = _locals
+        def _G_listpattern_1():
+            _G_exactly_1, lastError = self.exactly('Grammar')
+            _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+            _locals['name'] = _G_apply_2
+            def _G_listpattern_3():
+                def _G_many_1():
+                    _G_apply_1, lastError = self._apply(self.rule_rulePair, _G_rule_rulePair, [])
+                    return (_G_apply_1, None)
+                _G_many_2, lastError = self.many(_G_many_1)
+                _locals['rs'] = _G_many_2
+                return (_locals['rs'], None)
+            _G_listpattern_4, lastError = self.listpattern(_G_listpattern_3)
+            return (_G_listpattern_4, None)
+        _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+        _G_python_3, lastError = eval(_G_expr_20, self.globals, _locals), None
+        return (_G_python_3, None)
+
+
+    def rule_rulePair(self):
+        _locals = {'self': self}
+        self.locals['rulePair'] = _locals
+        def _G_listpattern_1():
+            _G_exactly_1, lastError = self.exactly('Rule')
+            _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+            _locals['name'] = _G_apply_2
+            _G_apply_3, lastError = self._apply(self.rule_opt, _G_rule_opt, [])
+            _locals['rule'] = _G_apply_3
+            _G_apply_4, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+            _locals['annotations'] = _G_apply_4
+            return (_locals['annotations'], None)
+        _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+        _G_python_3, lastError = eval(_G_expr_21, self.globals, _locals), None
+        return (_G_python_3, None)
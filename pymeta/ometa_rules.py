@@ -0,0 +1,1005 @@
+from pymeta.runtime import OMetaBase as GrammarBase
+import string
+_G_rule_annotation = GrammarBase.ruleId('annotation')
+_G_rule_anything = GrammarBase.ruleId('anything')
+_G_rule_application = GrammarBase.ruleId('application')
+_G_rule_barenumber = GrammarBase.ruleId('barenumber')
+_G_rule_character = GrammarBase.ruleId('character')
+_G_rule_character2 = GrammarBase.ruleId('character2')
+_G_rule_digit = GrammarBase.ruleId('digit')
+_G_rule_emptyline = GrammarBase.ruleId('emptyline')
+_G_rule_escapedChar = GrammarBase.ruleId('escapedChar')
+_G_rule_expr = GrammarBase.ruleId('expr')
+_G_rule_expr1 = GrammarBase.ruleId('expr1')
+_G_rule_expr2 = GrammarBase.ruleId('expr2')
+_G_rule_expr3 = GrammarBase.ruleId('expr3')
+_G_rule_expr4 = GrammarBase.ruleId('expr4')
+_G_rule_expr5 = GrammarBase.ruleId('expr5')
+_G_rule_hexdigit = GrammarBase.ruleId('hexdigit')
+_G_rule_hspace = GrammarBase.ruleId('hspace')
+_G_rule_indentation = GrammarBase.ruleId('indentation')
+_G_rule_interleavePart = GrammarBase.ruleId('interleavePart')
+_G_rule_letter = GrammarBase.ruleId('letter')
+_G_rule_letterOrDigit = GrammarBase.ruleId('letterOrDigit')
+_G_rule_modedIPart = GrammarBase.ruleId('modedIPart')
+_G_rule_name = GrammarBase.ruleId('name')
+_G_rule_noindentation = GrammarBase.ruleId('noindentation')
+_G_rule_number = GrammarBase.ruleId('number')
+_G_rule_octaldigit = GrammarBase.ruleId('octaldigit')
+_G_rule_range = GrammarBase.ruleId('range')
+_G_rule_rule = GrammarBase.ruleId('rule')
+_G_rule_rulePart = GrammarBase.ruleId('rulePart')
+_G_rule_ruleValue = GrammarBase.ruleId('ruleValue')
+_G_rule_semanticAction = GrammarBase.ruleId('semanticAction')
+_G_rule_semanticPredicate = GrammarBase.ruleId('semanticPredicate')
+_G_rule_spaces = GrammarBase.ruleId('spaces')
+_G_rule_string = GrammarBase.ruleId('string')
+_G_rule_token = GrammarBase.ruleId('token')
+_G_rule_vspace = GrammarBase.ruleId('vspace')
+_G_expr_1 = compile('self.builder.exactly(-x)', '<string>', 'eval')
+_G_expr_2 = compile('self.builder.exactly(x)', '<string>', 'eval')
+_G_expr_3 = compile("int(''.join(hs), 16)", '<string>', 'eval')
+_G_expr_4 = compile("int('0'+''.join(ds), 8)", '<string>', 'eval')
+_G_expr_5 = compile("int(''.join(ds))", '<string>', 'eval')
+_G_expr_6 = compile('x in string.octdigits', '<string>', 'eval')
+_G_expr_7 = compile('x', '<string>', 'eval')
+_G_expr_8 = compile('x in string.hexdigits', '<string>', 'eval')
+_G_expr_9 = compile('"\\n"', '<string>', 'eval')
+_G_expr_10 = compile('"\\r"', '<string>', 'eval')
+_G_expr_11 = compile('"\\t"', '<string>', 'eval')
+_G_expr_12 = compile('"\\b"', '<string>', 'eval')
+_G_expr_13 = compile('"\\f"', '<string>', 'eval')
+_G_expr_14 = compile('\'"\'', '<string>', 'eval')
+_G_expr_15 = compile('"\'"', '<string>', 'eval')
+_G_expr_16 = compile('"\\\\"', '<string>', 'eval')
+_G_expr_17 = compile("self.builder.exactly(''.join(c))", '<string>', 'eval')
+_G_expr_18 = compile('c', '<string>', 'eval')
+_G_expr_19 = compile('".."', '<string>', 'eval')
+_G_expr_20 = compile('c1 < c2', '<string>', 'eval')
+_G_expr_21 = compile('self.builder.range(c1, c2)', '<string>', 'eval')
+_G_expr_22 = compile("self.builder.match_string(''.join(c))", '<string>', 'eval')
+_G_expr_23 = compile('xs.insert(0, x)', '<string>', 'eval')
+_G_expr_24 = compile("''.join(xs)", '<string>', 'eval')
+_G_expr_25 = compile('self.applicationArgs()', '<string>', 'eval')
+_G_expr_26 = compile('self.builder.apply(name, self.name, *args)', '<string>', 'eval')
+_G_expr_27 = compile('self.builder.apply(name, self.name)', '<string>', 'eval')
+_G_expr_28 = compile("'('", '<string>', 'eval')
+_G_expr_29 = compile("')'", '<string>', 'eval')
+_G_expr_30 = compile('e', '<string>', 'eval')
+_G_expr_31 = compile("'['", '<string>', 'eval')
+_G_expr_32 = compile("']'", '<string>', 'eval')
+_G_expr_33 = compile('self.builder.listpattern(e)', '<string>', 'eval')
+_G_expr_34 = compile("'<'", '<string>', 'eval')
+_G_expr_35 = compile("'>'", '<string>', 'eval')
+_G_expr_36 = compile('self.builder.consumedby(e)', '<string>', 'eval')
+_G_expr_37 = compile("'@<'", '<string>', 'eval')
+_G_expr_38 = compile('self.builder.index_consumedby(e)', '<string>', 'eval')
+_G_expr_39 = compile("'~'", '<string>', 'eval')
+_G_expr_40 = compile('self.builder.lookahead(e)', '<string>', 'eval')
+_G_expr_41 = compile('self.builder._not(e)', '<string>', 'eval')
+_G_expr_42 = compile('self.builder.many(e)', '<string>', 'eval')
+_G_expr_43 = compile('self.builder.many1(e)', '<string>', 'eval')
+_G_expr_44 = compile('self.builder.optional(e)', '<string>', 'eval')
+_G_expr_45 = compile('self.builder.bind(r, n)', '<string>', 'eval')
+_G_expr_46 = compile('r', '<string>', 'eval')
+_G_expr_47 = compile("':'", '<string>', 'eval')
+_G_expr_48 = compile('self.builder.bind(self.builder.apply("anything", self.name), n)', '<string>', 'eval')
+_G_expr_49 = compile('ne', '<string>', 'eval')
+_G_expr_50 = compile('self.builder.sequence(es)', '<string>', 'eval')
+_G_expr_51 = compile('not ne', '<string>', 'eval')
+_G_expr_52 = compile('"&&"', '<string>', 'eval')
+_G_expr_53 = compile('es.insert(0, e)', '<string>', 'eval')
+_G_expr_54 = compile('self.builder.interleave(es)', '<string>', 'eval')
+_G_expr_55 = compile('"("', '<string>', 'eval')
+_G_expr_56 = compile('True', '<string>', 'eval')
+_G_expr_57 = compile('")"', '<string>', 'eval')
+_G_expr_58 = compile('["1", e]', '<string>', 'eval')
+_G_expr_59 = compile('part', '<string>', 'eval')
+_G_expr_60 = compile('["*", part, None]', '<string>', 'eval')
+_G_expr_61 = compile('["+", part, None]', '<string>', 'eval')
+_G_expr_62 = compile('["?", part, None]', '<string>', 'eval')
+_G_expr_63 = compile('newpart[:2] + [name]', '<string>', 'eval')
+_G_expr_64 = compile('newpart', '<string>', 'eval')
+_G_expr_65 = compile('["1", part, None]', '<string>', 'eval')
+_G_expr_66 = compile("'|'", '<string>', 'eval')
+_G_expr_67 = compile('self.builder._or(es)', '<string>', 'eval')
+_G_expr_68 = compile("'||'", '<string>', 'eval')
+_G_expr_69 = compile('self.builder._xor(es)', '<string>', 'eval')
+_G_expr_70 = compile('False', '<string>', 'eval')
+_G_expr_71 = compile('"->"', '<string>', 'eval')
+_G_expr_72 = compile('self.ruleValueExpr()', '<string>', 'eval')
+_G_expr_73 = compile('"?("', '<string>', 'eval')
+_G_expr_74 = compile('self.semanticPredicateExpr()', '<string>', 'eval')
+_G_expr_75 = compile('"!("', '<string>', 'eval')
+_G_expr_76 = compile('self.semanticActionExpr()', '<string>', 'eval')
+_G_expr_77 = compile('n == requiredName', '<string>', 'eval')
+_G_expr_78 = compile('setattr(self, "name", n)', '<string>', 'eval')
+_G_expr_79 = compile('"="', '<string>', 'eval')
+_G_expr_80 = compile('self.builder.sequence([args, e])', '<string>', 'eval')
+_G_expr_81 = compile('args', '<string>', 'eval')
+_G_expr_82 = compile('a', '<string>', 'eval')
+_G_expr_83 = compile('n', '<string>', 'eval')
+_G_expr_84 = compile('self.builder.rule(n, self.builder._or([r] + rs), ann)', '<string>', 'eval')
+_G_expr_85 = compile('self.builder.rule(n, r, ann)', '<string>', 'eval')
+_G_expr_86 = compile('self.builder.makeGrammar(rs)', '<string>', 'eval')
+class OMetaGrammarRules(GrammarBase):
+    globals = globals()
+    inlinedRules = ['hspace', 'vspace']
+    directRules = ['annotation', 'hexdigit', 'hspace', 'octaldigit', 'ruleValue', 'semanticAction', 'semanticPredicate', 'vspace']
+    leftRecursiveRules = ['modedIPart']
+    def rule_hspace(self):
+        _locals = {'self': self}
+        self.locals['hspace'] = _locals
+        def _G_or_1():
+            _G_exactly_1, lastError = self.exactly(' ')
+            return (_G_exactly_1, None)
+        def _G_or_2():
+            _G_exactly_1, lastError = self.exactly('\t')
+            return (_G_exactly_1, None)
+        _G_or_3, lastError = self._dispatch(_G_dispatch_1, [_G_or_1, _G_or_2])
+        return (_G_or_3, None)
+
+
+    def rule_vspace(self):
+        _locals = {'self': self}
+        self.locals['vspace'] = _locals
+        def _G_or_1():
+            _G_match_string_1, lastError = self.match_string('\r\n')
+            return (_G_match_string_1, None)
+        def _G_or_2():
+            _G_exactly_1, lastError = self.exactly('\r')
+            return (_G_exactly_1, None)
+        def _G_or_3():
+            _G_exactly_1, lastError = self.exactly('\n')
+            return (_G_exactly_1, None)
+        _G_or_4, lastError = self._dispatch(_G_dispatch_2, [_G_or_1, _G_or_2, _G_or_3])
+        return (_G_or_4, None)
+
+
+    def rule_emptyline(self):
+        _locals = {'self': self}
+        self.locals['emptyline'] = _locals
+        def _G_many_1():
+            if self.inlining:
+                def _G_or_2():
+                    _G_exactly_1, lastError = self.exactly(' ')
+                    return (_G_exactly_1, None)
+                def _G_or_3():
+                    _G_exactly_1, lastError = self.exactly('\t')
+                    return (_G_exactly_1, None)
+                _G_or_4, lastError = self._dispatch(_G_dispatch_3, [_G_or_2, _G_or_3])
+                _G_inline_1 = _G_or_4
+            else:
+                if self.directCalls:
+                    _G_apply_5, lastError = self.rule_hspace()
+                else:
+                    _G_apply_5, lastError = self._apply(self.rule_hspace, _G_rule_hspace, [])
+                _G_inline_1 = _G_apply_5
+            return (_G_inline_1, None)
+        _G_many_2, lastError = self.many(_G_many_1)
+        if self.inlining:
+            def _G_or_4():
+                _G_match_string_1, lastError = self.match_string('\r\n')
+                return (_G_match_string_1, None)
+            def _G_or_5():
+                _G_exactly_1, lastError = self.exactly('\r')
+                return (_G_exactly_1, None)
+            def _G_or_6():
+                _G_exactly_1, lastError = self.exactly('\n')
+                return (_G_exactly_1, None)
+            _G_or_7, lastError = self._dispatch(_G_dispatch_4, [_G_or_4, _G_or_5, _G_or_6])
+            _G_inline_3 = _G_or_7
+        else:
+            if self.directCalls:
+                _G_apply_8, lastError = self.rule_vspace()
+            else:
+                _G_apply_8, lastError = self._apply(self.rule_vspace, _G_rule_vspace, [])
+            _G_inline_3 = _G_apply_8
+        return (_G_inline_3, None)
+
+
+    def rule_indentation(self):
+        _locals = {'self': self}
+        self.locals['indentation'] = _locals
+        def _G_many_1():
+            _G_apply_1, lastError = self._apply(self.rule_emptyline, _G_rule_emptyline, [])
+            return (_G_apply_1, None)
+        _G_many_2, lastError = self.many(_G_many_1)
+        def _G_many1_3():
+            if self.inlining:
+                def _G_or_2():
+                    _G_exactly_1, lastError = self.exactly(' ')
+                    return (_G_exactly_1, None)
+                def _G_or_3():
+                    _G_exactly_1, lastError = self.exactly('\t')
+                    return (_G_exactly_1, None)
+                _G_or_4, lastError = self._dispatch(_G_dispatch_5, [_G_or_2, _G_or_3])
+                _G_inline_1 = _G_or_4
+            else:
+                if self.directCalls:
+                    _G_apply_5, lastError = self.rule_hspace()
+                else:
+                    _G_apply_5, lastError = self._apply(self.rule_hspace, _G_rule_hspace, [])
+                _G_inline_1 = _G_apply_5
+            return (_G_inline_1, None)
+        _G_many1_4, lastError = self.many(_G_many1_3, _G_many1_3())
+        return (_G_many1_4, None)
+
+
+    def rule_noindentation(self):
+        _locals = {'self': self}
+        self.locals['noindentation'] = _locals
+        def _G_many_1():
+            _G_apply_1, lastError = self._apply(self.rule_emptyline, _G_rule_emptyline, [])
+            return (_G_apply_1, None)
+        _G_many_2, lastError = self.many(_G_many_1)
+        def _G_not_3():
+            if self.inlining:
+                def _G_or_2():
+                    _G_exactly_1, lastError = self.exactly(' ')
+                    return (_G_exactly_1, None)
+                def _G_or_3():
+                    _G_exactly_1, lastError = self.exactly('\t')
+                    return (_G_exactly_1, None)
+                _G_or_4, lastError = self._dispatch(_G_dispatch_6, [_G_or_2, _G_or_3])
+                _G_inline_1 = _G_or_4
+            else:
+                if self.directCalls:
+                    _G_apply_5, lastError = self.rule_hspace()
+                else:
+                    _G_apply_5, lastError = self._apply(self.rule_hspace, _G_rule_hspace, [])
+                _G_inline_1 = _G_apply_5
+            return (_G_inline_1, None)
+        _G_not_4, lastError = self._not(_G_not_3)
+        return (_G_not_4, None)
+
+
+    def rule_number(self):
+        _locals = {'self': self}
+        self.locals['number'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_spaces, _G_rule_spaces, [])
+        def _G_or_2():
+            _G_exactly_1, lastError = self.exactly('-')
+            _G_apply_2, lastError = self._apply(self.rule_barenumber, _G_rule_barenumber, [])
+            _locals['x'] = _G_apply_2
+            _G_python_3, lastError = eval(_G_expr_1, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_3():
+            _G_apply_1, lastError = self._apply(self.rule_barenumber, _G_rule_barenumber, [])
+            _locals['x'] = _G_apply_1
+            _G_python_2, lastError = eval(_G_expr_2, self.globals, _locals), None
+            return (_G_python_2, None)
+        _G_or_4, lastError = self._dispatch(_G_dispatch_7, [_G_or_2, _G_or_3])
+        return (_G_or_4, None)
+
+
+    def rule_barenumber(self):
+        _locals = {'self': self}
+        self.locals['barenumber'] = _locals
+        def _G_or_1():
+            _G_exactly_1, lastError = self.exactly('0')
+            def _G_or_2():
+                def _G_or_1():
+                    _G_exactly_1, lastError = self.exactly('x')
+                    return (_G_exactly_1, None)
+                def _G_or_2():
+                    _G_exactly_1, lastError = self.exactly('X')
+                    return (_G_exactly_1, None)
+                _G_or_3, lastError = self._dispatch(_G_dispatch_8, [_G_or_1, _G_or_2])
+                def _G_many_4():
+                    if self.directCalls:
+                        _G_apply_1, lastError = self.rule_hexdigit()
+                    else:
+                        _G_apply_1, lastError = self._apply(self.rule_hexdigit, _G_rule_hexdigit, [])
+                    return (_G_apply_1, None)
+                _G_many_5, lastError = self.many(_G_many_4)
+                _locals['hs'] = _G_many_5
+                _G_python_6, lastError = eval(_G_expr_3, self.globals, _locals), None
+                return (_G_python_6, None)
+            def _G_or_3():
+                def _G_many_1():
+                    if self.directCalls:
+                        _G_apply_1, lastError = self.rule_octaldigit()
+                    else:
+                        _G_apply_1, lastError = self._apply(self.rule_octaldigit, _G_rule_octaldigit, [])
+                    return (_G_apply_1, None)
+                _G_many_2, lastError = self.many(_G_many_1)
+                _locals['ds'] = _G_many_2
+                _G_python_3, lastError = eval(_G_expr_4, self.globals, _locals), None
+                return (_G_python_3, None)
+            _G_or_4, lastError = self._dispatch(_G_dispatch_9, [_G_or_2, _G_or_3])
+            return (_G_or_4, None)
+        def _G_or_2():
+            def _G_many1_1():
+                _G_apply_1, lastError = self._apply(self.rule_digit, _G_rule_digit, [])
+                return (_G_apply_1, None)
+            _G_many1_2, lastError = self.many(_G_many1_1, _G_many1_1())
+            _locals['ds'] = _G_many1_2
+            _G_python_3, lastError = eval(_G_expr_5, self.globals, _locals), None
+            return (_G_python_3, None)
+        _G_or_3, lastError = self._dispatch(_G_dispatch_10, [_G_or_1, _G_or_2])
+        return (_G_or_3, None)
+
+
+    def rule_octaldigit(self):
+        _locals = {'self': self}
+        self.locals['octaldigit'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+        _locals['x'] = _G_apply_1
+        def _G_pred_2():
+            _G_python_1, lastError = eval(_G_expr_6, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_pred_3, lastError = self.pred(_G_pred_2)
+        _G_python_4, lastError = eval(_G_expr_7, self.globals, _locals), None
+        return (_G_python_4, None)
+
+
+    def rule_hexdigit(self):
+        _locals = {'self': self}
+        self.locals['hexdigit'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+        _locals['x'] = _G_apply_1
+        def _G_pred_2():
+            _G_python_1, lastError = eval(_G_expr_8, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_pred_3, lastError = self.pred(_G_pred_2)
+        _G_python_4, lastError = eval(_G_expr_7, self.globals, _locals), None
+        return (_G_python_4, None)
+
+
+    def rule_escapedChar(self):
+        _locals = {'self': self}
+        self.locals['escapedChar'] = _locals
+        _G_exactly_1, lastError = self.exactly('\\')
+        def _G_or_2():
+            _G_exactly_1, lastError = self.exactly('n')
+            _G_python_2, lastError = eval(_G_expr_9, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_3():
+            _G_exactly_1, lastError = self.exactly('r')
+            _G_python_2, lastError = eval(_G_expr_10, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_4():
+            _G_exactly_1, lastError = self.exactly('t')
+            _G_python_2, lastError = eval(_G_expr_11, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_5():
+            _G_exactly_1, lastError = self.exactly('b')
+            _G_python_2, lastError = eval(_G_expr_12, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_6():
+            _G_exactly_1, lastError = self.exactly('f')
+            _G_python_2, lastError = eval(_G_expr_13, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_7():
+            _G_exactly_1, lastError = self.exactly('"')
+            _G_python_2, lastError = eval(_G_expr_14, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_8():
+            _G_exactly_1, lastError = self.exactly("'")
+            _G_python_2, lastError = eval(_G_expr_15, self.globals, _locals), None
+            return (_G_python_2, None)
+        def _G_or_9():
+            _G_exactly_1, lastError = self.exactly('\\')
+            _G_python_2, lastError = eval(_G_expr_16, self.globals, _locals), None
+            return (_G_python_2, None)
+        _G_or_10, lastError = self._dispatch(_G_dispatch_11, [_G_or_2, _G_or_3, _G_or_4, _G_or_5, _G_or_6, _G_or_7, _G_or_8, _G_or_9])
+        return (_G_or_10, None)
+
+
+    def rule_character(self):
+        _locals = {'self': self}
+        self.locals['character'] = _locals
+        _G_python_1, lastError = eval(_G_expr_15, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        def _G_many_3():
+            def _G_or_1():
+                _G_apply_1, lastError = self._apply(self.rule_escapedChar, _G_rule_escapedChar, [])
+                return (_G_apply_1, None)
+            def _G_or_2():
+                def _G_not_1():
+                    _G_exactly_1, lastError = self.exactly("'")
+                    return (_G_exactly_1, None)
+                _G_not_2, lastError = self._not(_G_not_1)
+                _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                return (_G_apply_3, None)
+            _G_or_3, lastError = self._dispatch(_G_dispatch_12, [_G_or_1, _G_or_2])
+            return (_G_or_3, None)
+        _G_many_4, lastError = self.many(_G_many_3)
+        _locals['c'] = _G_many_4
+        _G_python_5, lastError = eval(_G_expr_15, self.globals, _locals), None
+        _G_apply_6, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_5])
+        _G_python_7, lastError = eval(_G_expr_17, self.globals, _locals), None
+        return (_G_python_7, None)
+
+
+    def rule_character2(self):
+        _locals = {'self': self}
+        self.locals['character2'] = _locals
+        _G_python_1, lastError = eval(_G_expr_15, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        def _G_consumed_by_3():
+            def _G_many_1():
+                def _G_or_1():
+                    _G_apply_1, lastError = self._apply(self.rule_escapedChar, _G_rule_escapedChar, [])
+                    return (_G_apply_1, None)
+                def _G_or_2():
+                    def _G_not_1():
+                        _G_exactly_1, lastError = self.exactly("'")
+                        return (_G_exactly_1, None)
+                    _G_not_2, lastError = self._not(_G_not_1)
+                    _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                    return (_G_apply_3, None)
+                _G_or_3, lastError = self._dispatch(_G_dispatch_13, [_G_or_1, _G_or_2])
+                return (_G_or_3, None)
+            _G_many_2, lastError = self.many(_G_many_1)
+            return (_G_many_2, None)
+        _G_consumed_by_4, lastError = self.consumed_by(_G_consumed_by_3)
+        _locals['c'] = _G_consumed_by_4
+        _G_python_5, lastError = eval(_G_expr_15, self.globals, _locals), None
+        _G_apply_6, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_5])
+        _G_python_7, lastError = eval(_G_expr_18, self.globals, _locals), None
+        return (_G_python_7, None)
+
+
+    def rule_range(self):
+        _locals = {'self': self}
+        self.locals['range'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_character2, _G_rule_character2, [])
+        _locals['c1'] = _G_apply_1
+        _G_python_2, lastError = eval(_G_expr_19, self.globals, _locals), None
+        _G_apply_3, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_2])
+        _G_apply_4, lastError = self._apply(self.rule_character2, _G_rule_character2, [])
+        _locals['c2'] = _G_apply_4
+        def _G_pred_5():
+            _G_python_1, lastError = eval(_G_expr_20, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_pred_6, lastError = self.pred(_G_pred_5)
+        _G_python_7, lastError = eval(_G_expr_21, self.globals, _locals), None
+        return (_G_python_7, None)
+
+
+    def rule_string(self):
+        _locals = {'self': self}
+        self.locals['string'] = _locals
+        _G_python_1, lastError = eval(_G_expr_14, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        def _G_many_3():
+            def _G_or_1():
+                _G_apply_1, lastError = self._apply(self.rule_escapedChar, _G_rule_escapedChar, [])
+                return (_G_apply_1, None)
+            def _G_or_2():
+                def _G_not_1():
+                    _G_exactly_1, lastError = self.exactly('"')
+                    return (_G_exactly_1, None)
+                _G_not_2, lastError = self._not(_G_not_1)
+                _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                return (_G_apply_3, None)
+            _G_or_3, lastError = self._dispatch(_G_dispatch_14, [_G_or_1, _G_or_2])
+            return (_G_or_3, None)
+        _G_many_4, lastError = self.many(_G_many_3)
+        _locals['c'] = _G_many_4
+        _G_python_5, lastError = eval(_G_expr_14, self.globals, _locals), None
+        _G_apply_6, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_5])
+        _G_python_7, lastError = eval(_G_expr_22, self.globals, _locals), None
+        return (_G_python_7, None)
+
+
+    def rule_name(self):
+        _locals = {'self': self}
+        self.locals['name'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_letter, _G_rule_letter, [])
+        _locals['x'] = _G_apply_1
+        def _G_many_2():
+            _G_apply_1, lastError = self._apply(self.rule_letterOrDigit, _G_rule_letterOrDigit, [])
+            return (_G_apply_1, None)
+        _G_many_3, lastError = self.many(_G_many_2)
+        _locals['xs'] = _G_many_3
+        _G_python_4, lastError = eval(_G_expr_23, self.globals, _locals), None
+        _G_python_5, lastError = eval(_G_expr_24, self.globals, _locals), None
+        return (_G_python_5, None)
+
+
+    def rule_application(self):
+        _locals = {'self': self}
+        self.locals['application'] = _locals
+        def _G_optional_1():
+            _G_apply_1, lastError = self._apply(self.rule_indentation, _G_rule_indentation, [])
+            return (_G_apply_1, None)
+        def _G_optional_2():
+            return (None, None)
+        _G_or_3, lastError = self._or([_G_optional_1, _G_optional_2])
+        _G_apply_4, lastError = self._apply(self.rule_name, _G_rule_name, [])
+        _locals['name'] = _G_apply_4
+        def _G_or_5():
+            _G_exactly_1, lastError = self.exactly('(')
+            _G_python_2, lastError = eval(_G_expr_25, self.globals, _locals), None
+            _locals['args'] = _G_python_2
+            _G_python_3, lastError = eval(_G_expr_26, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_6():
+            _G_python_1, lastError = eval(_G_expr_27, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_or_7, lastError = self._dispatch(_G_dispatch_15, [_G_or_5, _G_or_6])
+        return (_G_or_7, None)
+
+
+    def rule_expr1(self):
+        _locals = {'self': self}
+        self.locals['expr1'] = _locals
+        def _G_or_1():
+            _G_apply_1, lastError = self._apply(self.rule_application, _G_rule_application, [])
+            return (_G_apply_1, None)
+        def _G_or_2():
+            if self.directCalls:
+                _G_apply_1, lastError = self.rule_ruleValue()
+            else:
+                _G_apply_1, lastError = self._apply(self.rule_ruleValue, _G_rule_ruleValue, [])
+            return (_G_apply_1, None)
+        def _G_or_3():
+            if self.directCalls:
+                _G_apply_1, lastError = self.rule_semanticPredicate()
+            else:
+                _G_apply_1, lastError = self._apply(self.rule_semanticPredicate, _G_rule_semanticPredicate, [])
+            return (_G_apply_1, None)
+        def _G_or_4():
+            if self.directCalls:
+                _G_apply_1, lastError = self.rule_semanticAction()
+            else:
+                _G_apply_1, lastError = self._apply(self.rule_semanticAction, _G_rule_semanticAction, [])
+            return (_G_apply_1, None)
+        def _G_or_5():
+            _G_apply_1, lastError = self._apply(self.rule_number, _G_rule_number, [])
+            return (_G_apply_1, None)
+        def _G_or_6():
+            _G_apply_1, lastError = self._apply(self.rule_range, _G_rule_range, [])
+            return (_G_apply_1, None)
+        def _G_or_7():
+            _G_apply_1, lastError = self._apply(self.rule_character, _G_rule_character, [])
+            return (_G_apply_1, None)
+        def _G_or_8():
+            _G_apply_1, lastError = self._apply(self.rule_string, _G_rule_string, [])
+            return (_G_apply_1, None)
+        def _G_or_9():
+            _G_python_1, lastError = eval(_G_expr_28, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_expr, _G_rule_expr, [])
+            _locals['e'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_29, self.globals, _locals), None
+            _G_apply_5, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_4])
+            _G_python_6, lastError = eval(_G_expr_30, self.globals, _locals), None
+            return (_G_python_6, None)
+        def _G_or_10():
+            _G_python_1, lastError = eval(_G_expr_31, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_expr, _G_rule_expr, [])
+            _locals['e'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_32, self.globals, _locals), None
+            _G_apply_5, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_4])
+            _G_python_6, lastError = eval(_G_expr_33, self.globals, _locals), None
+            return (_G_python_6, None)
+        def _G_or_11():
+            _G_python_1, lastError = eval(_G_expr_34, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_expr, _G_rule_expr, [])
+            _locals['e'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_35, self.globals, _locals), None
+            _G_apply_5, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_4])
+            _G_python_6, lastError = eval(_G_expr_36, self.globals, _locals), None
+            return (_G_python_6, None)
+        def _G_or_12():
+            _G_python_1, lastError = eval(_G_expr_37, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_expr, _G_rule_expr, [])
+            _locals['e'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_35, self.globals, _locals), None
+            _G_apply_5, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_4])
+            _G_python_6, lastError = eval(_G_expr_38, self.globals, _locals), None
+            return (_G_python_6, None)
+        _G_or_13, lastError = self._dispatch(_G_dispatch_16, [_G_or_1, _G_or_2, _G_or_3, _G_or_4, _G_or_5, _G_or_6, _G_or_7, _G_or_8, _G_or_9, _G_or_10, _G_or_11, _G_or_12])
+        return (_G_or_13, None)
+
+
+    def rule_expr2(self):
+        _locals = {'self': self}
+        self.locals['expr2'] = _locals
+        def _G_or_1():
+            _G_python_1, lastError = eval(_G_expr_39, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            def _G_or_3():
+                _G_python_1, lastError = eval(_G_expr_39, self.globals, _locals), None
+                _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+                _G_apply_3, lastError = self._apply(self.rule_expr2, _G_rule_expr2, [])
+                _locals['e'] = _G_apply_3
+                _G_python_4, lastError = eval(_G_expr_40, self.globals, _locals), None
+                return (_G_python_4, None)
+            def _G_or_4():
+                _G_apply_1, lastError = self._apply(self.rule_expr2, _G_rule_expr2, [])
+                _locals['e'] = _G_apply_1
+                _G_python_2, lastError = eval(_G_expr_41, self.globals, _locals), None
+                return (_G_python_2, None)
+            _G_or_5, lastError = self._dispatch(_G_dispatch_17, [_G_or_3, _G_or_4])
+            return (_G_or_5, None)
+        def _G_or_2():
+            _G_apply_1, lastError = self._apply(self.rule_expr1, _G_rule_expr1, [])
+            return (_G_apply_1, None)
+        _G_or_3, lastError = self._dispatch(_G_dispatch_18, [_G_or_1, _G_or_2])
+        return (_G_or_3, None)
+
+
+    def rule_expr3(self):
+        _locals = {'self': self}
+        self.locals['expr3'] = _locals
+        def _G_or_1():
+            _G_apply_1, lastError = self._apply(self.rule_expr2, _G_rule_expr2, [])
+            _locals['e'] = _G_apply_1
+            def _G_or_2():
+                _G_exactly_1, lastError = self.exactly('*')
+                _G_python_2, lastError = eval(_G_expr_42, self.globals, _locals), None
+                return (_G_python_2, None)
+            def _G_or_3():
+                _G_exactly_1, lastError = self.exactly('+')
+                _G_python_2, lastError = eval(_G_expr_43, self.globals, _locals), None
+                return (_G_python_2, None)
+            def _G_or_4():
+                _G_exactly_1, lastError = self.exactly('?')
+                _G_python_2, lastError = eval(_G_expr_44, self.globals, _locals), None
+                return (_G_python_2, None)
+            def _G_or_5():
+                _G_python_1, lastError = eval(_G_expr_30, self.globals, _locals), None
+                return (_G_python_1, None)
+            _G_or_6, lastError = self._dispatch(_G_dispatch_19, [_G_or_2, _G_or_3, _G_or_4, _G_or_5])
+            _locals['r'] = _G_or_6
+            def _G_or_7():
+                _G_exactly_1, lastError = self.exactly(':')
+                _G_apply_2, lastError = self._apply(self.rule_name, _G_rule_name, [])
+                _locals['n'] = _G_apply_2
+                _G_python_3, lastError = eval(_G_expr_45, self.globals, _locals), None
+                return (_G_python_3, None)
+            def _G_or_8():
+                _G_python_1, lastError = eval(_G_expr_46, self.globals, _locals), None
+                return (_G_python_1, None)
+            _G_or_9, lastError = self._dispatch(_G_dispatch_20, [_G_or_7, _G_or_8])
+            return (_G_or_9, None)
+        def _G_or_2():
+            _G_python_1, lastError = eval(_G_expr_47, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_name, _G_rule_name, [])
+            _locals['n'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_48, self.globals, _locals), None
+            return (_G_python_4, None)
+        _G_or_3, lastError = self._dispatch(_G_dispatch_21, [_G_or_1, _G_or_2])
+        return (_G_or_3, None)
+
+
+    def rule_expr4(self):
+        _locals = {'self': self}
+        self.locals['expr4'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+        _locals['ne'] = _G_apply_1
+        def _G_or_2():
+            def _G_pred_1():
+                _G_python_1, lastError = eval(_G_expr_49, self.globals, _locals), None
+                return (_G_python_1, None)
+            _G_pred_2, lastError = self.pred(_G_pred_1)
+            def _G_many1_3():
+                _G_apply_1, lastError = self._apply(self.rule_expr3, _G_rule_expr3, [])
+                return (_G_apply_1, None)
+            _G_many1_4, lastError = self.many(_G_many1_3, _G_many1_3())
+            _locals['es'] = _G_many1_4
+            _G_python_5, lastError = eval(_G_expr_50, self.globals, _locals), None
+            return (_G_python_5, None)
+        def _G_or_3():
+            def _G_pred_1():
+                _G_python_1, lastError = eval(_G_expr_51, self.globals, _locals), None
+                return (_G_python_1, None)
+            _G_pred_2, lastError = self.pred(_G_pred_1)
+            def _G_many_3():
+                _G_apply_1, lastError = self._apply(self.rule_expr3, _G_rule_expr3, [])
+                return (_G_apply_1, None)
+            _G_many_4, lastError = self.many(_G_many_3)
+            _locals['es'] = _G_many_4
+            _G_python_5, lastError = eval(_G_expr_50, self.globals, _locals), None
+            return (_G_python_5, None)
+        _G_or_4, lastError = self._or([_G_or_2, _G_or_3])
+        return (_G_or_4, None)
+
+
+    def rule_expr5(self):
+        _locals = {'self': self}
+        self.locals['expr5'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+        _locals['ne'] = _G_apply_1
+        def _G_or_2():
+            _G_apply_1, lastError = self._apply(self.rule_interleavePart, _G_rule_interleavePart, [])
+            _locals['e'] = _G_apply_1
+            def _G_many1_2():
+                _G_python_1, lastError = eval(_G_expr_52, self.globals, _locals), None
+                _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+                _G_apply_3, lastError = self._apply(self.rule_interleavePart, _G_rule_interleavePart, [])
+                return (_G_apply_3, None)
+            _G_many1_3, lastError = self.many(_G_many1_2, _G_many1_2())
+            _locals['es'] = _G_many1_3
+            _G_python_4, lastError = eval(_G_expr_53, self.globals, _locals), None
+            _G_python_5, lastError = eval(_G_expr_54, self.globals, _locals), None
+            return (_G_python_5, None)
+        def _G_or_3():
+            _G_python_1, lastError = eval(_G_expr_49, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyPattern(self.rule_expr4, _G_rule_expr4, [_G_python_1])
+            return (_G_apply_2, None)
+        _G_or_4, lastError = self._or([_G_or_2, _G_or_3])
+        return (_G_or_4, None)
+
+
+    def rule_interleavePart(self):
+        _locals = {'self': self}
+        self.locals['interleavePart'] = _locals
+        def _G_or_1():
+            _G_python_1, lastError = eval(_G_expr_55, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_python_3, lastError = eval(_G_expr_56, self.globals, _locals), None
+            _G_apply_4, lastError = self._applyPattern(self.rule_expr4, _G_rule_expr4, [_G_python_3])
+            _locals['e'] = _G_apply_4
+            _G_python_5, lastError = eval(_G_expr_57, self.globals, _locals), None
+            _G_apply_6, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_5])
+            _G_python_7, lastError = eval(_G_expr_58, self.globals, _locals), None
+            return (_G_python_7, None)
+        def _G_or_2():
+            _G_python_1, lastError = eval(_G_expr_56, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyPattern(self.rule_expr4, _G_rule_expr4, [_G_python_1])
+            _locals['part'] = _G_apply_2
+            _G_python_3, lastError = eval(_G_expr_59, self.globals, _locals), None
+            _G_apply_4, lastError = self._applyPattern(self.rule_modedIPart, _G_rule_modedIPart, [_G_python_3])
+            _locals['x'] = _G_apply_4
+            _G_python_5, lastError = eval(_G_expr_7, self.globals, _locals), None
+            return (_G_python_5, None)
+        _G_or_3, lastError = self._dispatch(_G_dispatch_22, [_G_or_1, _G_or_2])
+        return (_G_or_3, None)
+
+
+    def rule_modedIPart(self):
+        _locals = {'self': self}
+        self.locals['modedIPart'] = _locals
+        def _G_or_1():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Many')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['part'] = _G_apply_2
+                return (_locals['part'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_60, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_2():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Many1')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['part'] = _G_apply_2
+                return (_locals['part'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_61, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_3():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Optional')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['part'] = _G_apply_2
+                return (_locals['part'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_62, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_4():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('Bind')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['name'] = _G_apply_2
+                _G_apply_3, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['part'] = _G_apply_3
+                return (_locals['part'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _locals['e'] = _G_listpattern_2
+            _G_python_3, lastError = eval(_G_expr_59, self.globals, _locals), None
+            _G_apply_4, lastError = self._applyPattern(self.rule_modedIPart, _G_rule_modedIPart, [_G_python_3])
+            _locals['newpart'] = _G_apply_4
+            _G_python_5, lastError = eval(_G_expr_63, self.globals, _locals), None
+            return (_G_python_5, None)
+        def _G_or_5():
+            def _G_listpattern_1():
+                _G_exactly_1, lastError = self.exactly('And')
+                _G_apply_2, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                _locals['part'] = _G_apply_2
+                return (_locals['part'], None)
+            _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
+            _G_python_3, lastError = eval(_G_expr_59, self.globals, _locals), None
+            _G_apply_4, lastError = self._applyPattern(self.rule_modedIPart, _G_rule_modedIPart, [_G_python_3])
+            _locals['newpart'] = _G_apply_4
+            _G_python_5, lastError = eval(_G_expr_64, self.globals, _locals), None
+            return (_G_python_5, None)
+        def _G_or_6():
+            _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+            _locals['part'] = _G_apply_1
+            _G_python_2, lastError = eval(_G_expr_65, self.globals, _locals), None
+            return (_G_python_2, None)
+        _G_or_7, lastError = self._or([_G_or_1, _G_or_2, _G_or_3, _G_or_4, _G_or_5, _G_or_6])
+        return (_G_or_7, None)
+
+
+    def rule_expr(self):
+        _locals = {'self': self}
+        self.locals['expr'] = _locals
+        def _G_or_1():
+            _G_python_1, lastError = eval(_G_expr_56, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_1])
+            _locals['e'] = _G_apply_2
+            def _G_many1_3():
+                _G_python_1, lastError = eval(_G_expr_66, self.globals, _locals), None
+                _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+                _G_python_3, lastError = eval(_G_expr_56, self.globals, _locals), None
+                _G_apply_4, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_3])
+                return (_G_apply_4, None)
+            _G_many1_4, lastError = self.many(_G_many1_3, _G_many1_3())
+            _locals['es'] = _G_many1_4
+            _G_python_5, lastError = eval(_G_expr_53, self.globals, _locals), None
+            _G_python_6, lastError = eval(_G_expr_67, self.globals, _locals), None
+            return (_G_python_6, None)
+        def _G_or_2():
+            _G_python_1, lastError = eval(_G_expr_56, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_1])
+            _locals['e'] = _G_apply_2
+            def _G_many1_3():
+                _G_python_1, lastError = eval(_G_expr_68, self.globals, _locals), None
+                _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+                _G_python_3, lastError = eval(_G_expr_56, self.globals, _locals), None
+                _G_apply_4, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_3])
+                return (_G_apply_4, None)
+            _G_many1_4, lastError = self.many(_G_many1_3, _G_many1_3())
+            _locals['es'] = _G_many1_4
+            _G_python_5, lastError = eval(_G_expr_53, self.globals, _locals), None
+            _G_python_6, lastError = eval(_G_expr_69, self.globals, _locals), None
+            return (_G_python_6, None)
+        def _G_or_3():
+            _G_python_1, lastError = eval(_G_expr_70, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_1])
+            return (_G_apply_2, None)
+        _G_or_4, lastError = self._or([_G_or_1, _G_or_2, _G_or_3])
+        return (_G_or_4, None)
+
+
+    def rule_ruleValue(self):
+        _locals = {'self': self}
+        self.locals['ruleValue'] = _locals
+        _G_python_1, lastError = eval(_G_expr_71, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        _G_python_3, lastError = eval(_G_expr_72, self.globals, _locals), None
+        return (_G_python_3, None)
+
+
+    def rule_semanticPredicate(self):
+        _locals = {'self': self}
+        self.locals['semanticPredicate'] = _locals
+        _G_python_1, lastError = eval(_G_expr_73, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        _G_python_3, lastError = eval(_G_expr_74, self.globals, _locals), None
+        return (_G_python_3, None)
+
+
+    def rule_semanticAction(self):
+        _locals = {'self': self}
+        self.locals['semanticAction'] = _locals
+        _G_python_1, lastError = eval(_G_expr_75, self.globals, _locals), None
+        _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+        _G_python_3, lastError = eval(_G_expr_76, self.globals, _locals), None
+        return (_G_python_3, None)
+
+
+    def rule_rulePart(self):
+        _locals = {'self': self}
+        self.locals['rulePart'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+        _locals['requiredName'] = _G_apply_1
+        _G_apply_2, lastError = self._apply(self.rule_noindentation, _G_rule_noindentation, [])
+        _G_apply_3, lastError = self._apply(self.rule_name, _G_rule_name, [])
+        _locals['n'] = _G_apply_3
+        def _G_pred_4():
+            _G_python_1, lastError = eval(_G_expr_77, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_pred_5, lastError = self.pred(_G_pred_4)
+        _G_python_6, lastError = eval(_G_expr_78, self.globals, _locals), None
+        _G_python_7, lastError = eval(_G_expr_70, self.globals, _locals), None
+        _G_apply_8, lastError = self._applyPattern(self.rule_expr5, _G_rule_expr5, [_G_python_7])
+        _locals['args'] = _G_apply_8
+        def _G_or_9():
+            _G_python_1, lastError = eval(_G_expr_79, self.globals, _locals), None
+            _G_apply_2, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_1])
+            _G_apply_3, lastError = self._apply(self.rule_expr, _G_rule_expr, [])
+            _locals['e'] = _G_apply_3
+            _G_python_4, lastError = eval(_G_expr_80, self.globals, _locals), None
+            return (_G_python_4, None)
+        def _G_or_10():
+            _G_python_1, lastError = eval(_G_expr_81, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_or_11, lastError = self._dispatch(_G_dispatch_23, [_G_or_9, _G_or_10])
+        return (_G_or_11, None)
+
+
+    def rule_annotation(self):
+        _locals = {'self': self}
+        self.locals['annotation'] = _locals
+        _G_apply_1, lastError = self._apply(self.rule_noindentation, _G_rule_noindentation, [])
+        _G_exactly_2, lastError = self.exactly('@')
+        _G_apply_3, lastError = self._apply(self.rule_name, _G_rule_name, [])
+        _locals['a'] = _G_apply_3
+        _G_python_4, lastError = eval(_G_expr_82, self.globals, _locals), None
+        return (_G_python_4, None)
+
+
+    def rule_rule(self):
+        _locals = {'self': self}
+        self.locals['rule'] = _locals
+        def _G_many_1():
+            if self.directCalls:
+                _G_apply_1, lastError = self.rule_annotation()
+            else:
+                _G_apply_1, lastError = self._apply(self.rule_annotation, _G_rule_annotation, [])
+            return (_G_apply_1, None)
+        _G_many_2, lastError = self.many(_G_many_1)
+        _locals['ann'] = _G_many_2
+        _G_apply_3, lastError = self._apply(self.rule_noindentation, _G_rule_noindentation, [])
+        def _G_lookahead_4():
+            _G_apply_1, lastError = self._apply(self.rule_name, _G_rule_name, [])
+            _locals['n'] = _G_apply_1
+            return (_locals['n'], None)
+        _G_lookahead_5, lastError = self.lookahead(_G_lookahead_4)
+        _G_python_6, lastError = eval(_G_expr_83, self.globals, _locals), None
+        _G_apply_7, lastError = self._applyPattern(self.rule_rulePart, _G_rule_rulePart, [_G_python_6])
+        _locals['r'] = _G_apply_7
+        def _G_or_8():
+            def _G_many1_1():
+                _G_python_1, lastError = eval(_G_expr_83, self.globals, _locals), None
+                _G_apply_2, lastError = self._applyPattern(self.rule_rulePart, _G_rule_rulePart, [_G_python_1])
+                return (_G_apply_2, None)
+            _G_many1_2, lastError = self.many(_G_many1_1, _G_many1_1())
+            _locals['rs'] = _G_many1_2
+            _G_python_3, lastError = eval(_G_expr_84, self.globals, _locals), None
+            return (_G_python_3, None)
+        def _G_or_9():
+            _G_python_1, lastError = eval(_G_expr_85, self.globals, _locals), None
+            return (_G_python_1, None)
+        _G_or_10, lastError = self._or([_G_or_8, _G_or_9])
+        return (_G_or_10, None)
+
+
+    def rule_grammar(self):
+        _locals = {'self': self}
+        self.locals['grammar'] = _locals
+        def _G_many_1():
+            _G_apply_1, lastError = self._apply(self.rule_rule, _G_rule_rule, [])
+            return (_G_apply_1, None)
+        _G_many_2, lastError = self.many(_G_many_1)
+        _locals['rs'] = _G_many_2
+        _G_apply_3, lastError = self._apply(self.rule_spaces, _G_rule_spaces, [])
+        _G_python_4, lastError = eval(_G_expr_86, self.globals, _locals), None
+        return (_G_python_4, None)
+
+_G_dispatch_1 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0,), '\t': (1,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_2 = GrammarBase.DispatchTable(OMetaGrammarRules, {'\n': (2,), '\r': (0, 1)}, (), ['exactly', 'match_string', 'tryExactly', 'tryMatchString'])
+_G_dispatch_3 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0,), '\t': (1,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_4 = GrammarBase.DispatchTable(OMetaGrammarRules, {'\n': (2,), '\r': (0, 1)}, (), ['exactly', 'match_string', 'tryExactly', 'tryMatchString'])
+_G_dispatch_5 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0,), '\t': (1,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_6 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0,), '\t': (1,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_7 = GrammarBase.DispatchTable(OMetaGrammarRules, {'-': (0, 1)}, (1,), ['exactly', 'rule_barenumber', 'tryExactly'])
+_G_dispatch_8 = GrammarBase.DispatchTable(OMetaGrammarRules, {'X': (1,), 'x': (0,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_9 = GrammarBase.DispatchTable(OMetaGrammarRules, {'X': (0, 1), 'x': (0, 1)}, (1,), ['exactly', 'rule_octaldigit', 'tryExactly'])
+_G_dispatch_10 = GrammarBase.DispatchTable(OMetaGrammarRules, {'0': (0, 1)}, (1,), ['exactly', 'tryExactly'])
+_G_dispatch_11 = GrammarBase.DispatchTable(OMetaGrammarRules, {"'": (6,), '"': (5,), '\\': (7,), 'b': (3,), 'f': (4,), 'n': (0,), 'r': (1,), 't': (2,)}, (), ['exactly', 'tryExactly'])
+_G_dispatch_12 = GrammarBase.DispatchTable(OMetaGrammarRules, {'\\': (0, 1)}, (1,), ['exactly', 'rule_escapedChar', 'tryExactly'])
+_G_dispatch_13 = GrammarBase.DispatchTable(OMetaGrammarRules, {'\\': (0, 1)}, (1,), ['exactly', 'rule_escapedChar', 'tryExactly'])
+_G_dispatch_14 = GrammarBase.DispatchTable(OMetaGrammarRules, {'\\': (0, 1)}, (1,), ['exactly', 'rule_escapedChar', 'tryExactly'])
+_G_dispatch_15 = GrammarBase.DispatchTable(OMetaGrammarRules, {'(': (0, 1)}, (1,), ['exactly', 'tryExactly'])
+_G_dispatch_16 = GrammarBase.DispatchTable(OMetaGrammarRules, {"'": (0, 4, 5, 6), ' ': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), '!': (0, 3, 4), '"': (0, 4, 7), '(': (0, 4, 8), '-': (0, 1, 4), '<': (0, 4, 10), '?': (0, 2, 4), '@': (0, 4, 11), '[': (0, 4, 9), '\n': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), '\r': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), '\t': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), '\x0b': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), '\x0c': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u1680': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u180e': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2000': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2001': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2002': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2003': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2004': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2005': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2006': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2007': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2008': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2009': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u200a': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2028': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u2029': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u202f': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u205f': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\u3000': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\x1c': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\x1d': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\x1e': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\x1f': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\x85': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11), u'\xa0': (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)}, (0, 4), ['eatWhitespace', 'exactly', 'match_string', 'rule_application', 'rule_barenumber', 'rule_character', 'rule_character2', 'rule_emptyline', 'rule_hspace', 'rule_indentation', 'rule_name', 'rule_number', 'rule_range', 'rule_ruleValue', 'rule_semanticAction', 'rule_semanticPredicate', 'rule_spaces', 'rule_string', 'rule_token', 'rule_vspace', 'tryExactly', 'tryMatchString', 'tryToken'])
+_G_dispatch_17 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0, 1), '\n': (0, 1), '\r': (0, 1), '\t': (0, 1), '\x0b': (0, 1), '\x0c': (0, 1), '~': (0, 1), u'\u1680': (0, 1), u'\u180e': (0, 1), u'\u2000': (0, 1), u'\u2001': (0, 1), u'\u2002': (0, 1), u'\u2003': (0, 1), u'\u2004': (0, 1), u'\u2005': (0, 1), u'\u2006': (0, 1), u'\u2007': (0, 1), u'\u2008': (0, 1), u'\u2009': (0, 1), u'\u200a': (0, 1), u'\u2028': (0, 1), u'\u2029': (0, 1), u'\u202f': (0, 1), u'\u205f': (0, 1), u'\u3000': (0, 1), u'\x1c': (0, 1), u'\x1d': (0, 1), u'\x1e': (0, 1), u'\x1f': (0, 1), u'\x85': (0, 1), u'\xa0': (0, 1)}, (1,), ['eatWhitespace', 'exactly', 'match_string', 'rule_application', 'rule_barenumber', 'rule_character', 'rule_character2', 'rule_emptyline', 'rule_expr1', 'rule_expr2', 'rule_hspace', 'rule_indentation', 'rule_name', 'rule_number', 'rule_range', 'rule_ruleValue', 'rule_semanticAction', 'rule_semanticPredicate', 'rule_spaces', 'rule_string', 'rule_token', 'rule_vspace', 'tryExactly', 'tryMatchString', 'tryToken'])
+_G_dispatch_18 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0, 1), '\n': (0, 1), '\r': (0, 1), '\t': (0, 1), '\x0b': (0, 1), '\x0c': (0, 1), '~': (0, 1), u'\u1680': (0, 1), u'\u180e': (0, 1), u'\u2000': (0, 1), u'\u2001': (0, 1), u'\u2002': (0, 1), u'\u2003': (0, 1), u'\u2004': (0, 1), u'\u2005': (0, 1), u'\u2006': (0, 1), u'\u2007': (0, 1), u'\u2008': (0, 1), u'\u2009': (0, 1), u'\u200a': (0, 1), u'\u2028': (0, 1), u'\u2029': (0, 1), u'\u202f': (0, 1), u'\u205f': (0, 1), u'\u3000': (0, 1), u'\x1c': (0, 1), u'\x1d': (0, 1), u'\x1e': (0, 1), u'\x1f': (0, 1), u'\x85': (0, 1), u'\xa0': (0, 1)}, (1,), ['eatWhitespace', 'exactly', 'match_string', 'rule_application', 'rule_barenumber', 'rule_character', 'rule_character2', 'rule_emptyline', 'rule_expr1', 'rule_hspace', 'rule_indentation', 'rule_name', 'rule_number', 'rule_range', 'rule_ruleValue', 'rule_semanticAction', 'rule_semanticPredicate', 'rule_spaces', 'rule_string', 'rule_token', 'rule_vspace', 'tryExactly', 'tryMatchString', 'tryToken'])
+_G_dispatch_19 = GrammarBase.DispatchTable(OMetaGrammarRules, {'*': (0, 3), '+': (1, 3), '?': (2, 3)}, (3,), ['exactly', 'tryExactly'])
+_G_dispatch_20 = GrammarBase.DispatchTable(OMetaGrammarRules, {':': (0, 1)}, (1,), ['exactly', 'tryExactly'])
+_G_dispatch_21 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0, 1), ':': (0, 1), '\n': (0, 1), '\r': (0, 1), '\t': (0, 1), '\x0b': (0, 1), '\x0c': (0, 1), u'\u1680': (0, 1), u'\u180e': (0, 1), u'\u2000': (0, 1), u'\u2001': (0, 1), u'\u2002': (0, 1), u'\u2003': (0, 1), u'\u2004': (0, 1), u'\u2005': (0, 1), u'\u2006': (0, 1), u'\u2007': (0, 1), u'\u2008': (0, 1), u'\u2009': (0, 1), u'\u200a': (0, 1), u'\u2028': (0, 1), u'\u2029': (0, 1), u'\u202f': (0, 1), u'\u205f': (0, 1), u'\u3000': (0, 1), u'\x1c': (0, 1), u'\x1d': (0, 1), u'\x1e': (0, 1), u'\x1f': (0, 1), u'\x85': (0, 1), u'\xa0': (0, 1)}, (0,), ['eatWhitespace', 'exactly', 'match_string', 'rule_application', 'rule_barenumber', 'rule_character', 'rule_character2', 'rule_emptyline', 'rule_expr1', 'rule_expr2', 'rule_hspace', 'rule_indentation', 'rule_name', 'rule_number', 'rule_range', 'rule_ruleValue', 'rule_semanticAction', 'rule_semanticPredicate', 'rule_spaces', 'rule_string', 'rule_token', 'rule_vspace', 'tryExactly', 'tryMatchString', 'tryToken'])
+_G_dispatch_22 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0, 1), '(': (0, 1), '\n': (0, 1), '\r': (0, 1), '\t': (0, 1), '\x0b': (0, 1), '\x0c': (0, 1), u'\u1680': (0, 1), u'\u180e': (0, 1), u'\u2000': (0, 1), u'\u2001': (0, 1), u'\u2002': (0, 1), u'\u2003': (0, 1), u'\u2004': (0, 1), u'\u2005': (0, 1), u'\u2006': (0, 1), u'\u2007': (0, 1), u'\u2008': (0, 1), u'\u2009': (0, 1), u'\u200a': (0, 1), u'\u2028': (0, 1), u'\u2029': (0, 1), u'\u202f': (0, 1), u'\u205f': (0, 1), u'\u3000': (0, 1), u'\x1c': (0, 1), u'\x1d': (0, 1), u'\x1e': (0, 1), u'\x1f': (0, 1), u'\x85': (0, 1), u'\xa0': (0, 1)}, (1,), ['eatWhitespace', 'rule_token', 'tryToken'])
+_G_dispatch_23 = GrammarBase.DispatchTable(OMetaGrammarRules, {' ': (0, 1), '=': (0, 1), '\n': (0, 1), '\r': (0, 1), '\t': (0, 1), '\x0b': (0, 1), '\x0c': (0, 1), u'\u1680': (0, 1), u'\u180e': (0, 1), u'\u2000': (0, 1), u'\u2001': (0, 1), u'\u2002': (0, 1), u'\u2003': (0, 1), u'\u2004': (0, 1), u'\u2005': (0, 1), u'\u2006': (0, 1), u'\u2007': (0, 1), u'\u2008': (0, 1), u'\u2009': (0, 1), u'\u200a': (0, 1), u'\u2028': (0, 1), u'\u2029': (0, 1), u'\u202f': (0, 1), u'\u205f': (0, 1), u'\u3000': (0, 1), u'\x1c': (0, 1), u'\x1d': (0, 1), u'\x1e': (0, 1), u'\x1f': (0, 1), u'\x85': (0, 1), u'\xa0': (0, 1)}, (1,), ['eatWhitespace', 'rule_token', 'tryToken'])
\ No newline at end of file
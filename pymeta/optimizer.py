@@ -0,0 +1,216 @@
+"""
+Optimization passes rewriting the grammar trees produced by L{TreeBuilder}
+before code is generated for them.
+
+Each pass is a function taking a C{Grammar} tree and returning a new one
+that matches the same input with the same results. A L{PassManager} runs
+the passes of an optimization level in order.
+"""
+import pprint, time
+from pymeta import analysis
+
+
+def rewrite(node, fn):
+    """
+    Rebuild a grammar tree bottom-up, replacing each node with the result
+    of calling C{fn} on it once its sub-expressions have been rewritten.
+    """
+    name = node[0]
+    if name in ("Or", "Xor", "And"):
+        node = [name] + [rewrite(n, fn) for n in node[1:]]
+    elif name == "Apply":
+        node = [name, node[1], node[2],
+                type(node[3])(rewrite(n, fn) for n in node[3])]
+    elif name in ("Many", "Many1", "Optional", "Not", "Lookahead",
+                  "Predicate", "List", "ConsumedBy", "IndexConsumedBy"):
+        node = [name, rewrite(node[1], fn)]
+    elif name == "Bind":
+        node = [name, node[1], rewrite(node[2], fn)]
+    elif name == "Interleave":
+        node = [name] + [[mode, rewrite(expr, fn), bound]
+                         for mode, expr, bound in node[1:]]
+    elif name == "Inline":
+        node = [name, node[1], node[2], rewrite(node[3], fn)]
+    elif name == "Rule":
+        node = [name, node[1], rewrite(node[2], fn), node[3]]
+    elif name == "Grammar":
+        return [name, node[1], [rewrite(rule, fn) for rule in node[2]]]
+    return fn(node)
+
+
+def _collapse(node):
+    if node[0] in ("And", "Or", "Xor") and len(node) == 2:
+        return node[1]
+    return node
+
+def collapse(tree):
+    """
+    Replace sequences and choices of a single expression with the
+    expression.
+    """
+    return rewrite(tree, _collapse)
+
+
+def _flatten(node):
+    name = node[0]
+    if name not in ("And", "Or"):
+        return node
+    flat = [name]
+    last = len(node) - 1
+    for i, child in enumerate(node[1:]):
+        # the value of a sequence is the value of its last expression, and
+        # an empty sequence has no value, so an empty sequence at the end
+        # is kept
+        if child[0] == name and (name == "Or" or len(child) > 1 or i + 1 < last):
+            flat.extend(child[1:])
+        else:
+            flat.append(child)
+    # splicing may leave a single expression behind
+    return _collapse(flat)
+
+def flatten(tree):
+    """
+    Splice sequences nested in sequences, and choices nested in choices,
+    into their parent, collapsing any left with a single expression.
+    """
+    return rewrite(tree, _flatten)
+
+
+def _isCharacter(node):
+    return (node[0] == "Exactly" and isinstance(node[1], basestring)
+            and len(node[1]) == 1)
+
+def _mergeExactly(node):
+    if node[0] != "And":
+        return node
+    merged = ["And"]
+    run = []
+    # the last expression gives the value of the sequence, so it is never
+    # merged
+    for child in node[1:-1]:
+        if _isCharacter(child):
+            run.append(child[1])
+            continue
+        merged.extend(_matchRun(run))
+        run = []
+        merged.append(child)
+    merged.extend(_matchRun(run))
+    merged.extend(node[-1:] if len(node) > 1 else [])
+    return merged
+
+def _matchRun(chars):
+    if len(chars) > 1:
+        return [["MatchCharacters", ''.join(chars)]]
+    return [["Exactly", c] for c in chars]
+
+def mergeExactly(tree):
+    """
+    Replace runs of single characters matched in sequence with matching the
+    string they form, in one comparison on text input. A failed match is
+    reported at the first character that differs, as expecting it.
+    """
+    return rewrite(tree, _mergeExactly)
+
+
+def inline(tree):
+    """
+    Replace applications of the rules found by L{analysis.inlinableRules}
+    with C{Inline} nodes holding their expression, so that their code is
+    generated in place. Rules applied by an inlined expression are inlined
+    into it in turn. The rules themselves are kept, to be applied by name
+    and by subclasses overriding the inlined ones.
+    """
+    rules = tree[2]
+    inlinable = analysis.inlinableRules(rules)
+    bodies = dict((rule[1], rule[2]) for rule in rules
+                  if rule[1] in inlinable)
+    inlined = {}
+    def _inline(node):
+        if node[0] == "Apply" and node[1] in bodies and not node[3]:
+            name = node[1]
+            if name not in inlined:
+                # inlinable rules are not recursive, so this ends
+                inlined[name] = rewrite(bodies[name], _inline)
+            return ["Inline", name, node[2], inlined[name]]
+        return node
+    return rewrite(tree, _inline)
+
+
+# The passes of each optimization level, in the order they run. Each level
+# runs the passes of the levels below it.
+PASSES = [
+    (1, "collapse", collapse),
+    (1, "flatten", flatten),
+    (1, "mergeExactly", mergeExactly),
+    (1, "inline", inline),
+    ]
+
+# The optimization level grammars are compiled with by default.
+DEFAULT_LEVEL = 1
+
+
+class PassManager(object):
+    """
+    Runs optimization passes over grammar trees in order.
+
+    @ivar passes: A list of C{(name, function)} pairs.
+    @ivar timings: A list of C{(name, seconds)} pairs, how long each pass
+    took on the last tree optimized.
+    """
+
+    def __init__(self, level=DEFAULT_LEVEL, passes=None, dump=None):
+        """
+        @param level: The optimization level, selecting passes from
+        L{PASSES}.
+        @param passes: A list of C{(name, function)} pairs, to run instead
+        of the passes of C{level}.
+        @param dump: A file the tree is written to after each pass.
+        """
+        if passes is None:
+            passes = [(name, fn) for passLevel, name, fn in PASSES
+                      if passLevel <= level]
+        self.passes = passes
+        self.dump = dump
+        self.timings = []
+
+
+    def names(self):
+        """
+        Return the names of the passes run, identifying the code they lead
+        to, as in the key of a L{GrammarCache}.
+        """
+        return [name for name, fn in self.passes]
+
+
+    def optimize(self, tree):
+        """
+        Return C{tree} rewritten by each pass in turn.
+        """
+        self.timings = []
+        for name, fn in self.passes:
+            start = time.time()
+            tree = fn(tree)
+            self.timings.append((name, time.time() - start))
+            if self.dump is not None:
+                self.dump.write("# after %s\n%s\n" % (name, pprint.pformat(tree)))
+        return tree
+
+
+def passManager(optimize):
+    """
+    Return the L{PassManager} for the C{optimize} argument of
+    L{OMeta.makeGrammar}: an optimization level, a L{PassManager}, or
+    C{None} for the default level.
+    """
+    if optimize is None:
+        optimize = DEFAULT_LEVEL
+    if isinstance(optimize, PassManager):
+        return optimize
+    return PassManager(optimize)
+
+
+def optimize(tree, level=DEFAULT_LEVEL):
+    """
+    Return a grammar tree rewritten by the passes of an optimization level.
+    """
+    return PassManager(level).optimize(tree)
@@ -0,0 +1,225 @@
+"""
+Profiling parses rule by rule, to find the rules a slow grammar spends its
+time in.
+
+A L{Profiler} is installed on the parsers it observes, replacing their
+methods applying rules and trying alternatives with ones recording what
+happens, so parsers it is not installed on run as fast as ever::
+
+    profiler = Profiler()
+    Grammar.parse(text, profiler=profiler)
+    print profiler.report(sort='exclusive', limit=20)
+"""
+from timeit import default_timer
+from pymeta.runtime import FAIL, _MaybeParseError, _APPLY_METHODS
+
+
+class RuleStats(object):
+    """
+    What happened in the applications of one rule.
+
+    @ivar calls: The number of applications.
+    @ivar hits: The number of applications answered from the memo.
+    @ivar misses: The number of applications that ran the rule.
+    @ivar failures: The number of applications that failed.
+    @ivar consumed: The number of input items consumed by the applications
+    that succeeded.
+    @ivar inclusive: The time spent in the rule, including the rules it
+    applied, in seconds. Recursive applications are counted once.
+    @ivar exclusive: The time spent in the rule, excluding the rules it
+    applied, in seconds.
+    """
+    __slots__ = ('name', 'calls', 'hits', 'misses', 'failures', 'consumed',
+                 'inclusive', 'exclusive', 'active')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = self.hits = self.misses = self.failures = 0
+        self.consumed = self.active = 0
+        self.inclusive = self.exclusive = 0.0
+
+
+class ChoiceStats(object):
+    """
+    What happened at one ordered choice of a rule.
+
+    @ivar rule: The name of the rule the choice is in.
+    @ivar site: The name of the code generated for its first alternative,
+    such as C{_G_or_3}, telling the choices of a rule apart.
+    @ivar calls: The number of times the choice was tried.
+    @ivar backtracks: The number of alternatives that failed, rewinding the
+    input.
+    """
+    __slots__ = ('rule', 'site', 'calls', 'backtracks')
+
+    def __init__(self, rule, site):
+        self.rule = rule
+        self.site = site
+        self.calls = self.backtracks = 0
+
+
+class Profiler(object):
+    """
+    Statistics about the rules applied and the choices tried by the parsers
+    it is installed on, accumulated over all their parses.
+
+    Rules whose code is generated in place of their applications, see
+    L{OMetaBase.inlinedRules}, are counted as part of the rules they are
+    inlined in. Rules whose methods are called directly, see
+    L{OMetaBase.directRules}, are applied through the parser's methods
+    instead, still without memoization, so that they are counted too.
+
+    @ivar rules: A dict mapping rule names to L{RuleStats}.
+    @ivar choices: A dict mapping C{(rule name, site)} pairs to
+    L{ChoiceStats}.
+    """
+
+    def __init__(self):
+        self.rules = {}
+        self.choices = {}
+        self._stack = []
+        self._children = []
+
+    def install(self, parser):
+        """
+        Start recording the parses of a parser, and return it.
+        """
+        direct = set()
+        if parser.directCalls:
+            for owner in parser.__class__.__mro__:
+                direct.update(owner.__dict__.get('directRules', ()))
+            parser.directCalls = False
+        for name in _APPLY_METHODS + ['_callTransient', '_tryCallTransient']:
+            setattr(parser, name, self._profiling(parser,
+                                                  getattr(parser, name)))
+        if direct:
+            parser._apply = self._transient(parser._apply,
+                                            parser._callTransient, direct)
+            parser._tryApply = self._transient(parser._tryApply,
+                                               parser._tryCallTransient,
+                                               direct)
+        parser._or = self._counting(parser._or)
+        parser._tryOr = self._counting(parser._tryOr)
+        return parser
+
+    def _ruleStats(self, rule):
+        name = rule.__name__
+        if name.startswith('rule_'):
+            name = name[5:]
+        stats = self.rules.get(name)
+        if stats is None:
+            stats = self.rules[name] = RuleStats(name)
+        return stats
+
+    def _profiling(self, parser, apply):
+        """
+        Wrap a method applying rules so that it records each application.
+        """
+        stack = self._stack
+        children = self._children
+        def profiled(rule, ruleId, args):
+            stats = self._ruleStats(rule)
+            stats.calls += 1
+            if parser._memoized(ruleId, args):
+                stats.hits += 1
+            else:
+                stats.misses += 1
+            position = parser.position
+            failed = True
+            stack.append(stats.name)
+            children.append(0.0)
+            stats.active += 1
+            start = default_timer()
+            try:
+                result = apply(rule, ruleId, args)
+                failed = result[0] is FAIL
+                return result
+            finally:
+                elapsed = default_timer() - start
+                stats.active -= 1
+                stack.pop()
+                stats.exclusive += elapsed - children.pop()
+                if not stats.active:
+                    stats.inclusive += elapsed
+                if children:
+                    children[-1] += elapsed
+                if failed:
+                    stats.failures += 1
+                else:
+                    stats.consumed += parser.position - position
+        return profiled
+
+    def _transient(self, apply, call, names):
+        """
+        Wrap a method applying rules so that the named rules are called
+        without memoization, as parsers calling their methods directly do.
+        """
+        def applied(rule, ruleId, args):
+            if not args and rule.__name__[5:] in names:
+                return call(rule, None, args)
+            return apply(rule, ruleId, args)
+        return applied
+
+    def _counting(self, choose):
+        """
+        Wrap a method trying alternatives so that it counts the ones that
+        fail at each choice.
+        """
+        stack = self._stack
+        def counted(fns):
+            rule = stack[-1] if stack else None
+            key = (rule, fns[0].__name__)
+            site = self.choices.get(key)
+            if site is None:
+                site = self.choices[key] = ChoiceStats(*key)
+            site.calls += 1
+            def alternative(f):
+                def tried():
+                    try:
+                        ret = f()
+                    except _MaybeParseError:
+                        site.backtracks += 1
+                        raise
+                    if ret[0] is FAIL:
+                        site.backtracks += 1
+                    return ret
+                return tried
+            return choose([alternative(f) for f in fns])
+        return counted
+
+    def stats(self, sort='inclusive'):
+        """
+        Return the L{RuleStats} of the rules applied, sorted by one of their
+        attributes, largest first.
+        """
+        return sorted(self.rules.itervalues(),
+                      key=lambda s: (-getattr(s, sort), s.name))
+
+    def report(self, sort='inclusive', limit=None):
+        """
+        Return a table of the statistics of each rule, then of each choice
+        that backtracked, as a string.
+
+        @param sort: The L{RuleStats} attribute to sort rules by, largest
+        first.
+        @param limit: The number of rules and choices to show, or C{None}
+        for all of them.
+        """
+        lines = ["%-24s %8s %8s %8s %8s %10s %10s %10s" % (
+                'rule', 'calls', 'hits', 'misses', 'failures', 'consumed',
+                'inclusive', 'exclusive')]
+        for s in self.stats(sort)[:limit]:
+            lines.append("%-24s %8d %8d %8d %8d %10d %10.6f %10.6f" % (
+                    s.name, s.calls, s.hits, s.misses, s.failures,
+                    s.consumed, s.inclusive, s.exclusive))
+        choices = sorted((c for c in self.choices.itervalues()
+                          if c.backtracks),
+                         key=lambda c: (-c.backtracks, c.rule, c.site))
+        if choices:
+            lines.append("")
+            lines.append("%-24s %-14s %8s %10s" % ('choice in rule', 'site',
+                                                   'calls', 'backtracks'))
+            for c in choices[:limit]:
+                lines.append("%-24s %-14s %8d %10d" % (c.rule, c.site,
+                                                       c.calls, c.backtracks))
+        return "\n".join(lines)
@@ -0,0 +1,45 @@
+# Generates the modules holding the rules of the grammars defined in
+# pymeta.grammar, so that importing it does not have to compile them. Run it
+# after changing ometaGrammar or nullOptimizationGrammar.
+import os
+
+# (module, grammar variable in pymeta.grammar, generated class name)
+RULES_MODULES = [
+    ('ometa_rules', 'ometaGrammar', 'OMetaGrammarRules'),
+    ('nulloptimizer_rules', 'nullOptimizationGrammar', 'NullOptimizerRules'),
+    ]
+
+def generateRules(moduleName):
+    """
+    Return the source of one of the modules in L{RULES_MODULES}.
+    """
+    from pymeta import builder, grammar, optimizer
+    from pymeta.boot import BootOMetaGrammar
+    for module, grammarName, className in RULES_MODULES:
+        if module == moduleName:
+            break
+    else:
+        raise KeyError(moduleName)
+    # The OMeta grammar is parsed by the bootstrap grammar, the others by
+    # the OMeta grammar, as they would be with OMeta.makeGrammar.
+    if grammarName == 'ometaGrammar':
+        metagrammarClass = BootOMetaGrammar
+    else:
+        metagrammarClass = grammar.OMetaGrammar
+    g = metagrammarClass(getattr(grammar, grammarName))
+    tree = optimizer.optimize(g.parseGrammar(className, builder.TreeBuilder))
+    return builder.writeRules(tree)
+
+def rulesPath(moduleName):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        moduleName + '.py')
+
+if __name__ == '__main__':
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sources = [(module, generateRules(module))
+               for module, _, _ in RULES_MODULES]
+    for module, source in sources:
+        fp = open(rulesPath(module), 'wb')
+        fp.write(source)
+        fp.close()
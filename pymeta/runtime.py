@@ -2,7 +2,9 @@
 """
 Code needed to run a grammar after it has been compiled.
 """
-import operator
+from collections import OrderedDict
+from types import MethodType
+import bisect, codecs, mmap, operator, threading
 
 # The public parse error
 class ParseError(Exception):
@@ -32,19 +34,22 @@ class _MaybeParseError(Exception):
             return (self.position, self.error) == (other.position, other.error)
 
     def formatReason(self):
-        if self.error is None:
+        error = self.error
+        if error is None:
             return ''
-        if len(self.error) == 1:
-            if self.error[0][0] == 'message':
-                return self.error[0][1]
-            elif self.error[0][2] == None:
-                return 'expected a ' + self.error[0][1]
+        if len(error) == 1:
+            if error[0][0] == 'message':
+                return error[0][1]
+            elif error[0][2] == None:
+                return 'expected a ' + error[0][1]
             else:
-                return 'expected the %s %s' % (self.error[0][1], self.error[0][2])
+                return 'expected the %s %s' % (error[0][1], error[0][2])
         else:
             bits = []
-            for s in self.error:
-                if s[2] is None:
+            for s in error:
+                if s[0] == 'message':
+                    desc = s[1]
+                elif s[2] is None:
                     desc = "a " + s[1]
                 else:
                     desc = repr(s[2])
@@ -114,6 +119,85 @@ def joinErrors(errors):
 
     return [pos, list(results)]
 
+_errorPosition = operator.itemgetter(0)
+
+def furthestError(errors):
+    """
+    Return the error that got the furthest into the input, among the errors
+    of failed alternatives.
+    """
+    return max(errors, key=_errorPosition)
+
+
+# Expectations, like ("expected", "token", "if"), are interned as small
+# integers so that the failure tracker can keep them in a set cheaply.
+expectations = []
+_expectationIds = {}
+
+def expectationId(item):
+    """
+    Return the integer id of an expectation.
+    """
+    try:
+        return _expectationIds[item]
+    except KeyError:
+        key = item
+    except TypeError:
+        # expected values that are not hashable are told apart by repr
+        key = repr(item)
+        if key in _expectationIds:
+            return _expectationIds[key]
+    with _ruleIdsLock:
+        if key not in _expectationIds:
+            _expectationIds[key] = len(expectations)
+            expectations.append(item)
+    return _expectationIds[key]
+
+
+class FailureTracker(object):
+    """
+    The farthest input position where a match failed during a parse, along
+    with what was expected there. Recording a failure is constant time; the
+    error is only built by L{error}, when it is reported.
+
+    @ivar position: The farthest failure position.
+    @ivar expected: The set of the ids of what was expected there, see
+    L{expectationId}.
+    @ivar quiet: While positive, failures are not recorded, as inside
+    negative lookaheads, whose failures are successes.
+    """
+    __slots__ = ('position', 'expected', 'quiet')
+
+    def __init__(self, position=0):
+        self.position = position
+        self.expected = set()
+        self.quiet = 0
+
+    def record(self, position, expected):
+        """
+        Record a failure.
+
+        @param position: Where the match failed.
+        @param expected: A list of expectations, as built by L{expected}, or
+        None.
+        """
+        if position < self.position or not expected or self.quiet:
+            return
+        if position > self.position:
+            self.position = position
+            self.expected = set()
+        for item in expected:
+            self.expected.add(expectationId(item))
+
+    def error(self):
+        """
+        Return the farthest failure as a L{_MaybeParseError}.
+        """
+        if not self.expected:
+            return _MaybeParseError(self.position, None)
+        return _MaybeParseError(self.position,
+                                [expectations[i] for i in sorted(self.expected)])
+
 
 class character(str):
     """
@@ -138,112 +222,739 @@ class unicodeCharacter(unicode):
         """
         raise TypeError("Characters are not iterable")
 
+
+class _CharacterTable(dict):
+    """
+    The L{character} or L{unicodeCharacter} for each character read from
+    text input, made the first time it is read.
+    """
+    def __init__(self, characterClass):
+        self.characterClass = characterClass
+
+    def __missing__(self, c):
+        ch = self[c] = self.characterClass(c)
+        return ch
+
+_characterTables = {str: _CharacterTable(character),
+                    unicode: _CharacterTable(unicodeCharacter)}
+
+
 class InputStream(object):
     """
-    The basic input mechanism used by OMeta grammars.
+    The sequence an OMeta grammar reads its input from. Parsers do not keep
+    one of these per position: they walk C{data} with an integer position,
+    so moving through the input and backtracking never allocate.
+
+    Text input is read from the string itself. The characters read from it
+    are turned into L{character} or L{unicodeCharacter} objects as they come
+    out of the input, see L{OMetaBase.head}.
+
+    @ivar text: The string the input was made from, or C{None} if it is not
+    text. Primitives matching strings and characters work on it directly.
     """
 
     def fromIterable(cls, iterable):
         """
         @param iterable: Any iterable Python object.
         """
-        if isinstance(iterable, str):
-            data = [character(c) for c in iterable]
-            basetype = str
-        elif isinstance(iterable, unicode):
-            data = [unicodeCharacter(c) for c in iterable]
-            basetype = unicode
+        text = None
+        if isinstance(iterable, StreamInput):
+            return cls(iterable, iterable.basetype)
+        if isinstance(iterable, MappedInput):
+            return cls(iterable.text, iterable.basetype, iterable.text)
+        if isinstance(iterable, basestring):
+            # characters refuse to be iterated, so that list patterns do not
+            # match them
+            iter(iterable)
+            data = text = iterable
+            basetype = unicode if isinstance(iterable, unicode) else str
         else:
             data = list(iterable)
             basetype = list
-        return cls(data, 0, basetype)
+        return cls(data, basetype, text)
     fromIterable = classmethod(fromIterable)
 
-    def __init__(self, data, position, basetype):
+    def __init__(self, data, basetype, text=None):
         self.data = data
-        self.position = position
-        self.memo = {}
-        self.tl = None
         self.basetype = basetype
+        self.text = text
 
-    def head(self):
-        if self.position >= len(self.data):
-            raise EOFError(self.position)
-        return self.data[self.position], [self.position, None]
+    def __repr__(self):
+        return '<InputStream data:{self.data} basetype:{self.basetype}>' \
+                .format(self=self)
 
-    def nullError(self):
-        return _MaybeParseError(self.position, None)
+class StreamInput(object):
+    """
+    Text read on demand from a file object or an iterable of strings, for
+    parsing input too large to be loaded at once. It is indexed and sliced
+    by absolute position like a string, reading chunks as parsing moves
+    forward. Only the last C{window} characters before the farthest position
+    read are kept: reading before them raises C{ValueError}, so grammars
+    parsing a stream must not backtrack further than that.
+
+    Parsers of a stream keep their memo records within the same window by
+    default, see L{WindowMemo}. Parsers without diagnostics report errors
+    by parsing again from the start, which must still be kept.
+
+    @ivar basetype: C{unicode} if the input is decoded, or made of unicode
+    strings, C{str} otherwise.
+    @ivar offset: The position of the first character kept.
+    """
+    def __init__(self, source, encoding=None, window=1 << 20,
+                 chunkSize=1 << 16):
+        """
+        @param source: A file object, such as those returned by C{open},
+        C{gzip.open} or C{bz2.BZ2File}, or an iterable of strings.
+        @param encoding: The encoding to decode the input from, if it is
+        made of byte strings to be parsed as text.
+        @param window: How many characters before the farthest position
+        read are kept for backtracking.
+        @param chunkSize: How many bytes to read from a file at once.
+        """
+        if hasattr(source, 'read'):
+            self.chunks = iter(lambda: source.read(chunkSize), '')
+        else:
+            self.chunks = iter(source)
+        if encoding is None:
+            self.decoder = None
+        else:
+            self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.window = window
+        self.buffer = self._next()
+        if self.buffer is None:
+            self.buffer = u'' if self.decoder else ''
+        self.basetype = unicode if isinstance(self.buffer, unicode) else str
+        self.offset = 0
 
-    def tail(self):
-        if self.tl is None:
-            self.tl = InputStream(self.data, self.position + 1, self.basetype)
-        return self.tl
+    @classmethod
+    def open(cls, path, encoding=None, **kw):
+        """
+        Read a file, decompressing it if its name ends with C{.gz} or
+        C{.bz2}.
+        """
+        if path.endswith('.gz'):
+            import gzip
+            fp = gzip.open(path, 'rb')
+        elif path.endswith('.bz2'):
+            import bz2
+            fp = bz2.BZ2File(path, 'rb')
+        else:
+            fp = open(path, 'rb')
+        return cls(fp, encoding, **kw)
+
+    def _next(self):
+        """
+        Return the next non-empty chunk of decoded input, or C{None} at the
+        end.
+        """
+        for chunk in self.chunks:
+            if self.decoder is not None:
+                chunk = self.decoder.decode(chunk)
+            if chunk:
+                return chunk
+        if self.decoder is not None:
+            chunk = self.decoder.decode('', True)
+            self.decoder = None
+            if chunk:
+                return chunk
+        return None
+
+    def _fill(self, position):
+        """
+        Read chunks until the character at the given position is buffered,
+        dropping the characters that fell behind the window. Return whether
+        the input extends that far.
+        """
+        while position >= self.offset + len(self.buffer):
+            chunk = self._next()
+            if chunk is None:
+                return False
+            horizon = position - self.window
+            if horizon - self.offset >= len(chunk):
+                # dropped once the window has moved by a chunk, so that the
+                # copy is paid for by the chunk read
+                self.buffer = self.buffer[horizon - self.offset:] + chunk
+                self.offset = horizon
+            else:
+                self.buffer += chunk
+        return True
+
+    def __getitem__(self, index):
+        if index.__class__ is slice:
+            start = index.start or 0
+            if start < self.offset:
+                raise ValueError("Input before position %d was discarded"
+                                 % (self.offset,))
+            stop = index.stop
+            if stop is None:
+                return self.buffer[start - self.offset:]
+            self._fill(stop - 1)
+            return self.buffer[start - self.offset:stop - self.offset]
+        i = index - self.offset
+        if i < 0:
+            raise ValueError("Input before position %d was discarded"
+                             % (self.offset,))
+        try:
+            return self.buffer[i]
+        except IndexError:
+            if not self._fill(index):
+                raise
+            return self.buffer[index - self.offset]
 
-    def prev(self):
-        return InputStream(self.data, self.position - 1, self.basetype)
 
-    def getMemo(self, name):
+# The encodings whose text cannot be decoded a chunk at a time: those
+# detecting the byte order or a signature at the start, and those with
+# shift states.
+_unchunkable = frozenset(["utf-16", "utf-32", "utf-8-sig", "hz"])
+
+class _DecodedMap(object):
+    """
+    The text of a file mapped in memory in an encoding, indexed and sliced
+    by character like a unicode string. The bytes are decoded a chunk at a
+    time as they are read, keeping only the last few chunks decoded, and
+    the offsets of every chunk in bytes and in characters, so that any
+    chunk can be decoded again.
+
+    Its length is found by decoding it through to the end, the first time
+    it is asked for.
+    """
+    def __init__(self, map, encoding, chunkSize=1 << 16, keep=4):
+        """
+        @param map: The bytes to decode.
+        @param encoding: Their encoding, which must let chunks be decoded
+        on their own.
+        @param chunkSize: How many bytes to decode at once.
+        @param keep: How many decoded chunks are kept.
+        """
+        name = codecs.lookup(encoding).name
+        if name in _unchunkable or name.startswith("iso2022"):
+            raise ValueError("%s text cannot be decoded in place, decode "
+                             "the file with StreamInput" % (name,))
+        self.map = map
+        self.encoding = encoding
+        self.chunkSize = chunkSize
+        self.keep = keep
+        self.byteOffsets = [0]
+        self.charOffsets = [0]
+        self.chunks = OrderedDict()
+        self.length = None
+        # the last chunk read: its first and last positions, and its text
+        self.start, self.end, self.chunk = 0, 0, u''
+
+    def _decodeNext(self):
+        """
+        Decode the chunk after the last one found, and return whether there
+        was one.
+        """
+        start = self.byteOffsets[-1]
+        if start >= len(self.map):
+            self.length = self.charOffsets[-1]
+            return False
+        size = self.chunkSize
+        while True:
+            raw = self.map[start:start + size]
+            final = start + len(raw) >= len(self.map)
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            text = decoder.decode(raw, final)
+            pending = decoder.getstate()[0]
+            if text or final:
+                break
+            # a chunk too small for one character
+            size *= 2
+        self.byteOffsets.append(start + len(raw) - len(pending))
+        self.charOffsets.append(self.charOffsets[-1] + len(text))
+        self._keep(len(self.charOffsets) - 2, text)
+        return True
+
+    def _keep(self, index, text):
+        self.chunks[index] = text
+        if len(self.chunks) > self.keep:
+            self.chunks.popitem(False)
+
+    def _chunkAt(self, position):
+        """
+        Make the chunk holding the character at the given position the last
+        one read, and return whether the text extends that far.
+        """
+        offsets = self.charOffsets
+        while position >= offsets[-1]:
+            if not self._decodeNext():
+                return False
+        index = bisect.bisect_right(offsets, position) - 1
+        text = self.chunks.get(index)
+        if text is None:
+            text = self.map[self.byteOffsets[index]:
+                            self.byteOffsets[index + 1]].decode(self.encoding)
+            self._keep(index, text)
+        self.start, self.end, self.chunk = (offsets[index], offsets[index + 1],
+                                            text)
+        return True
+
+    def __len__(self):
+        while self.length is None:
+            self._decodeNext()
+        return self.length
+
+    def __getitem__(self, index):
+        if index.__class__ is slice:
+            start, stop, step = index.indices(len(self))
+            pieces = []
+            while start < stop:
+                self._chunkAt(start)
+                end = min(stop, self.end)
+                pieces.append(self.chunk[start - self.start:end - self.start])
+                start = end
+            return u''.join(pieces)
+        if self.start <= index < self.end:
+            return self.chunk[index - self.start]
+        if index < 0 or not self._chunkAt(index):
+            raise IndexError("text index out of range")
+        return self.chunk[index - self.start]
+
+    def startswith(self, prefix, position):
+        return self[position:position + len(prefix)] == prefix
+
+
+class MappedInput(object):
+    """
+    A file mapped in memory, for parsing large files in place. Parsers read
+    its bytes straight from the map, and the strings they consume are
+    slices of it.
+
+    Files in an encoding are read by character, decoding the map a chunk at
+    a time as parsing reaches it: positions are character offsets, and the
+    characters and strings read are unicode.
+
+    @ivar map: The C{mmap} of the file, or an empty string for an empty
+    file, which cannot be mapped.
+    @ivar text: What parsers read: the map, or its decoded text.
+    @ivar basetype: C{unicode} if the file is decoded, C{str} otherwise.
+    """
+    def __init__(self, path, encoding=None):
         """
-        Returns the memo record for the named rule.
-        @param name: A rule name.
+        @param path: The path of the file.
+        @param encoding: The encoding of the file, if it is text to be
+        decoded. Encodings with a byte order mark or shift states, such as
+        UTF-16, are refused with C{ValueError}; UTF-8 and single-byte
+        encodings can be used.
         """
-        return self.memo.get(name, None)
-
+        self.encoding = encoding
+        f = open(path, 'rb')
+        try:
+            try:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self.map = ''
+        finally:
+            f.close()
+        if encoding is None:
+            self.text, self.basetype = self.map, str
+        else:
+            self.text, self.basetype = _DecodedMap(self.map, encoding), unicode
 
-    def setMemo(self, name, rec):
+    def close(self):
         """
-        Store a memo record for the given value and position for the given
-        rule.
-        @param name: A rule name.
-        @param rec: A memo record.
+        Unmap the file.
         """
-        self.memo[name] = rec
-        return rec
+        if self.map:
+            self.map.close()
+
+
+def mismatch(text, tok, position):
+    """
+    Return the position of the first character of C{tok} that differs from
+    C{text} when C{tok} is laid over it at C{position}, or C{None} if C{text}
+    contains C{tok} there.
+    """
+    try:
+        if text.__class__ is mmap.mmap:
+            if text[position:position + len(tok)] == tok:
+                return None
+        elif text.startswith(tok, position):
+            return None
+    except UnicodeDecodeError:
+        # a byte string compared with unicode text; the loop below compares
+        # it character by character as matching with exactly() would
+        pass
+    end = len(text)
+    for c in tok:
+        if position >= end or text[position] != c:
+            return position
+        position += 1
+    return None
 
-    def __repr__(self):
-        return '<InputStream data:{self.data} position:{self.position}' \
-            ' memo:{self.memo} tl:{self.tl} basetype:{self.basetype}>' \
-                .format(self=self)
 
 class ArgInput(object):
+    """
+    A rule argument pushed in front of the input, for rules that match their
+    arguments with patterns. Used as the parser's input state in place of an
+    integer position until the argument is consumed. Its memo tables are
+    only created when a rule is memoized there.
+    """
+    __slots__ = ('arg', 'parent', 'memo', 'position')
+
     def __init__(self, arg, parent):
         self.arg = arg
         self.parent = parent
-        self.memo = {}
-        self.err = parent.nullError()
+        self.memo = None
+        if parent.__class__ is ArgInput:
+            self.position = parent.position
+        else:
+            self.position = parent
 
-    def head(self):
-        return self.arg, self.err
 
-    def tail(self):
-        return self.parent
+class _Fail(object):
+    """
+    Type of L{FAIL}.
+    """
+    def __repr__(self):
+        return 'FAIL'
+
+# Returned in place of a value by rules and primitives using the sentinel
+# failure protocol, which return (FAIL, error) instead of raising
+# _MaybeParseError(*error).
+FAIL = _Fail()
+
+
+class LeftRecursion(object):
+    """
+    Marker for left recursion in a grammar rule.
+    """
+    detected = False
+
+
+# The marker stored while applying rules with arguments, and left after they
+# fail: applying one again with the same arguments at the same position fails.
+_applying = LeftRecursion()
 
-    def nullError(self):
-        return self.parent.nullError()
 
-    def getMemo(self, name):
+# Rule names are mapped to small integers shared by every grammar, so a rule
+# inherited from a parent grammar uses the same memo table in subclasses.
+ruleNames = []
+_ruleIds = {}
+_ruleIdsLock = threading.Lock()
+
+def ruleId(name):
+    """
+    Return the integer id indexing the memo table of the named rule.
+    """
+    try:
+        return _ruleIds[name]
+    except KeyError:
+        with _ruleIdsLock:
+            if name not in _ruleIds:
+                _ruleIds[name] = len(ruleNames)
+                ruleNames.append(name)
+        return _ruleIds[name]
+
+def argsKey(ruleId, args):
+    """
+    Return the key of the memo table of a rule applied with arguments.
+    The type of each argument is part of it, as arguments equal to each
+    other such as C{1}, C{True} and C{1.0} need not match the same input.
+    """
+    return (ruleId, tuple([(type(arg), arg) for arg in args]))
+
+class _WindowTable(dict):
+    """
+    Memo table of one rule under a L{WindowMemo} policy.
+
+    @ivar pinned: The positions of the records never to evict, those of
+    left-recursive applications growing their seed.
+    """
+    def __init__(self, policy):
+        dict.__init__(self)
+        self.policy = policy
+        self.pinned = set()
+
+    def get(self, position, default=None):
+        rec = dict.get(self, position, default)
+        if rec is None and position < self.policy.horizon:
+            self.policy.recomputations += 1
+        return rec
+
+    def __setitem__(self, position, rec):
+        dict.__setitem__(self, position, rec)
+        end = rec[0] if rec.__class__ is tuple else position
+        if end.__class__ is int and end > self.policy.farthest:
+            self.policy.advance(end)
+
+
+class WindowMemo(object):
+    """
+    Memo policy keeping only the records for input positions at most
+    C{window} items behind the farthest position a rule has reached.
+    Evicted records are recomputed when a rule is applied there again, so
+    backtracking further than the window only costs time.
+
+    @ivar evictions: The number of memo records dropped.
+    @ivar recomputations: The number of rule applications that had to run
+    again behind the window.
+    """
+    def __init__(self, window):
+        self.window = window
+        self.farthest = 0
+        self.horizon = 0
+        self.evictions = 0
+        self.recomputations = 0
+        self.tables = []
+
+    def newTable(self, ruleId):
         """
-        Returns the memo record for the named rule.
-        @param name: A rule name.
+        Create the memo table of a rule.
         """
-        return self.memo.get(name, None)
+        table = _WindowTable(self)
+        self.tables.append(table)
+        return table
 
-    def setMemo(self, name, rec):
+    def reset(self):
         """
-        Store a memo record for the given value and position for the given
-        rule.
-        @param name: A rule name.
-        @param rec: A memo record.
+        Forget the memo tables and the positions reached, when the parser
+        drops its tables to parse again from the start. The counters are
+        kept.
+        """
+        self.farthest = 0
+        self.horizon = 0
+        self.tables = []
+
+    def advance(self, position):
+        """
+        Record that parsing reached the given position. Records are swept
+        once the window has moved by its own length, so each sweep is paid
+        for by C{window} positions of progress.
         """
-        self.memo[name] = rec
+        self.farthest = position
+        if position - self.horizon < 2 * self.window:
+            return
+        self.horizon = position - self.window
+        for table in self.tables:
+            stale = [k for k, rec in table.iteritems()
+                     if k < self.horizon and rec.__class__ is not LeftRecursion
+                     and k not in table.pinned]
+            for k in stale:
+                dict.__delitem__(table, k)
+            self.evictions += len(stale)
+
+
+class _LRUTable(dict):
+    """
+    Memo table of one rule under an L{LRUMemo} policy.
+
+    @ivar pinned: The positions of the records never to evict, those of
+    left-recursive applications growing their seed.
+    """
+    def __init__(self, policy, ruleId):
+        dict.__init__(self)
+        self.policy = policy
+        self.ruleId = ruleId
+        self.pinned = set()
+
+    def get(self, position, default=None):
+        rec = dict.get(self, position, default)
+        key = (self.ruleId, position)
+        if rec is None:
+            if self.policy.ghosts.pop(key, False):
+                self.policy.recomputations += 1
+        else:
+            order = self.policy.order
+            order.pop(key, None)
+            order[key] = self
         return rec
 
+    def __setitem__(self, position, rec):
+        dict.__setitem__(self, position, rec)
+        self.policy.stored((self.ruleId, position), self)
 
-class LeftRecursion(object):
+
+class LRUMemo(object):
     """
-    Marker for left recursion in a grammar rule.
+    Memo policy keeping at most C{maxEntries} records across all rules,
+    evicting the least recently used ones. Evicted records are recomputed
+    when needed.
+
+    @ivar evictions: The number of memo records dropped.
+    @ivar recomputations: The number of rule applications that had to run
+    again because their record was evicted. Only the last C{maxEntries}
+    evictions are remembered for this count.
+    """
+    def __init__(self, maxEntries):
+        self.maxEntries = maxEntries
+        self.order = OrderedDict()
+        self.ghosts = OrderedDict()
+        self.evictions = 0
+        self.recomputations = 0
+
+    def newTable(self, ruleId):
+        """
+        Create the memo table of a rule.
+        """
+        return _LRUTable(self, ruleId)
+
+    def reset(self):
+        """
+        Forget the records stored and evicted, when the parser drops its
+        memo tables to parse again from the start. The counters are kept.
+        """
+        self.order.clear()
+        self.ghosts.clear()
+
+    def stored(self, key, table):
+        """
+        Record a memo store, evicting old records if over budget.
+        """
+        order = self.order
+        order.pop(key, None)
+        order[key] = table
+        skipped = 0
+        while len(order) > self.maxEntries and skipped < len(order):
+            oldKey, oldTable = order.popitem(last=False)
+            rec = dict.get(oldTable, oldKey[1])
+            if rec is None:
+                continue
+            if (rec.__class__ is LeftRecursion
+                or oldKey[1] in oldTable.pinned):
+                # rules still running at that position keep their record
+                order[oldKey] = oldTable
+                skipped += 1
+                continue
+            dict.__delitem__(oldTable, oldKey[1])
+            self.evictions += 1
+            self.ghosts[oldKey] = True
+            if len(self.ghosts) > self.maxEntries:
+                self.ghosts.popitem(last=False)
+
+
+class DispatchTable(object):
+    """
+    Which alternatives of an ordered choice can match, by the next character
+    of text input, as computed by the grammar compiler from FIRST sets. See
+    L{OMetaBase._dispatch}.
+
+    The table is only correct as long as the methods it was computed from
+    behave as the compiler assumed, so it is not used by the subclasses of
+    its grammar that override them.
+    """
+    def __init__(self, owner, table, default, methods):
+        """
+        @param owner: The grammar class the table was generated for.
+        @param table: A dict mapping characters to the indices of the
+        alternatives that can begin with them.
+        @param default: The indices of the alternatives to try for other
+        characters and at the end of the input.
+        @param methods: The names of the methods the table depends on: rules
+        of C{owner} and methods of L{OMetaBase}.
+        """
+        self.owner = owner
+        self.table = table
+        self.default = default
+        self.methods = methods
+        self.valid = {}
+
+    def validFor(self, cls):
+        """
+        Return whether the table can be used by parsers of a grammar class.
+        """
+        try:
+            return self.valid[cls]
+        except KeyError:
+            pass
+        valid = True
+        for name in self.methods:
+            expected = self.owner.__dict__.get(name)
+            if expected is None:
+                expected = getattr(OMetaBase, name).im_func
+            if getattr(cls, name).im_func is not expected:
+                valid = False
+                break
+        self.valid[cls] = valid
+        return valid
+
+
+_inliningValid = {}
+
+def inliningValid(cls):
+    """
+    Return whether parsers of a grammar class can run the code the grammar
+    compiler generated in place of applications of rules: whether the class
+    leaves every rule inlined by it and its base classes as compiled.
+    """
+    try:
+        return _inliningValid[cls]
+    except KeyError:
+        pass
+    valid = True
+    for owner in cls.__mro__:
+        for name in owner.__dict__.get('inlinedRules', ()):
+            method = "rule_" + name
+            if getattr(cls, method).im_func is not owner.__dict__[method]:
+                valid = False
+    _inliningValid[cls] = valid
+    return valid
+
+
+_directCallsValid = {}
+
+def directCallsValid(cls):
+    """
+    Return whether parsers of a grammar class can call the methods of the
+    rules their grammars apply without memoization directly: whether the
+    class leaves every such rule of it and its base classes as compiled.
+    An overriding rule may need the memo, to grow the seed of a left
+    recursion, or follow the other failure protocol.
+    """
+    try:
+        return _directCallsValid[cls]
+    except KeyError:
+        pass
+    valid = True
+    for owner in cls.__mro__:
+        for name in owner.__dict__.get('directRules', ()):
+            method = "rule_" + name
+            if getattr(cls, method).im_func is not owner.__dict__[method]:
+                valid = False
+    _directCallsValid[cls] = valid
+    return valid
+
+
+_argumentsValid = {}
+
+def argumentsValid(cls):
+    """
+    Return whether parsers of a grammar class can pass rule arguments the
+    way the grammar compiler chose for each application: pushed in front of
+    the input for the rules of grammars, which match them with patterns, and
+    as Python arguments for the built-in rules in L{_argumentRules}. The
+    class must not override any of these with a method taking another
+    number of arguments.
+    """
+    try:
+        return _argumentsValid[cls]
+    except KeyError:
+        pass
+    valid = all(getattr(cls, name).im_func.func_code.co_argcount == 2
+                for name in _argumentRules)
+    for owner in cls.__mro__:
+        if 'leftRecursiveRules' not in owner.__dict__:
+            continue
+        for name in owner.__dict__:
+            if (name.startswith("rule_") and
+                getattr(cls, name).im_func.func_code.co_argcount != 1):
+                valid = False
+    _argumentsValid[cls] = valid
+    return valid
+
+
+# The parser methods applying rules with memoization, which tools observing
+# parses wrap on parser instances.
+_APPLY_METHODS = ['_apply', '_tryApply', '_applyPattern', '_applyCall',
+                  '_tryApplyPattern', '_tryApplyCall']
+
+
+def _ignoreError(error):
+    """
+    Replaces L{OMetaBase.considerError} on parsers without diagnostics.
     """
-    detected = False
+
 
 class OMetaBase(object):
     """
@@ -251,14 +962,65 @@ class OMetaBase(object):
     operations. Built-in rules are defined here.
     """
     globals = None
-    def __init__(self, string, globals=None):
-        """
-        @param string: The string to be parsed.
+    ruleId = staticmethod(ruleId)
+    FAIL = FAIL
+    DispatchTable = DispatchTable
+    # Whether grammars defined on this class are compiled for the sentinel
+    # failure protocol by default.
+    sentinelFailures = False
+    # Whether parsers keep track of what input was expected where, to report
+    # parse errors. Without it, a failed rule application is run again with
+    # diagnostics before its error is raised.
+    diagnostics = True
+    # The rules of this class whose code is generated in place of their
+    # applications, and whether parsers can run that code rather than apply
+    # them, which they cannot when a subclass overrides one. See
+    # L{inliningValid}.
+    inlinedRules = ()
+    inlining = True
+    # Whether parsers can pass rule arguments without checking the number
+    # of arguments rules take, see L{argumentsValid}.
+    argumentPassing = True
+    # The rules whose methods the code generated for this class calls
+    # directly, applying them without memoization, and whether parsers can
+    # do so, which they cannot when a subclass overrides one. See
+    # L{directCallsValid}.
+    directRules = ()
+    directCalls = True
+    # Whether the grammar was compiled to report parse events, and the
+    # object they are reported to, see L{pymeta.trace}.
+    traced = False
+    tracer = None
+
+    def __init__(self, string, globals=None, memoPolicy=None,
+                 diagnostics=None):
+        """
+        @param string: The string to be parsed, or any other iterable, or a
+        L{StreamInput}.
 
         @param globals: A dictionary of names to objects, for use in evaluating
         embedded Python expressions.
-        """
-        self.input = InputStream.fromIterable(string)
+
+        @param memoPolicy: An optional L{WindowMemo} or L{LRUMemo} bounding
+        the memory used by memo records. By default every record is kept
+        until the parser is discarded.
+
+        @param diagnostics: Whether to keep track of errors while parsing,
+        overriding the class default. Parsing is faster without them, and
+        rules failing at the top level are run again with diagnostics on to
+        report the error.
+        """
+        self._setInput(InputStream.fromIterable(string))
+        if memoPolicy is None and isinstance(string, StreamInput):
+            memoPolicy = WindowMemo(string.window)
+        self.memoPolicy = memoPolicy
+        if diagnostics is not None:
+            self.diagnostics = diagnostics
+        if not self.diagnostics:
+            self.considerError = _ignoreError
+        self.inlining = inliningValid(self.__class__)
+        self.argumentPassing = argumentsValid(self.__class__)
+        self.directCalls = directCallsValid(self.__class__)
         self.locals = {}
         if self.globals is None:
             if globals is None:
@@ -266,26 +1028,185 @@ class OMetaBase(object):
             else:
                 self.globals = globals
 
-        self.currentError = self.input.nullError()
+        self.failures = FailureTracker()
+
+    def _setInput(self, stream):
+        """
+        Start reading from the beginning of the given L{InputStream}, with
+        empty memo tables.
+        """
+        self.data = stream.data
+        self.basetype = stream.basetype
+        self.text = stream.text
+        self.characters = _characterTables.get(stream.basetype)
+        self.input = 0
+        self.memo = [None] * len(ruleNames)
+        self.argMemo = {}
+        self.memoPolicy = None
+
+    @property
+    def position(self):
+        """
+        The integer offset of the current input state.
+        """
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            return inp.position
+        return inp
+
+    def head(self):
+        """
+        Return the item at the current input state along with its position,
+        without consuming it.
+        """
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            return inp.arg, [inp.position, None]
+        try:
+            h = self.data[inp]
+        except IndexError:
+            raise EOFError(inp)
+        if self.characters is not None:
+            h = self.characters[h]
+        return h, [inp, None]
+
+    def tail(self):
+        """
+        Return the input state following the current one.
+        """
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            return inp.parent
+        return inp + 1
+
+    def prev(self):
+        """
+        Return the input state preceding the current one.
+        """
+        return self.position - 1
+
+    def nullError(self):
+        return _MaybeParseError(self.position, None)
+
+    def _ruleMemo(self, state, ruleId):
+        """
+        Return the memo table of the given rule for the input being read:
+        a dict mapping input states to memo records. Records are
+        C{(end state, value, error)} tuples, or a L{LeftRecursion} marker
+        while the rule is being applied at that state.
+        """
+        if state.__class__ is ArgInput:
+            if state.memo is None:
+                state.memo = {}
+            return state.memo.setdefault(ruleId, {})
+        try:
+            memo = self.memo[ruleId]
+        except IndexError:
+            self.memo.extend([None] * (len(ruleNames) - len(self.memo)))
+            memo = None
+        if memo is None:
+            if self.memoPolicy is None:
+                memo = self.memo[ruleId] = {}
+            else:
+                memo = self.memo[ruleId] = self.memoPolicy.newTable(ruleId)
+        return memo
+
+    def _argsMemo(self, state, ruleId, args):
+        """
+        Return the memo table of the given rule applied with the given
+        arguments, like L{_ruleMemo}, or C{None} if the arguments cannot be
+        hashed.
+        """
+        key = argsKey(ruleId, args)
+        if state.__class__ is ArgInput:
+            if state.memo is None:
+                state.memo = {}
+            tables = state.memo
+        else:
+            tables = self.argMemo
+        try:
+            memo = tables.get(key)
+        except TypeError:
+            return None
+        if memo is None:
+            if self.memoPolicy is None or state.__class__ is ArgInput:
+                memo = tables[key] = {}
+            else:
+                memo = tables[key] = self.memoPolicy.newTable(key)
+        return memo
+
+    def getMemo(self, state, ruleId):
+        """
+        Returns the memo record for a rule at the given input state.
+        @param state: An input state.
+        @param ruleId: A rule id, as returned by L{ruleId}.
+        """
+        return self._ruleMemo(state, ruleId).get(state, None)
+
+    def setMemo(self, state, ruleId, rec):
+        """
+        Store a memo record for a rule at the given input state. A record of
+        None forgets the rule's result there.
+        @param state: An input state.
+        @param ruleId: A rule id, as returned by L{ruleId}.
+        @param rec: A memo record.
+        """
+        memo = self._ruleMemo(state, ruleId)
+        if rec is None:
+            memo.pop(state, None)
+        else:
+            memo[state] = rec
+        return rec
 
     def debug(self, *args):
         print args
 
     @classmethod
-    def parse(cls, source):
+    def parse(cls, source, memoPolicy=None, diagnostics=None,
+              profiler=None, tracer=None, rule='grammar'):
+        """
+        Parse a source with the C{grammar} rule, and return its value.
+
+        @param profiler: An optional L{pymeta.profiler.Profiler} recording
+        the parse.
+        @param tracer: An optional L{pymeta.trace.Tracer} the parse events
+        of grammars compiled with tracing are reported to.
+        @param rule: The name of the rule to parse the source with instead.
+        """
         if isinstance(source, str):
             source = source.decode('utf8')
         try:
-            parser = cls(source)
-            return parser.apply('grammar')[0]
+            parser = cls(source, memoPolicy=memoPolicy,
+                         diagnostics=diagnostics)
+            if profiler is not None:
+                profiler.install(parser)
+            parser.tracer = tracer
+            return parser.apply(rule)[0]
         except _MaybeParseError:
-            raise ParseError(parser.currentError.formatError(source))
+            error = parser.currentError
+            if not isinstance(source, basestring):
+                # the lines before the error may have been discarded, or
+                # be too many to split, or the input may not be text
+                raise ParseError("Parse error at position %s: %s"
+                                 % (error.position, error.formatReason()))
+            raise ParseError(error.formatError(source))
+
+    @property
+    def currentError(self):
+        """
+        The error to report if parsing fails: the farthest failure so far.
+        """
+        return self.failures.error()
 
     def considerError(self, error):
-        if isinstance(error, _MaybeParseError):
-            error = error.args
-        if error and error[1] and error[0] > self.currentError[0]:
-            self.currentError = _MaybeParseError(*error)
+        """
+        Record a failed match with the failure tracker.
+
+        @param error: A L{_MaybeParseError}, or a C{(position, expected)}
+        pair.
+        """
+        if error is not None:
+            self.failures.record(error[0], error[1])
 
     def superApply(self, ruleName, *args):
         """
@@ -295,82 +1216,517 @@ class OMetaBase(object):
         """
         r = getattr(super(self.__class__, self), "rule_" + ruleName, None)
         if r is not None:
-            self.input.setMemo(ruleName, None)
-            return self._apply(r, ruleName, args)
+            rid = ruleId(ruleName)
+            self.setMemo(self.input, rid, None)
+            if args:
+                # records made with arguments would be shared with the
+                # overriding rule
+                rid = None
+            return self._apply(r, rid, args)
+        else:
+            raise NameError("No rule named '%s'" % (ruleName,))
+
+    def trySuperApply(self, ruleName, *args):
+        """
+        L{superApply} for the sentinel failure protocol.
+        """
+        r = getattr(super(self.__class__, self), "rule_" + ruleName, None)
+        if r is not None:
+            rid = ruleId(ruleName)
+            self.setMemo(self.input, rid, None)
+            if args:
+                # records made with arguments would be shared with the
+                # overriding rule
+                rid = None
+            return self._tryApply(r, rid, args)
         else:
             raise NameError("No rule named '%s'" % (ruleName,))
 
     def apply(self, ruleName, *args):
         """
-        Apply the named rule, optionally with some arguments.
+        Apply the named rule, optionally with some arguments. Without
+        diagnostics, a failed rule is applied again with them, so that the
+        error raised is the one a parser with diagnostics would raise.
+
+        @param ruleName: A rule name.
+        """
+        start = self.input
+        try:
+            return self.rule_apply(ruleName, *args)
+        except _MaybeParseError, e:
+            if self.diagnostics:
+                self.considerError(e)
+                raise
+        self.input = start
+        self.enableDiagnostics()
+        try:
+            return self.rule_apply(ruleName, *args)
+        except _MaybeParseError, e:
+            self.considerError(e)
+            raise
+
+
+    def rule_apply(self, ruleName, *args):
+        """
+        Apply the named rule from a grammar, optionally with some arguments.
 
         @param ruleName: A rule name.
         """
         r = getattr(self, "rule_" + ruleName, None)
         if r is not None:
-            val, err = self._apply(r, ruleName, args)
-            return val, _MaybeParseError(*err)
+            if self.traced:
+                val, err = self._traceApply(self._apply, r, ruleId(ruleName),
+                                            args)
+            else:
+                val, err = self._apply(r, ruleId(ruleName), args)
+            return val, self.currentError
         else:
             raise NameError("No rule named '%s'" % (ruleName,))
-    rule_apply = apply
 
-    def _apply(self, rule, ruleName, args):
+
+    def enableDiagnostics(self):
         """
-        Apply a rule method to some args.
+        Start keeping track of errors. Memo records made without diagnostics
+        are dropped, since their errors were not computed, and so is what
+        the memo policy knew of them.
+        """
+        if self.diagnostics:
+            return
+        self.diagnostics = True
+        self.__dict__.pop('considerError', None)
+        self.failures = FailureTracker(self.position)
+        self.memo = [None] * len(ruleNames)
+        self.argMemo = {}
+        if self.memoPolicy is not None:
+            self.memoPolicy.reset()
+
+    def _apply(self, rule, ruleId, args):
+        """
+        Apply a rule method to some args. Rules may report failure either by
+        raising L{_MaybeParseError} or by returning C{(FAIL, error)}; both
+        are raised from here.
+
+        Applications with arguments are memoized by rule, arguments and
+        position when the arguments can be hashed. Their left recursion is
+        not supported: applying a rule again with the same arguments at the
+        same position fails.
         @param rule: A method of this object.
-        @param ruleName: The name of the rule invoked.
+        @param ruleId: The id of the rule invoked, as returned by L{ruleId},
+        or C{None} for applications with arguments not to be memoized.
         @param args: A sequence of arguments to it.
         """
         if args:
-            if rule.func_code.co_argcount - 1 != len(args):
-                for arg in args[::-1]:
-                    self.input = ArgInput(arg, self.input)
-                return rule()
-            else:
-                return rule(*args)
-        memoRec = self.input.getMemo(ruleName)
+            return self._applyArgs(rule, ruleId, args, None)
+        oldPosition = self.input
+        if oldPosition.__class__ is ArgInput:
+            memo = self._ruleMemo(oldPosition, ruleId)
+        else:
+            try:
+                memo = self.memo[ruleId]
+            except IndexError:
+                memo = None
+            if memo is None:
+                memo = self._ruleMemo(oldPosition, ruleId)
+        memoRec = memo.get(oldPosition)
         if memoRec is None:
-            oldPosition = self.input
-            lr = LeftRecursion()
-            memoRec = self.input.setMemo(ruleName, lr)
+            lr = memo[oldPosition] = LeftRecursion()
 
             #print "Calling", rule
-            try:
-                memoRec = self.input.setMemo(ruleName,
-                                             [rule(), self.input])
-            except _MaybeParseError:
-                #print "Failed", rule
-                raise
+            val, err = rule()
+            if val is FAIL:
+                raise _MaybeParseError(*err)
             #print "Success", rule
+            pinned = None
+            if lr.detected:
+                # the seed must not be evicted before it is done growing
+                pinned = getattr(memo, 'pinned', None)
+                if pinned is not None:
+                    pinned.add(oldPosition)
+            memoRec = memo[oldPosition] = (self.input, val, err)
             if lr.detected:
                 sentinel = self.input
-                while True:
-                    try:
-                        self.input = oldPosition
-                        ans = rule()
-                        if (self.input == sentinel):
+                try:
+                    while True:
+                        try:
+                            self.input = oldPosition
+                            val, err = rule()
+                            if val is FAIL:
+                                self.considerError(err)
+                                break
+                            if self.input == sentinel:
+                                break
+
+                            memoRec = memo[oldPosition] = (self.input, val, err)
+                        except _MaybeParseError, e:
+                            self.considerError(e)
                             break
+                finally:
+                    if pinned is not None:
+                        pinned.discard(oldPosition)
 
-                        memoRec = oldPosition.setMemo(ruleName,
-                                                     [ans, self.input])
-                    except _MaybeParseError:
-                        break
-            self.input = oldPosition
-
-        elif isinstance(memoRec, LeftRecursion):
+        elif memoRec.__class__ is LeftRecursion:
             memoRec.detected = True
             raise _MaybeParseError(None, None)
-        self.input = memoRec[1]
-        return memoRec[0]
+        self.input = memoRec[0]
+        return memoRec[1:]
+
+
+    def _applyPattern(self, rule, ruleId, args):
+        """
+        L{_apply} with arguments for a rule the grammar compiler knows to
+        match them with patterns: they are pushed in front of the input
+        without looking at the rule's signature.
+        """
+        if not self.argumentPassing:
+            return self._applyArgs(rule, ruleId, args, None)
+        oldPosition = self.input
+        memo = None
+        if ruleId is not None:
+            memo = self._argsMemo(oldPosition, ruleId, args)
+        if memo is not None:
+            memoRec = memo.get(oldPosition)
+            if memoRec is not None:
+                if memoRec.__class__ is LeftRecursion:
+                    raise _MaybeParseError(None, None)
+                self.input = memoRec[0]
+                return memoRec[1:]
+            memo[oldPosition] = _applying
+        for arg in args[::-1]:
+            self.input = ArgInput(arg, self.input)
+        val, err = rule()
+        if val is FAIL:
+            raise _MaybeParseError(*err)
+        if memo is not None:
+            memo[oldPosition] = (self.input, val, err)
+        return val, err
+
+
+    def _applyCall(self, rule, ruleId, args):
+        """
+        L{_apply} with arguments for a built-in rule the grammar compiler
+        knows to take them as Python arguments.
+        """
+        if not self.argumentPassing:
+            return self._applyArgs(rule, ruleId, args, None)
+        oldPosition = self.input
+        memo = None
+        if ruleId is not None:
+            memo = self._argsMemo(oldPosition, ruleId, args)
+        if memo is not None:
+            memoRec = memo.get(oldPosition)
+            if memoRec is not None:
+                if memoRec.__class__ is LeftRecursion:
+                    raise _MaybeParseError(None, None)
+                self.input = memoRec[0]
+                return memoRec[1:]
+            memo[oldPosition] = _applying
+        val, err = rule(*args)
+        if val is FAIL:
+            raise _MaybeParseError(*err)
+        if memo is not None:
+            memo[oldPosition] = (self.input, val, err)
+        return val, err
+
+
+    def _applyArgs(self, rule, ruleId, args, pushed):
+        """
+        Apply a rule with some arguments, memoized by rule, arguments and
+        position, and raise its failure.
+        @param pushed: Whether to push the arguments in front of the input,
+        see L{_callWithArgs}.
+        """
+        oldPosition = self.input
+        memo = None
+        if ruleId is not None:
+            memo = self._argsMemo(oldPosition, ruleId, args)
+        if memo is None:
+            val, err = self._callWithArgs(rule, args, pushed)
+            if val is FAIL:
+                raise _MaybeParseError(*err)
+            return val, err
+        memoRec = memo.get(oldPosition)
+        if memoRec is None:
+            memo[oldPosition] = _applying
+            val, err = self._callWithArgs(rule, args, pushed)
+            if val is FAIL:
+                raise _MaybeParseError(*err)
+            memoRec = memo[oldPosition] = (self.input, val, err)
+        elif memoRec.__class__ is LeftRecursion:
+            raise _MaybeParseError(None, None)
+        self.input = memoRec[0]
+        return memoRec[1:]
+
+
+    def _callWithArgs(self, rule, args, pushed=None):
+        """
+        Call a rule method with some arguments: as Python arguments if it
+        takes them, or pushed in front of the input for it to match with
+        patterns otherwise.
+        @param pushed: Whether the arguments are pushed, or C{None} to tell
+        from the number of arguments the method takes.
+        """
+        if pushed is None:
+            pushed = rule.func_code.co_argcount - 1 != len(args)
+        if pushed:
+            for arg in args[::-1]:
+                self.input = ArgInput(arg, self.input)
+            return rule()
+        return rule(*args)
+
+
+    def _tryApply(self, rule, ruleId, args):
+        """
+        L{_apply} for the sentinel failure protocol: return C{(FAIL, error)}
+        when the rule fails instead of raising. Built-in rules that are not
+        overridden are replaced with their variants following this protocol.
+        """
+        variant = _tryVariants.get(getattr(rule, 'im_func', None))
+        if variant is not None:
+            rule = MethodType(variant, self)
+        if args:
+            return self._tryApplyArgs(rule, ruleId, args, None)
+        try:
+            oldPosition = self.input
+            if oldPosition.__class__ is ArgInput:
+                memo = self._ruleMemo(oldPosition, ruleId)
+            else:
+                try:
+                    memo = self.memo[ruleId]
+                except IndexError:
+                    memo = None
+                if memo is None:
+                    memo = self._ruleMemo(oldPosition, ruleId)
+            memoRec = memo.get(oldPosition)
+            if memoRec is None:
+                lr = memo[oldPosition] = LeftRecursion()
+                val, err = rule()
+                if val is FAIL:
+                    return val, err
+                pinned = None
+                if lr.detected:
+                    # the seed must not be evicted before it is done growing
+                    pinned = getattr(memo, 'pinned', None)
+                    if pinned is not None:
+                        pinned.add(oldPosition)
+                memoRec = memo[oldPosition] = (self.input, val, err)
+                if lr.detected:
+                    sentinel = self.input
+                    try:
+                        while True:
+                            self.input = oldPosition
+                            try:
+                                val, err = rule()
+                            except _MaybeParseError, e:
+                                self.considerError(e)
+                                break
+                            if val is FAIL:
+                                self.considerError(err)
+                                break
+                            if self.input == sentinel:
+                                break
+                            memoRec = memo[oldPosition] = (self.input, val,
+                                                           err)
+                    finally:
+                        if pinned is not None:
+                            pinned.discard(oldPosition)
+            elif memoRec.__class__ is LeftRecursion:
+                memoRec.detected = True
+                return FAIL, [None, None]
+        except _MaybeParseError, e:
+            return FAIL, e.args
+        self.input = memoRec[0]
+        return memoRec[1:]
+
+
+    def _tryApplyPattern(self, rule, ruleId, args):
+        """
+        L{_applyPattern} for the sentinel failure protocol.
+        """
+        return self._tryApplyArgs(rule, ruleId, args,
+                                  True if self.argumentPassing else None)
+
+
+    def _tryApplyCall(self, rule, ruleId, args):
+        """
+        L{_applyCall} for the sentinel failure protocol.
+        """
+        variant = _tryVariants.get(getattr(rule, 'im_func', None))
+        if variant is not None:
+            rule = MethodType(variant, self)
+        return self._tryApplyArgs(rule, ruleId, args,
+                                  False if self.argumentPassing else None)
+
+
+    def _tryApplyArgs(self, rule, ruleId, args, pushed):
+        """
+        L{_applyArgs} for the sentinel failure protocol.
+        """
+        try:
+            oldPosition = self.input
+            memo = None
+            if ruleId is not None:
+                memo = self._argsMemo(oldPosition, ruleId, args)
+            if memo is None:
+                return self._callWithArgs(rule, args, pushed)
+            memoRec = memo.get(oldPosition)
+            if memoRec is None:
+                memo[oldPosition] = _applying
+                val, err = self._callWithArgs(rule, args, pushed)
+                if val is FAIL:
+                    return val, err
+                memoRec = memo[oldPosition] = (self.input, val, err)
+            elif memoRec.__class__ is LeftRecursion:
+                return FAIL, [None, None]
+        except _MaybeParseError, e:
+            return FAIL, e.args
+        self.input = memoRec[0]
+        return memoRec[1:]
+
+
+    def _memoized(self, ruleId, args):
+        """
+        Return whether applying a rule at the current input would be
+        answered from the memo.
+        @param ruleId: The id of the rule, or C{None} for applications not
+        memoized.
+        """
+        if ruleId is None:
+            return False
+        state = self.input
+        if args:
+            memo = self._argsMemo(state, ruleId, args)
+        else:
+            memo = self._ruleMemo(state, ruleId)
+        return memo is not None and memo.get(state) is not None
+
+
+    def _callTransient(self, rule, ruleId, args):
+        """
+        Call the method of a rule applied without memoization, and raise its
+        failure, whichever failure protocol it follows. Generated code calls
+        transient rules through this method when tracing, and profilers call
+        those it would call directly through it.
+        """
+        val, err = rule(*args)
+        if val is FAIL:
+            raise _MaybeParseError(*err)
+        return val, err
+
+
+    def _tryCallTransient(self, rule, ruleId, args):
+        """
+        L{_callTransient} for the sentinel failure protocol.
+        """
+        try:
+            return rule(*args)
+        except _MaybeParseError, e:
+            return FAIL, e.args
+
+
+    def _traceApply(self, apply, rule, ruleId, args):
+        """
+        Apply a rule with one of the apply primitives, reporting the
+        application to the tracer: C{enter} or C{memoHit} before it, then
+        C{succeed} or C{fail}. Generated code applies rules through this
+        method only in grammars compiled with tracing.
+
+        @param apply: The primitive, such as L{_apply} or L{_tryApply}.
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return apply(rule, ruleId, args)
+        name = rule.__name__
+        if name.startswith('rule_'):
+            name = name[5:]
+        start = self.position
+        if self._memoized(ruleId, args):
+            tracer.memoHit(name, start)
+        else:
+            tracer.enter(name, start)
+        try:
+            ret = apply(rule, ruleId, args)
+        except _MaybeParseError, e:
+            tracer.fail(name, start, e.args[0])
+            raise
+        if ret[0] is FAIL:
+            tracer.fail(name, start, ret[1][0])
+        else:
+            tracer.succeed(name, start, self.position)
+        return ret
+
+
+    def _traceAlternatives(self, fns):
+        """
+        Return the alternatives of an ordered choice, reporting each of them
+        that fails to the tracer as a C{backtrack} to the position it
+        started at. Generated code passes alternatives through this method
+        only in grammars compiled with tracing.
+        """
+        tracer = self.tracer
+        if tracer is None:
+            return fns
+        def traced(index, f):
+            def alternative():
+                start = self.position
+                try:
+                    ret = f()
+                except _MaybeParseError:
+                    tracer.backtrack(start, index)
+                    raise
+                if ret[0] is FAIL:
+                    tracer.backtrack(start, index)
+                return ret
+            return alternative
+        return [traced(i, f) for i, f in enumerate(fns)]
+
+
+    def _raising(self, fn):
+        """
+        Adapt a callable following the sentinel failure protocol to raise
+        L{_MaybeParseError} instead, for the primitives implemented only in
+        terms of exceptions.
+        """
+        def f():
+            ret, err = fn()
+            if ret is FAIL:
+                raise _MaybeParseError(*err)
+            return ret, err
+        return f
 
 
     def rule_anything(self):
         """
         Match a single item from the input of any kind.
         """
-        h, p = self.input.head()
-        self.input = self.input.tail()
-        return h, p
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            self.input = inp.parent
+            return inp.arg, [inp.position, None]
+        try:
+            h = self.data[inp]
+        except IndexError:
+            raise EOFError(inp)
+        self.input = inp + 1
+        if self.characters is not None:
+            h = self.characters[h]
+        return h, [inp, None]
+
+    def tryAnything(self):
+        """
+        L{rule_anything} for the sentinel failure protocol.
+        """
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            self.input = inp.parent
+            return inp.arg, [inp.position, None]
+        try:
+            h = self.data[inp]
+        except IndexError:
+            return FAIL, [inp, eof()]
+        self.input = inp + 1
+        if self.characters is not None:
+            h = self.characters[h]
+        return h, [inp, None]
 
     def exactly(self, wanted):
         """
@@ -378,17 +1734,50 @@ class OMetaBase(object):
 
         @param wanted: What to match.
         """
-        i = self.input
-        val, p = self.input.head()
-        self.input = self.input.tail()
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                raise EOFError(inp)
+            if text[inp] == wanted:
+                self.input = inp + 1
+                return self.characters[text[inp]], [inp, None]
+            if self.diagnostics:
+                raise _MaybeParseError(inp, expected(None, wanted))
+            raise _MaybeParseError(inp, None)
+        val, p = self.head()
         if wanted == val:
+            self.input = self.tail()
             return val, p
-        else:
-            self.input = i
+        elif self.diagnostics:
             raise _MaybeParseError(p[0], expected(None, wanted))
+        else:
+            raise _MaybeParseError(p[0], None)
 
     rule_exactly = exactly
 
+    def tryExactly(self, wanted):
+        """
+        L{exactly} for the sentinel failure protocol.
+        """
+        inp = self.input
+        if inp.__class__ is ArgInput:
+            val, pos, next = inp.arg, inp.position, inp.parent
+        else:
+            try:
+                val = self.data[inp]
+            except IndexError:
+                return FAIL, [inp, eof()]
+            pos, next = inp, inp + 1
+            if self.characters is not None:
+                val = self.characters[val]
+        if wanted == val:
+            self.input = next
+            return val, [pos, None]
+        if self.diagnostics:
+            return FAIL, [pos, expected(None, wanted)]
+        return FAIL, [pos, None]
+
     def many(self, fn, *initial):
         """
         Call C{fn} until it fails to match the input. Collect the resulting
@@ -406,10 +1795,34 @@ class OMetaBase(object):
                 v, _ = fn()
                 ans.append(v)
             except _MaybeParseError, e:
+                self.considerError(e)
                 self.input = m
                 break
         return ans, e
 
+    def tryMany(self, fn, *initial):
+        """
+        L{many} for the sentinel failure protocol. Fails only if one of the
+        C{initial} results is a failure.
+        """
+        ans = []
+        for x, e in initial:
+            if x is FAIL:
+                return x, e
+            ans.append(x)
+        while True:
+            m = self.input
+            try:
+                v, e = fn()
+            except _MaybeParseError, e:
+                v = FAIL
+            if v is FAIL:
+                self.considerError(e)
+                self.input = m
+                break
+            ans.append(v)
+        return ans, e
+
     def _or(self, fns):
         """
         Call each of a list of functions in sequence until one succeeds,
@@ -421,13 +1834,98 @@ class OMetaBase(object):
         for f in fns:
             try:
                 m = self.input
-                ret, err = f()
-                errors.append(err)
-                return ret, joinErrors(errors)
+                return f()
             except _MaybeParseError, e:
+                self.considerError(e)
                 errors.append(e)
                 self.input = m
-        raise _MaybeParseError(*joinErrors(errors))
+        raise _MaybeParseError(*furthestError(errors))
+
+    def _tryOr(self, fns):
+        """
+        L{_or} for the sentinel failure protocol.
+        """
+        errors = []
+        for f in fns:
+            m = self.input
+            try:
+                ret, err = f()
+            except _MaybeParseError, err:
+                ret = FAIL
+            if ret is not FAIL:
+                return ret, err
+            self.considerError(err)
+            errors.append(err)
+            self.input = m
+        return FAIL, furthestError(errors)
+
+    def _dispatch(self, table, fns):
+        """
+        Call the alternatives of an ordered choice like L{_or}, skipping the
+        ones a L{DispatchTable} rules out by the next character of text
+        input.
+
+        The alternatives ruled out could only fail at the current position,
+        without consuming anything. Parsers with diagnostics skip them only
+        when that failure would not be recorded: when a failure farther in
+        the input already was, or inside a negative lookahead. Otherwise
+        they try every alternative, so that their errors tell everything
+        that was expected. Parsers without diagnostics always skip them, and
+        report errors by running again with diagnostics, which gives the
+        same errors.
+
+        @param table: A L{DispatchTable}.
+        @param fns: A list of no-argument callables.
+        """
+        inp = self.input
+        text = self.text
+        if (text is None or inp.__class__ is ArgInput
+            or (self.diagnostics and self.failures.position <= inp
+                and not self.failures.quiet)
+            or not table.validFor(self.__class__)):
+            return self._or(fns)
+        if inp < len(text):
+            alternatives = table.table.get(text[inp], table.default)
+        else:
+            alternatives = table.default
+        if len(alternatives) == 1:
+            try:
+                return fns[alternatives[0]]()
+            except _MaybeParseError, e:
+                self.considerError(e)
+                self.input = inp
+                raise
+        if not alternatives:
+            raise _MaybeParseError(inp, None)
+        return self._or([fns[i] for i in alternatives])
+
+    def _tryDispatch(self, table, fns):
+        """
+        L{_dispatch} for the sentinel failure protocol.
+        """
+        inp = self.input
+        text = self.text
+        if (text is None or inp.__class__ is ArgInput
+            or (self.diagnostics and self.failures.position <= inp
+                and not self.failures.quiet)
+            or not table.validFor(self.__class__)):
+            return self._tryOr(fns)
+        if inp < len(text):
+            alternatives = table.table.get(text[inp], table.default)
+        else:
+            alternatives = table.default
+        if len(alternatives) == 1:
+            try:
+                ret, err = fns[alternatives[0]]()
+            except _MaybeParseError, err:
+                ret = FAIL
+            if ret is FAIL:
+                self.considerError(err)
+                self.input = inp
+            return ret, err
+        if not alternatives:
+            return FAIL, [inp, None]
+        return self._tryOr([fns[i] for i in alternatives])
 
     def _xor(self, fns):
         """
@@ -444,21 +1942,31 @@ class OMetaBase(object):
                 self.input = m
                 ret, err = f()
             except _MaybeParseError, e:
+                self.considerError(e)
                 errors.append(e)
             else:
-                errors.append(err)
                 if ok:
                     self.input = m
-                    raise _MaybeParseError(m.position, [('message', 'xor rule matched %s and %s' % (result, ret))])
+                    raise _MaybeParseError(self.position, [('message', 'xor rule matched %s and %s' % (result, ret))])
                 result = ret
+                result_err = err
                 result_input = self.input
                 ok = True
         if not ok:
             self.input = m
-            raise _MaybeParseError(*joinErrors(errors))
+            raise _MaybeParseError(*furthestError(errors))
         else:
             self.input = result_input
-            return result, joinErrors(errors)
+            return result, result_err
+
+    def _tryXor(self, fns):
+        """
+        L{_xor} for the sentinel failure protocol.
+        """
+        try:
+            return self._xor([self._raising(f) for f in fns])
+        except _MaybeParseError, e:
+            return FAIL, e.args
 
 
     def _not(self, fn):
@@ -468,24 +1976,50 @@ class OMetaBase(object):
         @param fn: A callable of no arguments.
         """
         m = self.input
+        self.failures.quiet += 1
         try:
             fn()
         except _MaybeParseError:
             self.input = m
-            return True, self.input.nullError()
+            return True, self.nullError()
         else:
-            raise _MaybeParseError(*self.input.nullError())
+            raise _MaybeParseError(*self.nullError())
+        finally:
+            self.failures.quiet -= 1
+
+    def _tryNot(self, fn):
+        """
+        L{_not} for the sentinel failure protocol.
+        """
+        m = self.input
+        self.failures.quiet += 1
+        try:
+            ret, err = fn()
+        except _MaybeParseError:
+            ret = FAIL
+        finally:
+            self.failures.quiet -= 1
+        if ret is FAIL:
+            self.input = m
+            return True, self.nullError()
+        return FAIL, [self.position, None]
 
     def eatWhitespace(self):
         """
         Consume input until a non-whitespace character is reached.
         """
         while True:
-            try:
-                c, e = self.input.head()
-            except EOFError, e:
-                break
-            t = self.input.tail()
+            inp = self.input
+            if inp.__class__ is ArgInput:
+                c, e = inp.arg, [inp.position, None]
+                t = inp.parent
+            else:
+                try:
+                    c = self.data[inp]
+                except IndexError:
+                    e = EOFError(inp)
+                    break
+                e, t = [inp, None], inp + 1
             if c.isspace():
                 self.input = t
             else:
@@ -502,10 +2036,26 @@ class OMetaBase(object):
         """
         val, e = expr()
         if not val:
+            if e is None:
+                raise _MaybeParseError(self.position, None)
             raise _MaybeParseError(*e)
         else:
             return True, e
 
+    def tryPred(self, expr):
+        """
+        L{pred} for the sentinel failure protocol.
+        """
+        try:
+            val, e = expr()
+        except _MaybeParseError, e:
+            return FAIL, e.args
+        if val is FAIL:
+            return FAIL, e
+        if not val:
+            return FAIL, e or [self.position, None]
+        return True, e
+
     def listpattern(self, expr):
         """
         Call the given function, treating the next object on the stack as an
@@ -515,13 +2065,55 @@ class OMetaBase(object):
         """
         v, e = self.rule_anything()
         oldInput = self.input
+        oldData, oldBasetype = self.data, self.basetype
+        oldMemo, oldArgMemo = self.memo, self.argMemo
+        oldText, oldCharacters = self.text, self.characters
+        oldPolicy = self.memoPolicy
         try:
-            self.input = InputStream.fromIterable(v)
+            stream = InputStream.fromIterable(v)
         except TypeError:
-            raise _MaybeParseError(*(tuple(e)[:1] + tuple(expected("an iterable"))))
-        expr()
-        self.end()
-        self.input = oldInput
+            raise _MaybeParseError(self.position, expected("an iterable"))
+        self._setInput(stream)
+        try:
+            expr()
+            self.end()
+        finally:
+            self.data, self.basetype = oldData, oldBasetype
+            self.memo, self.argMemo = oldMemo, oldArgMemo
+            self.text, self.characters = oldText, oldCharacters
+            self.memoPolicy = oldPolicy
+            self.input = oldInput
+        return v, e
+
+    def tryListpattern(self, expr):
+        """
+        L{listpattern} for the sentinel failure protocol.
+        """
+        v, e = self.tryAnything()
+        if v is FAIL:
+            return v, e
+        oldInput = self.input
+        oldData, oldBasetype = self.data, self.basetype
+        oldMemo, oldArgMemo = self.memo, self.argMemo
+        oldText, oldCharacters = self.text, self.characters
+        oldPolicy = self.memoPolicy
+        try:
+            stream = InputStream.fromIterable(v)
+        except TypeError:
+            return FAIL, [self.position, expected("an iterable")]
+        self._setInput(stream)
+        try:
+            ret, err = expr()
+            if ret is not FAIL:
+                ret, err = self.tryEnd()
+        finally:
+            self.data, self.basetype = oldData, oldBasetype
+            self.memo, self.argMemo = oldMemo, oldArgMemo
+            self.text, self.characters = oldText, oldCharacters
+            self.memoPolicy = oldPolicy
+            self.input = oldInput
+        if ret is FAIL:
+            return ret, err
         return v, e
 
 
@@ -533,6 +2125,12 @@ class OMetaBase(object):
 
     rule_end = end
 
+    def tryEnd(self):
+        """
+        L{end} for the sentinel failure protocol.
+        """
+        return self._tryNot(self.tryAnything)
+
     def lookahead(self, f):
         """
         Execute the given callable, rewinding the stream no matter whether it
@@ -553,6 +2151,9 @@ class OMetaBase(object):
         Match and return the given string.
         """
         m = self.input
+        if self.text is not None and m.__class__ is not ArgInput:
+            return self._matchText(tok, "string")
+        e = [self.position, None]
         try:
             for c in tok:
                 v, e = self.exactly(c)
@@ -562,13 +2163,105 @@ class OMetaBase(object):
             raise _MaybeParseError(e[0], expected("string", tok))
     rule_match_string = match_string
 
+    def tryMatchString(self, tok):
+        """
+        L{match_string} for the sentinel failure protocol.
+        """
+        m = self.input
+        if self.text is not None and m.__class__ is not ArgInput:
+            return self._tryMatchText(tok, "string")
+        e = [self.position, None]
+        for c in tok:
+            v, e = self.tryExactly(c)
+            if v is FAIL:
+                self.input = m
+                return FAIL, [e[0], expected("string", tok)]
+        return tok, e
+
+    def matchCharacters(self, tok):
+        """
+        Match the characters of a string one after the other, as a sequence
+        of L{exactly} does, with a single comparison on text input. A
+        failure is the one L{exactly} reports for the first character that
+        differs.
+        """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            position = mismatch(text, tok, inp)
+            if position is None:
+                self.input = inp + len(tok)
+                return tok, [self.input - 1, None]
+            self.input = position
+            try:
+                self.exactly(tok[position - inp])
+            finally:
+                self.input = inp
+        for c in tok:
+            v, e = self.exactly(c)
+        return tok, e
+
+    def tryMatchCharacters(self, tok):
+        """
+        L{matchCharacters} for the sentinel failure protocol.
+        """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            position = mismatch(text, tok, inp)
+            if position is None:
+                self.input = inp + len(tok)
+                return tok, [self.input - 1, None]
+            self.input = position
+            v, e = self.tryExactly(tok[position - inp])
+            self.input = inp
+            return v, e
+        for c in tok:
+            v, e = self.tryExactly(c)
+            if v is FAIL:
+                return v, e
+        return tok, e
+
+    def _matchText(self, tok, kind):
+        """
+        Match a string against the text input with a single comparison.
+        Errors are the ones matching each character with L{exactly} leads
+        to.
+
+        @param kind: The kind of string expected, for the error.
+        """
+        inp = self.input
+        position = mismatch(self.text, tok, inp)
+        if position is not None:
+            raise _MaybeParseError(position, expected(kind, tok))
+        self.input = inp + len(tok)
+        return tok, [max(inp, self.input - 1), None]
+
+    def _tryMatchText(self, tok, kind):
+        """
+        L{_matchText} for the sentinel failure protocol.
+        """
+        inp = self.input
+        position = mismatch(self.text, tok, inp)
+        if position is not None:
+            return FAIL, [position, expected(kind, tok)]
+        self.input = inp + len(tok)
+        return tok, [max(inp, self.input - 1), None]
+
     def token(self, tok):
         """
         Match and return the given string, consuming any preceding whitespace.
         """
         m = self.input
+        self.eatWhitespace()
+        if self.text is not None and self.input.__class__ is not ArgInput:
+            try:
+                return self._matchText(tok, "token")
+            except _MaybeParseError:
+                self.input = m
+                raise
+        e = [self.position, None]
         try:
-            self.eatWhitespace()
             for c in tok:
                 v, e = self.exactly(c)
             return tok, e
@@ -578,10 +2271,39 @@ class OMetaBase(object):
 
     rule_token = token
 
+    def tryToken(self, tok):
+        """
+        L{token} for the sentinel failure protocol.
+        """
+        m = self.input
+        self.eatWhitespace()
+        if self.text is not None and self.input.__class__ is not ArgInput:
+            v, e = self._tryMatchText(tok, "token")
+            if v is FAIL:
+                self.input = m
+            return v, e
+        e = [self.position, None]
+        for c in tok:
+            v, e = self.tryExactly(c)
+            if v is FAIL:
+                self.input = m
+                return FAIL, [e[0], expected("token", tok)]
+        return tok, e
+
     def letter(self):
         """
         Match a single letter.
         """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                raise EOFError(inp)
+            x = text[inp]
+            if x.isalpha():
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            raise _MaybeParseError(inp, expected("letter"))
         x, e = self.rule_anything()
         if x.isalpha():
             return x, e
@@ -591,10 +2313,40 @@ class OMetaBase(object):
 
     rule_letter = letter
 
+    def tryLetter(self):
+        """
+        L{letter} for the sentinel failure protocol.
+        """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                return FAIL, [inp, eof()]
+            x = text[inp]
+            if x.isalpha():
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            return FAIL, [inp, expected("letter")]
+        x, e = self.tryAnything()
+        if x is FAIL or x.isalpha():
+            return x, e
+        e[1] = expected("letter")
+        return FAIL, e
+
     def letterOrDigit(self):
         """
         Match a single alphanumeric character.
         """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                raise EOFError(inp)
+            x = text[inp]
+            if x.isalnum() or x == '_':
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            raise _MaybeParseError(inp, expected("letter or digit"))
         x, e = self.rule_anything()
         if x.isalnum() or x == '_':
             return x, e
@@ -604,10 +2356,40 @@ class OMetaBase(object):
 
     rule_letterOrDigit = letterOrDigit
 
+    def tryLetterOrDigit(self):
+        """
+        L{letterOrDigit} for the sentinel failure protocol.
+        """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                return FAIL, [inp, eof()]
+            x = text[inp]
+            if x.isalnum() or x == '_':
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            return FAIL, [inp, expected("letter or digit")]
+        x, e = self.tryAnything()
+        if x is FAIL or x.isalnum() or x == '_':
+            return x, e
+        e[1] = expected("letter or digit")
+        return FAIL, e
+
     def digit(self):
         """
         Match a single digit.
         """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                raise EOFError(inp)
+            x = text[inp]
+            if x.isdigit():
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            raise _MaybeParseError(inp, expected("digit"))
         x, e = self.rule_anything()
         if x.isdigit():
             return x, e
@@ -617,28 +2399,76 @@ class OMetaBase(object):
 
     rule_digit = digit
 
+    def tryDigit(self):
+        """
+        L{digit} for the sentinel failure protocol.
+        """
+        inp = self.input
+        text = self.text
+        if text is not None and inp.__class__ is not ArgInput:
+            if inp >= len(text):
+                return FAIL, [inp, eof()]
+            x = text[inp]
+            if x.isdigit():
+                self.input = inp + 1
+                return self.characters[x], [inp, None]
+            return FAIL, [inp, expected("digit")]
+        x, e = self.tryAnything()
+        if x is FAIL or x.isdigit():
+            return x, e
+        e[1] = expected("digit")
+        return FAIL, e
+
     def consumed_by(self, f):
         """
             Try to parse f, if successful return the full string matching it
         """
-        m = self.input
+        start = self.position
+        r = f()
+        return self.data[start:self.position], r[1]
+
+    def tryConsumedBy(self, f):
+        """
+        L{consumed_by} for the sentinel failure protocol.
+        """
+        start = self.position
         r = f()
-        consumed = m.data[m.position:self.input.position]
-        if m.basetype in (str, unicode):
-            consumed = ''.join(consumed)
-        return consumed, r[1]
+        if r[0] is FAIL:
+            return r
+        return self.data[start:self.position], r[1]
 
     def index_consumed_by(self, f):
         """
             Try to parse f, if successful return the start and end offset of
             the full string matching it.
         """
-        m = self.input
+        start = self.position
+        r = f()
+        return [start, self.position], r[1]
+
+    def tryIndexConsumedBy(self, f):
+        """
+        L{index_consumed_by} for the sentinel failure protocol.
+        """
+        start = self.position
         r = f()
-        return [m.position, self.input.position], r[1]
+        if r[0] is FAIL:
+            return r
+        return [start, self.position], r[1]
 
     def range(self, c1, c2):
+        """
+        Match a single item between C{c1} and C{c2}, inclusive.
+        """
         m = self.input
+        text = self.text
+        if text is not None and m.__class__ is not ArgInput:
+            if m >= len(text):
+                raise EOFError(m)
+            if c1 <= text[m] <= c2:
+                self.input = m + 1
+                return self.characters[text[m]], [m, None]
+            raise _MaybeParseError(m, expected('range between %r and %r' % (c1, c2)))
         x, e = self.rule_anything()
         if c1 <= x <= c2:
             return x, e
@@ -647,6 +2477,28 @@ class OMetaBase(object):
             e[1] = expected('range between %r and %r' % (c1, c2))
             raise _MaybeParseError(*e)
 
+    def tryRange(self, c1, c2):
+        """
+        L{range} for the sentinel failure protocol.
+        """
+        m = self.input
+        text = self.text
+        if text is not None and m.__class__ is not ArgInput:
+            if m >= len(text):
+                return FAIL, [m, eof()]
+            if c1 <= text[m] <= c2:
+                self.input = m + 1
+                return self.characters[text[m]], [m, None]
+            return FAIL, [m, expected('range between %r and %r' % (c1, c2))]
+        x, e = self.tryAnything()
+        if x is FAIL:
+            return x, e
+        if c1 <= x <= c2:
+            return x, e
+        self.input = m
+        e[1] = expected('range between %r and %r' % (c1, c2))
+        return FAIL, e
+
     def _interleave(self, _locals, *args):
         """
         Call each of a list of functions in sequence until all succeed at least
@@ -664,6 +2516,7 @@ class OMetaBase(object):
         # tries for as long it matches
         last_match = None
         while True:
+            errors = []
             for idx in range(0, len(args), 3):
                 mod, fun, name = args[idx:idx+3]
                 if mod != '0':
@@ -680,11 +2533,12 @@ class OMetaBase(object):
                             args[idx] = '0'
                         else:
                             raise ValueError('invalid mode in OMeta._interleave')
-                        errors.append(e)
                         currInput = self.input
                         last_match = e
                         break
                     except _MaybeParseError, e:
+                        self.considerError(e)
+                        errors.append(e)
                         self.input = currInput
             else:
                 break
@@ -697,7 +2551,19 @@ class OMetaBase(object):
                 if name:
                     _locals[name] = ans[idx/3]
             return ans, last_match
-        raise _MaybeParseError(args, *joinErrors(errors))
+        raise _MaybeParseError(*furthestError(errors))
+
+    def _tryInterleave(self, _locals, *args):
+        """
+        L{_interleave} for the sentinel failure protocol.
+        """
+        args = list(args)
+        for idx in range(1, len(args), 3):
+            args[idx] = self._raising(args[idx])
+        try:
+            return self._interleave(_locals, *args)
+        except _MaybeParseError, e:
+            return FAIL, e.args
 
     def pythonExpr(self, endChars="\r\n"):
         """
@@ -725,7 +2591,7 @@ class OMetaBase(object):
                 elif len(stack) > 0 and c == stack[-1]:
                     stack.pop()
                 elif c in delimiters.values():
-                    raise _MaybeParseError(self.input.position,
+                    raise _MaybeParseError(self.position,
                                            expected("Python expression"))
                 elif c in "\"'":
                     while True:
@@ -740,5 +2606,26 @@ class OMetaBase(object):
                             break
 
         if len(stack) > 0:
-            raise _MaybeParseError(self.input.position, expected("Python expression"))
+            raise _MaybeParseError(self.position, expected("Python expression"))
         return (''.join(expr).strip(), endchar), e
+
+
+# The built-in rules replaced by _tryApply with their variants following the
+# sentinel failure protocol, unless a grammar overrides them.
+_tryVariants = dict((getattr(OMetaBase, name).im_func,
+                     getattr(OMetaBase, variant).im_func)
+                    for name, variant in [
+                        ('rule_anything', 'tryAnything'),
+                        ('rule_exactly', 'tryExactly'),
+                        ('rule_end', 'tryEnd'),
+                        ('rule_match_string', 'tryMatchString'),
+                        ('rule_token', 'tryToken'),
+                        ('rule_letter', 'tryLetter'),
+                        ('rule_letterOrDigit', 'tryLetterOrDigit'),
+                        ('rule_digit', 'tryDigit'),
+                        ])
+
+# The built-in rules taking one Python argument, which the grammar compiler
+# calls with it directly, see L{pymeta.analysis.ARGUMENT_RULES}.
+_argumentRules = ["rule_" + name for name in (
+        "exactly", "match_string", "token")]
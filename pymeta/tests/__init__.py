@@ -1,4 +1,14 @@
+from .test_analysis import AnalysisTests
+from .test_batch import BatchTests
 from .test_builder import PythonWriterTests
+from .test_cache import GrammarCacheTests
+from .test_compiler import CompilerTests
+from .test_incremental import IncrementalTests
+from .test_optimizer import OptimizerTests
+from .test_profiler import ProfilerTests
 from .test_pymeta import (HandyWrapper, MakeGrammarTest, NullOptimizerTest, 
-    OMetaTestCase, PyExtractorTest, SelfHostingTest)
+    OMetaTestCase, PyExtractorTest, SelfHostingTest, MemoPolicyTest,
+    GeneratedRulesTest, SentinelTest, DispatchTest, InlineTest,
+    LeftRecursionTest, DiagnosticsTest)
 from .test_runtime import RuntimeTests
+from .test_trace import TraceTests
@@ -0,0 +1,167 @@
+from pymeta.analysis import (ANY, FirstSets, dispatchTable, inlinableRules,
+    leftRecursiveRules, nullableRules, recursiveRules, transientRules,
+    treeSize, whitespace)
+from pymeta.builder import TreeBuilder
+from pymeta.grammar import OMetaGrammar
+from textwrap import dedent
+import unittest
+
+class AnalysisTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.analysis}.
+    """
+
+    def rules(self, grammar):
+        """
+        Parse a grammar and return its list of C{Rule} nodes.
+        """
+        g = OMetaGrammar(dedent(grammar))
+        return g.parseGrammar('TestGrammar', TreeBuilder)[2]
+
+
+    def test_treeSize(self):
+        """
+        L{treeSize} counts the nodes of a rule body, ignoring the sequence
+        wrappers added by the grammar parser.
+        """
+        [rule] = self.rules("hspace = ' ' | '\\t'")
+        self.assertEqual(treeSize(rule[2]), 3)
+
+
+    def test_recursiveRules(self):
+        """
+        L{recursiveRules} finds rules that apply themselves, directly or
+        through other rules.
+        """
+        rules = self.rules("""
+            a = b | 'x'
+            b = '(' a ')'
+            c = c 'y' | 'y'
+            d = a c
+        """)
+        self.assertEqual(recursiveRules(rules), set(['a', 'b', 'c']))
+
+
+    def test_nullableRules(self):
+        """
+        L{nullableRules} finds the rules that might match without consuming
+        input.
+        """
+        rules = self.rules("""
+            a = 'x'?
+            b = a token("y")
+            c = a token("")
+            d = a letter
+            e = a spaces
+            f = a c
+            g = a other
+            h = a g(1)
+        """)
+        self.assertEqual(nullableRules(rules),
+                         set(['a', 'c', 'e', 'f', 'g', 'h']))
+
+
+    def test_leftRecursiveRules(self):
+        """
+        L{leftRecursiveRules} finds the rules that can be applied again
+        before consuming input, directly or through other rules, or might
+        be through rules defined outside the grammar.
+        """
+        rules = self.rules("""
+            expr = expr '+' term | term
+            term = factor ('*' factor)*
+            factor = '(' expr ')' | digit
+            a = b 'x' | 'y'
+            b = 'z'? a
+            c = spaces b
+            d = other
+            e = super
+            f = g(1)
+            g :x = f
+            h = [h]
+        """)
+        self.assertEqual(leftRecursiveRules(rules),
+                         set(['expr', 'a', 'b', 'd', 'e', 'f', 'g']))
+
+
+    def test_transientRules(self):
+        """
+        Small non-recursive rules without repetition are transient unless
+        annotated C{@memo}; C{@transient} overrides the heuristic.
+        """
+        rules = self.rules("""
+            digit = '0' | '1'
+            @memo
+            letter = 'a' | 'b'
+            digits = digit*
+            @transient
+            number = digits:ds -> int(''.join(ds))
+            expr = number '+' expr | number
+        """)
+        self.assertEqual(transientRules(rules), set(['digit', 'number']))
+
+
+    def test_inlinableRules(self):
+        """
+        Transient rules that need no scope of their own can be inlined,
+        unless annotated C{@noinline} or able to apply themselves.
+        """
+        rules = self.rules("""
+            hspace = ' ' | '\\t'
+            @noinline
+            vspace = '\\n'
+            @memo
+            dot = '.'
+            digit = :x ?(x.isdigit()) -> x
+            sign = '-' | super
+            number = digit+
+            pair = hspace dot
+            parens = '(' parens ')' | 'x'
+        """)
+        self.assertEqual(inlinableRules(rules), set(['hspace', 'pair']))
+
+
+    def test_firstSets(self):
+        """
+        L{FirstSets} finds the characters each rule can begin with, and
+        whether it can match without consuming input.
+        """
+        first = FirstSets(self.rules("""
+            sign = ('-' | '+')?
+            digit = '0'..'9'
+            number = sign digit+
+            word = "if" | token("else")
+            any = letter | digit
+            action = !(None) 'a'
+            not = ~'a' 'b'
+            args :x = 'a'
+        """)).rules
+        self.assertEqual(first['sign'], (frozenset('-+'), True))
+        self.assertEqual(first['digit'], (frozenset('0123456789'), False))
+        self.assertEqual(first['number'], (frozenset('-+0123456789'), False))
+        self.assertEqual(first['word'], (whitespace() | frozenset('ie'), False))
+        self.assertEqual(first['any'], (ANY, False))
+        self.assertEqual(first['action'], (ANY, False))
+        self.assertEqual(first['not'], (frozenset('b'), False))
+        self.assertEqual(first['args'], (ANY, False))
+
+
+    def test_dispatchTable(self):
+        """
+        L{dispatchTable} maps characters to the alternatives of a choice
+        that can begin with them, keeping alternatives that can begin with
+        anything or with nothing for every character, and lists the methods
+        that depends on.
+        """
+        rules = self.rules("""
+            start = a | 'b' | letter | 'a'?
+            a = 'a'
+        """)
+        first = FirstSets(rules)
+        choice = rules[0][2][2]
+        self.assertEqual(choice[0], "Or")
+        table, default, methods = dispatchTable(first, choice[1:])
+        self.assertEqual(table, {'a': (0, 2, 3), 'b': (1, 2, 3)})
+        self.assertEqual(default, (2, 3))
+        self.assertEqual(methods, ['exactly', 'rule_a', 'tryExactly'])
+        self.assertEqual(dispatchTable(first, choice[3:]), None)
@@ -0,0 +1,73 @@
+from pymeta.batch import defineGrammar, grammarDefinition
+from pymeta.grammar import OMeta
+from pymeta.runtime import ParseError
+from textwrap import dedent
+import pickle, unittest
+
+
+class BatchTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.batch}.
+    """
+
+    grammar = """
+    num = <digit+>:d -> int(d)
+    grammar = num:a (',' num)*:bs end -> scale * (a + sum(bs))
+    """
+
+    def setUp(self):
+        self.klass = OMeta.makeGrammar(dedent(self.grammar), {'scale': 2},
+                                       name="Batch")
+
+    def test_definition(self):
+        """
+        The definition of a grammar made by L{OMeta.makeGrammar} can be
+        pickled, and gives back an equivalent class.
+        """
+        sub = self.klass.makeGrammar("grammar = num:a end -> -a", {},
+                                     name="BatchSub")
+        definition = pickle.loads(pickle.dumps(grammarDefinition(sub)))
+        self.assertTrue(definition[2][2] is OMeta)
+        klass = defineGrammar(definition)
+        self.assertEqual(klass("12").apply("grammar")[0], -12)
+        self.assertEqual(klass.__mro__[1]("1,2").apply("grammar")[0], 6)
+
+    def test_parseMany(self):
+        """
+        L{OMeta.parseMany} yields the value or the error of each document,
+        in order, whether documents are parsed by workers or in this
+        process.
+        """
+        documents = ["1,2", "x", "3"] * 50
+        for workers in (1, 3):
+            results = list(self.klass.parseMany(documents, workers=workers,
+                                                chunkSize=4))
+            self.assertEqual(len(results), 150)
+            self.assertEqual(results[0], (6, None))
+            self.assertEqual(results[149], (6, None))
+            value, error = results[148]
+            self.assertEqual(value, None)
+            self.assertTrue(isinstance(error, ParseError))
+            self.assertTrue("Parse error at line 1, column 0" in str(error))
+
+    def test_encodedDocuments(self):
+        """
+        Byte string documents are decoded as UTF-8 and their errors
+        formatted as by L{OMetaBase.parse}.
+        """
+        klass = self.klass.makeGrammar("chars = anything*:cs end -> len(cs)",
+                                       {}, name="BatchChars")
+        documents = ["caf\xc3\xa9", "1,\xc3\xa9"]
+        for workers in (1, 2):
+            results = list(klass.parseMany(documents, workers=workers,
+                                           rule="chars"))
+            self.assertEqual(results[0], (4, None))
+            results = list(klass.parseMany(documents, workers=workers))
+            self.assertEqual(results[1][0], None)
+            try:
+                klass.parse(documents[1])
+            except ParseError, e:
+                self.assertEqual(results[1][1].args, e.args)
+                self.assertTrue(u"1,\xe9" in e.args[0])
+            else:
+                self.fail("no error raised")
@@ -5,8 +5,8 @@ import unittest
 def dd(txt):
     return dedent(txt).strip()
 
-def writePython(tree):
-    return writePython_orig(tree).strip()
+def writePython(tree, sentinel=False):
+    return writePython_orig(tree, sentinel).strip()
 
 class PythonWriterTests(unittest.TestCase):
     """
@@ -29,7 +29,6 @@ class PythonWriterTests(unittest.TestCase):
         self.assertEqual(writePython(x),
                          dd("""
                             _G_exactly_1, lastError = self.exactly('x')
-                            self.considerError(lastError)
                             _G_exactly_1
                             """))
 
@@ -45,13 +44,13 @@ class PythonWriterTests(unittest.TestCase):
         a = self.builder.apply("foo", "main", one, x)
         self.assertEqual(writePython(a),
             dd("""
-               _G_python_1, lastError = eval('1', self.globals, _locals), None
-               self.considerError(lastError)
-               _G_python_2, lastError = eval('x', self.globals, _locals), None
-               self.considerError(lastError)
+               _G_rule_foo = GrammarBase.ruleId('foo')
+               _G_expr_1 = compile('1', '<string>', 'eval')
+               _G_expr_2 = compile('x', '<string>', 'eval')
+               _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
+               _G_python_2, lastError = eval(_G_expr_2, self.globals, _locals), None
                _G_apply_3, lastError = self._apply("""
-                    """self.rule_foo, "foo", [_G_python_1, _G_python_2])
-               self.considerError(lastError)
+                    """self.rule_foo, _G_rule_foo, [_G_python_1, _G_python_2])
                _G_apply_3
                """))
 
@@ -67,12 +66,11 @@ class PythonWriterTests(unittest.TestCase):
         a = self.builder.apply("super", "main", one, x)
         self.assertEqual(writePython(a),
             dd("""
-               _G_python_1, lastError = eval('1', self.globals, _locals), None
-               self.considerError(lastError)
-               _G_python_2, lastError = eval('x', self.globals, _locals), None
-               self.considerError(lastError)
+               _G_expr_1 = compile('1', '<string>', 'eval')
+               _G_expr_2 = compile('x', '<string>', 'eval')
+               _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
+               _G_python_2, lastError = eval(_G_expr_2, self.globals, _locals), None
                _G_apply_3, lastError = self.superApply("main", _G_python_1, _G_python_2)
-               self.considerError(lastError)
                _G_apply_3
                """))
 
@@ -88,10 +86,8 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_many_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_many_2, lastError = self.many(_G_many_1)
-                            self.considerError(lastError)
                             _G_many_2
                             """))
 
@@ -107,10 +103,8 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_many1_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_many1_2, lastError = self.many(_G_many1_1, _G_many1_1())
-                            self.considerError(lastError)
                             _G_many1_2
                             """))
 
@@ -127,14 +121,11 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_or_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             def _G_or_2():
                                 _G_exactly_1, lastError = self.exactly('y')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_or_3, lastError = self._or([_G_or_1, _G_or_2])
-                            self.considerError(lastError)
                             _G_or_3
                             """))
 
@@ -157,12 +148,10 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_optional_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             def _G_optional_2():
-                                return (None, self.input.nullError())
+                                return (None, None)
                             _G_or_3, lastError = self._or([_G_optional_1, _G_optional_2])
-                            self.considerError(lastError)
                             _G_or_3
                             """))
 
@@ -176,10 +165,8 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_not_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_not_2, lastError = self._not(_G_not_1)
-                            self.considerError(lastError)
                             _G_not_2
                             """))
 
@@ -193,10 +180,8 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_lookahead_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_lookahead_2, lastError = self.lookahead(_G_lookahead_1)
-                            self.considerError(lastError)
                             _G_lookahead_2
                             """))
 
@@ -212,9 +197,7 @@ class PythonWriterTests(unittest.TestCase):
         self.assertEqual(writePython(z),
                          dd("""
                             _G_exactly_1, lastError = self.exactly('x')
-                            self.considerError(lastError)
                             _G_exactly_2, lastError = self.exactly('y')
-                            self.considerError(lastError)
                             _G_exactly_2
                             """))
 
@@ -228,7 +211,6 @@ class PythonWriterTests(unittest.TestCase):
         self.assertEqual(writePython(b),
                          dd("""
                             _G_exactly_1, lastError = self.exactly('x')
-                            self.considerError(lastError)
                             _locals['var'] = _G_exactly_1
                             _locals['var']
                             """))
@@ -243,10 +225,8 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             def _G_pred_1():
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             _G_pred_2, lastError = self.pred(_G_pred_1)
-                            self.considerError(lastError)
                             _G_pred_2
                             """))
 
@@ -258,8 +238,8 @@ class PythonWriterTests(unittest.TestCase):
         x = self.builder.action("doStuff()")
         self.assertEqual(writePython(x),
             dd("""
-               _G_python_1, lastError = eval('doStuff()', self.globals, _locals), None
-               self.considerError(lastError)
+               _G_expr_1 = compile('doStuff()', '<string>', 'eval')
+               _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
                _G_python_1
                """))
 
@@ -271,12 +251,34 @@ class PythonWriterTests(unittest.TestCase):
         x = self.builder.expr("returnStuff()")
         code = dd(
             """
-            _G_python_1, lastError = eval('returnStuff()', self.globals, _locals), None
-            self.considerError(lastError)
+            _G_expr_1 = compile('returnStuff()', '<string>', 'eval')
+            _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
             _G_python_1
             """)
         self.assertEqual(writePython(x), code)
 
+    def test_exprShared(self):
+        """
+        Each distinct embedded expression is compiled once, at module level,
+        even when it is used from several nested functions.
+        """
+        x = self.builder.sequence([
+                self.builder.expr("x"),
+                self.builder.many(self.builder.expr("x")),
+                self.builder.expr("y")])
+        self.assertEqual(writePython(x),
+            dd("""
+               _G_expr_1 = compile('x', '<string>', 'eval')
+               _G_expr_2 = compile('y', '<string>', 'eval')
+               _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
+               def _G_many_2():
+                   _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
+                   return (_G_python_1, None)
+               _G_many_3, lastError = self.many(_G_many_2)
+               _G_python_4, lastError = eval(_G_expr_2, self.globals, _locals), None
+               _G_python_4
+               """))
+
     def test_listpattern(self):
         """
         Test code generation for list patterns.
@@ -286,10 +288,8 @@ class PythonWriterTests(unittest.TestCase):
             dd("""
                def _G_listpattern_1():
                    _G_exactly_1, lastError = self.exactly('x')
-                   self.considerError(lastError)
-                   return (_G_exactly_1, self.currentError)
+                   return (_G_exactly_1, None)
                _G_listpattern_2, lastError = self.listpattern(_G_listpattern_1)
-               self.considerError(lastError)
                _G_listpattern_2
                """))
 
@@ -302,10 +302,8 @@ class PythonWriterTests(unittest.TestCase):
             dd("""
                def _G_consumed_by_1():
                    _G_exactly_1, lastError = self.exactly('x')
-                   self.considerError(lastError)
-                   return (_G_exactly_1, self.currentError)
+                   return (_G_exactly_1, None)
                _G_consumed_by_2, lastError = self.consumed_by(_G_consumed_by_1)
-               self.considerError(lastError)
                _G_consumed_by_2
                """))
 
@@ -318,10 +316,8 @@ class PythonWriterTests(unittest.TestCase):
             dd("""
                def _G_consumed_by_1():
                    _G_exactly_1, lastError = self.exactly('x')
-                   self.considerError(lastError)
-                   return (_G_exactly_1, self.currentError)
+                   return (_G_exactly_1, None)
                _G_consumed_by_2, lastError = self.consumed_by(_G_consumed_by_1)
-               self.considerError(lastError)
                _G_consumed_by_2
                """))
 
@@ -334,14 +330,11 @@ class PythonWriterTests(unittest.TestCase):
             dd("""
                def _G_interleave_1():
                    _G_exactly_1, lastError = self.exactly('x')
-                   self.considerError(lastError)
-                   return (_G_exactly_1, self.currentError)
+                   return (_G_exactly_1, None)
                def _G_interleave_2():
                    _G_exactly_1, lastError = self.exactly('y')
-                   self.considerError(lastError)
-                   return (_G_exactly_1, self.currentError)
+                   return (_G_exactly_1, None)
                _G_interleave_3, lastError = self._interleave(_locals, '1', _G_interleave_1, None, '1', _G_interleave_2, None)
-               self.considerError(lastError)
                _G_interleave_3
                """))
 
@@ -357,8 +350,7 @@ class PythonWriterTests(unittest.TestCase):
                                 _locals = {'self': self}
                                 self.locals['foo'] = _locals
                                 _G_exactly_1, lastError = self.exactly('x')
-                                self.considerError(lastError)
-                                return (_G_exactly_1, self.currentError)
+                                return (_G_exactly_1, None)
                             """))
 
 
@@ -373,18 +365,189 @@ class PythonWriterTests(unittest.TestCase):
                          dd("""
                             class BuilderTest(GrammarBase):
                                 globals = globals()
+                                leftRecursiveRules = []
                                 def rule_foo(self):
                                     _locals = {'self': self}
                                     self.locals['foo'] = _locals
                                     _G_exactly_1, lastError = self.exactly('x')
-                                    self.considerError(lastError)
-                                    return (_G_exactly_1, self.currentError)
+                                    return (_G_exactly_1, None)
 
 
                                 def rule_baz(self):
                                     _locals = {'self': self}
                                     self.locals['baz'] = _locals
                                     _G_exactly_1, lastError = self.exactly('y')
-                                    self.considerError(lastError)
-                                    return (_G_exactly_1, self.currentError)
+                                    return (_G_exactly_1, None)
+                            """))
+
+
+    def test_transientApply(self):
+        """
+        Rules marked transient are applied with a direct call, without going
+        through the memo table, unless a subclass overrides them.
+        """
+        r1 = self.builder.rule("foo", self.builder.exactly("x"), ["transient"])
+        r2 = self.builder.rule("baz", self.builder.apply("foo", "BuilderTest"))
+        x = self.builder.makeGrammar([r1, r2])
+        self.assertEqual(writePython(x),
+                         dd("""
+                            _G_rule_foo = GrammarBase.ruleId('foo')
+                            class BuilderTest(GrammarBase):
+                                globals = globals()
+                                directRules = ['foo']
+                                leftRecursiveRules = []
+                                def rule_foo(self):
+                                    _locals = {'self': self}
+                                    self.locals['foo'] = _locals
+                                    _G_exactly_1, lastError = self.exactly('x')
+                                    return (_G_exactly_1, None)
+
+
+                                def rule_baz(self):
+                                    _locals = {'self': self}
+                                    self.locals['baz'] = _locals
+                                    if self.directCalls:
+                                        _G_apply_1, lastError = self.rule_foo()
+                                    else:
+                                        _G_apply_1, lastError = self._apply(self.rule_foo, _G_rule_foo, [])
+                                    return (_G_apply_1, None)
+                            """))
+
+
+    def test_argumentApply(self):
+        """
+        Rules of the grammar applied with arguments get them pushed in front
+        of the input, and the built-in rules taking Python arguments are
+        called with them, without looking at the rule's signature.
+        """
+        r1 = self.builder.rule("foo", self.builder.apply("anything",
+                                                         "BuilderTest"))
+        r2 = self.builder.rule("baz", self.builder.sequence([
+                    self.builder.apply("foo", "BuilderTest",
+                                       self.builder.expr("1")),
+                    self.builder.apply("token", "BuilderTest",
+                                       self.builder.expr("x"))]))
+        x = self.builder.makeGrammar([r1, r2])
+        self.assertEqual(writePython(x),
+                         dd("""
+                            _G_rule_anything = GrammarBase.ruleId('anything')
+                            _G_rule_token = GrammarBase.ruleId('token')
+                            _G_expr_1 = compile('1', '<string>', 'eval')
+                            _G_expr_2 = compile('x', '<string>', 'eval')
+                            class BuilderTest(GrammarBase):
+                                globals = globals()
+                                leftRecursiveRules = []
+                                def rule_foo(self):
+                                    _locals = {'self': self}
+                                    self.locals['foo'] = _locals
+                                    _G_apply_1, lastError = self._apply(self.rule_anything, _G_rule_anything, [])
+                                    return (_G_apply_1, None)
+
+
+                                def rule_baz(self):
+                                    _locals = {'self': self}
+                                    self.locals['baz'] = _locals
+                                    _G_python_1, lastError = eval(_G_expr_1, self.globals, _locals), None
+                                    _G_apply_2, lastError = self._applyPattern(self.rule_foo, None, [_G_python_1])
+                                    _G_python_3, lastError = eval(_G_expr_2, self.globals, _locals), None
+                                    _G_apply_4, lastError = self._applyCall(self.rule_token, _G_rule_token, [_G_python_3])
+                                    return (_G_apply_4, None)
+                            """))
+
+
+    def test_dispatch(self):
+        """
+        Ordered choices whose alternatives can be told apart by the next
+        input character call C{_dispatch} with a table of the alternatives
+        to try, defined after the grammar class.
+        """
+        r = self.builder.rule("foo", self.builder._or([
+                    self.builder.exactly("x"),
+                    self.builder.match_string("yz")]))
+        x = self.builder.makeGrammar([r])
+        self.assertEqual(writePython(x),
+                         dd("""
+                            class BuilderTest(GrammarBase):
+                                globals = globals()
+                                leftRecursiveRules = []
+                                def rule_foo(self):
+                                    _locals = {'self': self}
+                                    self.locals['foo'] = _locals
+                                    def _G_or_1():
+                                        _G_exactly_1, lastError = self.exactly('x')
+                                        return (_G_exactly_1, None)
+                                    def _G_or_2():
+                                        _G_match_string_1, lastError = self.match_string('yz')
+                                        return (_G_match_string_1, None)
+                                    _G_or_3, lastError = self._dispatch(_G_dispatch_1, [_G_or_1, _G_or_2])
+                                    return (_G_or_3, None)
+
+                            _G_dispatch_1 = GrammarBase.DispatchTable(BuilderTest, {'x': (0,), 'y': (1,)}, (), ['exactly', 'match_string', 'tryExactly', 'tryMatchString'])
+                            """))
+
+
+    def test_inline(self):
+        """
+        Inlined rules run their code in place, in parsers that do not
+        override them, and are applied otherwise. The grammar class lists
+        the rules inlined into its own.
+        """
+        r = self.builder.rule("foo", ["Inline", "bar", "BuilderTest",
+                                      self.builder.exactly("x")])
+        x = self.builder.makeGrammar([r])
+        self.assertEqual(writePython(x),
+                         dd("""
+                            _G_rule_bar = GrammarBase.ruleId('bar')
+                            class BuilderTest(GrammarBase):
+                                globals = globals()
+                                inlinedRules = ['bar']
+                                leftRecursiveRules = ['foo']
+                                def rule_foo(self):
+                                    _locals = {'self': self}
+                                    self.locals['foo'] = _locals
+                                    if self.inlining:
+                                        _G_exactly_2, lastError = self.exactly('x')
+                                        _G_inline_1 = _G_exactly_2
+                                    else:
+                                        _G_apply_3, lastError = self._apply(self.rule_bar, _G_rule_bar, [])
+                                        _G_inline_1 = _G_apply_3
+                                    return (_G_inline_1, None)
+                            """))
+
+
+    def test_unknownAnnotation(self):
+        """
+        Annotations other than C{@transient}, C{@memo} and C{@noinline} are
+        rejected.
+        """
+        x = self.builder.rule("foo", self.builder.exactly("x"), ["inline"])
+        self.assertRaises(ValueError, writePython, x)
+
+
+    def test_sentinel(self):
+        """
+        In the sentinel mode, generated code calls the primitives returning
+        C{FAIL} on failure and returns as soon as one of them does.
+        """
+        x = self.builder.rule("foo", self.builder._or(
+                [self.builder.exactly("x"),
+                 self.builder.apply("bar", "BuilderTest")]))
+        self.assertEqual(writePython(x, sentinel=True),
+                         dd("""
+                            _G_FAIL = GrammarBase.FAIL
+                            _G_rule_bar = GrammarBase.ruleId('bar')
+                            def rule_foo(self):
+                                _locals = {'self': self}
+                                self.locals['foo'] = _locals
+                                def _G_or_1():
+                                    _G_exactly_1, lastError = self.tryExactly('x')
+                                    if _G_exactly_1 is _G_FAIL: return (_G_exactly_1, lastError)
+                                    return (_G_exactly_1, None)
+                                def _G_or_2():
+                                    _G_apply_1, lastError = self._tryApply(self.rule_bar, _G_rule_bar, [])
+                                    if _G_apply_1 is _G_FAIL: return (_G_apply_1, lastError)
+                                    return (_G_apply_1, None)
+                                _G_or_3, lastError = self._tryOr([_G_or_1, _G_or_2])
+                                if _G_or_3 is _G_FAIL: return (_G_or_3, lastError)
+                                return (_G_or_3, None)
                             """))
@@ -0,0 +1,112 @@
+from pymeta import cache
+from pymeta.cache import GrammarCache
+from pymeta.grammar import OMeta
+from pymeta.optimizer import PassManager
+import imp, os, shutil, tempfile, unittest
+
+class BrokenMetagrammar(object):
+    """
+    A metagrammar that fails when used, to check that cached grammars are
+    not parsed again.
+    """
+    def __init__(self, grammar):
+        raise AssertionError("grammar parsed despite a cache hit")
+
+
+class GrammarCacheTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.cache}.
+    """
+
+    grammar = "digits = digit+:ds -> int(''.join(ds))"
+    # the code generation options makeGrammar uses by default
+    options = dict(sentinel=False, passes=PassManager().names())
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+
+    def test_makeGrammar(self):
+        """
+        L{OMeta.makeGrammar} stores the code generated for a grammar in the
+        cache, and later defines the same grammar from it without parsing it.
+        """
+        G = OMeta.makeGrammar(self.grammar, {}, cache=self.directory)
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        self.assertEqual(G("42").apply("digits")[0], 42)
+
+        class Cached(OMeta):
+            metagrammarClass = BrokenMetagrammar
+        c = GrammarCache(self.directory)
+        source, code = c.load(c.key(self.grammar, "Grammar", OMeta,
+                                    **self.options))
+        c.store(c.key(self.grammar, "Grammar", Cached, **self.options),
+                source, code)
+        G = Cached.makeGrammar(self.grammar, {}, cache=c)
+        self.assertEqual(G("42").apply("digits")[0], 42)
+
+
+    def test_key(self):
+        """
+        The cache key changes with the grammar text, the class name, the base
+        class, the code generation options, the pymeta version and the
+        generated code format.
+        """
+        c = GrammarCache(self.directory)
+        class Sub(OMeta):
+            pass
+        key = c.key(self.grammar, "Grammar", OMeta)
+        self.assertEqual(key, c.key(self.grammar, "Grammar", OMeta))
+        self.assertNotEqual(key, c.key(self.grammar + " ", "Grammar", OMeta))
+        self.assertNotEqual(key, c.key(self.grammar, "Other", OMeta))
+        self.assertNotEqual(key, c.key(self.grammar, "Grammar", Sub))
+        self.assertNotEqual(key, c.key(self.grammar, "Grammar", OMeta,
+                                       sentinel=True))
+        self.assertNotEqual(key, c.key(self.grammar, "Grammar", OMeta,
+                                       passes=[]))
+        version = cache.pymeta.__version__
+        cache.pymeta.__version__ = version + ".1"
+        try:
+            self.assertNotEqual(key, c.key(self.grammar, "Grammar", OMeta))
+        finally:
+            cache.pymeta.__version__ = version
+        codeFormat = cache.builder.CODE_FORMAT
+        cache.builder.CODE_FORMAT = codeFormat + 1
+        try:
+            self.assertNotEqual(key, c.key(self.grammar, "Grammar", OMeta))
+        finally:
+            cache.builder.CODE_FORMAT = codeFormat
+
+
+    def test_corruptEntry(self):
+        """
+        Entries that cannot be read back are treated as missing.
+        """
+        c = GrammarCache(self.directory)
+        self.assertEqual(c.load("missing"), None)
+        for data in ["", "garbage", imp.get_magic() + "garbage"]:
+            f = open(c.path("x"), "wb")
+            f.write(data)
+            f.close()
+            self.assertEqual(c.load("x"), None)
+        G = OMeta.makeGrammar(self.grammar, {}, cache=c)
+        f = open(c.path(c.key(self.grammar, "Grammar", OMeta,
+                              **self.options)), "r+b")
+        f.truncate(20)
+        f.close()
+        G = OMeta.makeGrammar(self.grammar, {}, cache=c)
+        self.assertEqual(G("7").apply("digits")[0], 7)
+
+
+    def test_unwritableDirectory(self):
+        """
+        A cache that cannot be written to does not prevent defining grammars.
+        """
+        path = os.path.join(self.directory, "file")
+        open(path, "w").close()
+        G = OMeta.makeGrammar(self.grammar, {}, cache=path)
+        self.assertEqual(G("7").apply("digits")[0], 7)
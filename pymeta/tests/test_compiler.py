@@ -0,0 +1,96 @@
+from pymeta import compiler
+from textwrap import dedent
+import imp, os, shutil, tempfile, unittest
+import pymeta
+
+
+class CompilerTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.compiler}.
+    """
+
+    grammar = dedent("""
+    num = <digit+>:d -> Decimal(d)
+    grammar = num:a (',' num)*:bs end -> a + total(bs)
+    """)
+
+    imports = ["from decimal import Decimal", "total = sum"]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'summer.ometa')
+        fp = open(self.path, 'wb')
+        fp.write(self.grammar)
+        fp.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def load(self, path, name='summer'):
+        return imp.load_source(name, path)
+
+    def test_main(self):
+        """
+        The command writes a module next to the grammar file, defining a
+        grammar class using the imported names.
+        """
+        args = ['-n', 'Summer']
+        for line in self.imports:
+            args.extend(['-i', line])
+        compiler.main(args + [self.path])
+        module = self.load(os.path.join(self.directory, 'summer.py'))
+        self.assertEqual(module.__pymeta_version__, pymeta.__version__)
+        result = module.Summer("1,2,30").apply("grammar")[0]
+        self.assertEqual(result, 33)
+        self.assertEqual(type(result).__name__, 'Decimal')
+
+    def test_sentinel(self):
+        """
+        Grammars compiled for the sentinel failure protocol parse the same.
+        """
+        output = os.path.join(self.directory, 'fast.py')
+        args = ['-s', '-O', '2', '-o', output, '-n', 'Summer']
+        for line in self.imports:
+            args.extend(['-i', line])
+        compiler.main(args + [self.path])
+        module = self.load(output, 'fast')
+        self.assertEqual(module.Summer("1,2").apply("grammar")[0], 3)
+
+    def test_base(self):
+        """
+        The grammar class subclasses the given base class.
+        """
+        source = compiler.compileModule(
+            "grammar = letter+:ls -> ''.join(ls)", "Words",
+            base='pymeta.grammar.OMeta')
+        output = os.path.join(self.directory, 'words.py')
+        open(output, 'wb').write(source)
+        from pymeta.grammar import OMeta
+        words = self.load(output, 'words').Words
+        self.assertTrue(issubclass(words, OMeta))
+        self.assertEqual(words("abc").apply("grammar")[0], "abc")
+        self.assertRaises(ValueError, compiler.compileModule, "x = 'a'",
+                          base='OMeta')
+
+    def test_deterministic(self):
+        """
+        Compiling the same grammar twice gives the same module.
+        """
+        first = compiler.compileModule(self.grammar, imports=self.imports)
+        second = compiler.compileModule(self.grammar, imports=self.imports)
+        self.assertEqual(first, second)
+
+    def test_stale(self):
+        """
+        A module generated by another version of pymeta refuses to be
+        imported.
+        """
+        source = compiler.compileModule(self.grammar, imports=self.imports)
+        output = os.path.join(self.directory, 'stale.py')
+        open(output, 'wb').write(source)
+        version = pymeta.__version__
+        pymeta.__version__ = version + '.dev'
+        try:
+            self.assertRaises(ImportError, self.load, output, 'stale')
+        finally:
+            pymeta.__version__ = version
@@ -0,0 +1,128 @@
+from pymeta.grammar import OMeta
+from pymeta.incremental import ParseSession
+from pymeta.runtime import ParseError
+from textwrap import dedent
+import random, unittest
+
+
+class IncrementalTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.incremental}.
+    """
+
+    grammar = """
+    num = <digit+>:d -> int(d)
+    pair = token('(') num:a token(',') num:b token(')') -> a * b
+    item = spaces (pair | num)
+    items = item*:xs spaces end -> sum(xs)
+    """
+
+    def setUp(self):
+        self.klass = OMeta.makeGrammar(dedent(self.grammar), {},
+                                       name="Incremental")
+
+    def reference(self, text):
+        return self.klass(text).apply('items')[0]
+
+    def test_edit(self):
+        """
+        Parsing after an edit gives the value a fresh parse of the edited
+        text gives.
+        """
+        s = ParseSession(self.klass, "1 2 (3,4) 5", 'items')
+        self.assertEqual(s.parse(), 20)
+        self.assertEqual(s.edit([(2, 1, "20")]), 38)
+        self.assertEqual(s.text, "1 20 (3,4) 5")
+        self.assertEqual(s.edit([(len(s.text), 0, " 7"), (0, 2, "")]), 44)
+        self.assertEqual(s.text, "20 (3,4) 5 7")
+
+    def test_reuse(self):
+        """
+        Only the memo records of the applications that examined the edited
+        text are dropped. Those after it are moved.
+        """
+        s = ParseSession(self.klass, "1 2 3 4 5 6", 'items')
+        s.parse()
+        s.edit([(4, 1, "30")])
+        num = s.parser.ruleId("num")
+        self.assertEqual(s.parser.getMemo(0, num)[:2], (1, 1))
+        self.assertEqual(s.parser.getMemo(7, num)[:2], (8, 4))
+        self.assertTrue(s.moved > s.dropped)
+
+    def test_editError(self):
+        """
+        Parsing after an edit that makes the text invalid raises the error
+        a fresh parse of the edited text raises, even where the failures
+        come from reused memo records.
+        """
+        G = self.klass.makeGrammar("grammar = items", {},
+                                   name="IncrementalGrammar")
+        r = random.Random(0)
+        s = ParseSession(G, "1 (2,3) 4", 'grammar')
+        s.parse()
+        errors = 0
+        for i in range(200):
+            offset = r.randint(0, len(s.text))
+            deleted = r.randint(0, min(2, len(s.text) - offset))
+            inserted = r.choice(["", "1", "23", " ", "(4,5)", " 6 ", "(", ","])
+            edited = s.text[:offset] + inserted + s.text[offset + deleted:]
+            try:
+                G.parse(edited)
+            except ParseError, e:
+                errors += 1
+                try:
+                    s.edit([(offset, deleted, inserted)])
+                except ParseError, f:
+                    self.assertEqual(str(f), str(e))
+                else:
+                    self.fail("%r parsed" % (edited,))
+            else:
+                s.edit([(offset, deleted, inserted)])
+        self.assertTrue(errors > 10)
+
+    def test_errorReuse(self):
+        """
+        Parsing after an edit that makes the text invalid reuses the memo
+        records the edit left valid, along with the failures they reported.
+        """
+        numbers = []
+        G = OMeta.makeGrammar(dedent(self.grammar).replace(
+                "-> int(d)", "-> numbers.append(d) or int(d)"),
+                              {'numbers': numbers}, name="IncrementalCount")
+        text = " ".join(str(i) for i in range(50))
+        s = ParseSession(G, text, 'items')
+        s.parse()
+        del numbers[:]
+        try:
+            s.edit([(len(text), 0, " (1,")])
+        except ParseError, e:
+            self.assertEqual(numbers, ["49", "1"])
+            try:
+                G.parse(s.text, rule='items')
+            except ParseError, f:
+                self.assertEqual(str(e), str(f))
+            else:
+                self.fail("%r parsed" % (s.text,))
+        else:
+            self.fail("%r parsed" % (s.text,))
+
+    def test_randomEdits(self):
+        """
+        Any sequence of edits parses the same as the edited text.
+        """
+        r = random.Random(0)
+        s = ParseSession(self.klass, "1 (2,3) 4", 'items')
+        s.parse()
+        for i in range(200):
+            offset = r.randint(0, len(s.text))
+            deleted = r.randint(0, min(2, len(s.text) - offset))
+            inserted = r.choice(["", "1", "23", " ", "(4,5)", " 6 "])
+            edited = s.text[:offset] + inserted + s.text[offset + deleted:]
+            try:
+                expected = self.reference(edited)
+            except Exception:
+                self.assertRaises(ParseError, s.edit,
+                                  [(offset, deleted, inserted)])
+            else:
+                self.assertEqual(s.edit([(offset, deleted, inserted)]),
+                                 expected)
@@ -0,0 +1,167 @@
+from pymeta.builder import TreeBuilder
+from pymeta.grammar import OMeta, OMetaGrammar
+from pymeta.runtime import _MaybeParseError, ParseError
+from pymeta.optimizer import (PassManager, collapse, flatten, inline,
+    mergeExactly, optimize)
+from StringIO import StringIO
+from textwrap import dedent
+import unittest
+
+class OptimizerTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.optimizer}.
+    """
+
+    def tree(self, grammar):
+        """
+        Parse a grammar and return its tree.
+        """
+        return OMetaGrammar(dedent(grammar)).parseGrammar('TestGrammar',
+                                                          TreeBuilder)
+
+
+    def body(self, tree):
+        """
+        Return the expression of the only rule of a grammar tree.
+        """
+        [rule] = tree[2]
+        return rule[2]
+
+
+    def test_collapse(self):
+        """
+        L{collapse} replaces sequences and choices of one expression with
+        the expression.
+        """
+        tree = ["Grammar", "G", [
+                ["Rule", "r", ["Or", ["And", ["Exactly", "x"]]], []]]]
+        self.assertEqual(self.body(collapse(tree)), ["Exactly", "x"])
+
+
+    def test_flatten(self):
+        """
+        L{flatten} splices nested sequences and choices into their parent,
+        keeping an empty sequence that gives the value of its parent.
+        """
+        tree = ["Grammar", "G", [
+                ["Rule", "r",
+                 ["Or",
+                  ["And", ["And"], ["And", ["Exactly", "a"], ["Exactly", "b"]]],
+                  ["Or", ["Exactly", "c"], ["Exactly", "d"]],
+                  ["And", ["Exactly", "e"], ["And"]]], []]]]
+        self.assertEqual(self.body(flatten(tree)),
+                         ["Or",
+                          ["And", ["Exactly", "a"], ["Exactly", "b"]],
+                          ["Exactly", "c"], ["Exactly", "d"],
+                          ["And", ["Exactly", "e"], ["And"]]])
+
+
+    def test_mergeExactly(self):
+        """
+        L{mergeExactly} replaces runs of characters matched in sequence with
+        a string, except for the last expression, whose value is the value
+        of the sequence.
+        """
+        tree = ["Grammar", "G", [
+                ["Rule", "r",
+                 ["And", ["Exactly", "a"], ["Exactly", "b"],
+                  ["Apply", "x", "G", ()],
+                  ["Exactly", "c"], ["Exactly", "dd"], ["Exactly", "e"],
+                  ["Exactly", "f"], ["Exactly", "g"]], []]]]
+        self.assertEqual(self.body(mergeExactly(tree)),
+                         ["And", ["MatchCharacters", "ab"],
+                          ["Apply", "x", "G", ()],
+                          ["Exactly", "c"], ["Exactly", "dd"],
+                          ["MatchCharacters", "ef"], ["Exactly", "g"]])
+
+
+    def test_inline(self):
+        """
+        L{inline} replaces applications of inlinable rules with their
+        expression, inlining the rules they apply in turn, and keeps the
+        rules.
+        """
+        tree = flatten(self.tree("""
+            hspace = ' ' | '\\t'
+            blank = hspace '\\n'
+            line = blank*
+            @noinline
+            tab = '\\t'
+            tabs = tab*
+        """))
+        hspace = ["Or", ["Exactly", " "], ["Exactly", "\t"]]
+        blank = ["And", ["Inline", "hspace", "blank", hspace],
+                 ["Exactly", "\n"]]
+        self.assertEqual(inline(tree)[2], [
+                ["Rule", "hspace", hspace, []],
+                ["Rule", "blank", blank, []],
+                ["Rule", "line",
+                 ["Many", ["Inline", "blank", "line", blank]], []],
+                ["Rule", "tab", ["Exactly", "\t"], ["noinline"]],
+                ["Rule", "tabs",
+                 ["Many", ["Apply", "tab", "tabs", ()]], []]])
+
+
+    def test_passManager(self):
+        """
+        L{PassManager} runs the passes of its level in order, timing each
+        one, and dumps the tree after each pass if asked to.
+        """
+        dump = StringIO()
+        tree = self.tree("r = ('a' 'b' 'c' | 'd')")
+        passes = PassManager(1, dump=dump)
+        result = passes.optimize(tree)
+        self.assertEqual(self.body(result),
+                         ["Or", ["And", ["MatchCharacters", "ab"], ["Exactly", "c"]],
+                          ["Exactly", "d"]])
+        self.assertEqual([name for name, t in passes.timings],
+                         passes.names())
+        self.assertEqual(passes.names(),
+                         ["collapse", "flatten", "mergeExactly", "inline"])
+        self.assertEqual(dump.getvalue().count("# after "), 4)
+        self.assertEqual(PassManager(0).optimize(tree), tree)
+        self.assertEqual(optimize(tree, 0), tree)
+
+
+    def test_makeGrammar(self):
+        """
+        L{OMeta.makeGrammar} optimizes grammars at the level given, or with
+        the L{PassManager} given.
+        """
+        grammar = "r = 'a' 'b' 'c' 'd' -> 'ok'"
+        passes = PassManager(passes=[])
+        for optimize in (None, 0, 1, passes):
+            G = OMeta.makeGrammar(grammar, {}, optimize=optimize)
+            self.assertEqual(G("abcd").apply("r")[0], "ok")
+            self.assertEqual(G("abcd", diagnostics=False).apply("r")[0], "ok")
+            try:
+                G("abxd").apply("r")
+            except _MaybeParseError, e:
+                self.assertEqual(e.args, (2, [("expected", None, "c")]))
+            else:
+                self.fail("'abxd' matched")
+
+
+    def test_mergeExactlyErrors(self):
+        """
+        Grammars whose characters matched in sequence are merged fail with
+        the errors matching them one at a time gives.
+        """
+        grammar = dedent("""
+            x = 'x'
+            grammar = 'a' 'b' 'c' x
+            """)
+        for sentinel in (False, True):
+            merged = OMeta.makeGrammar(grammar, {}, sentinel=sentinel)
+            single = OMeta.makeGrammar(grammar, {}, sentinel=sentinel,
+                                       optimize=0)
+            for source in ("abd", "ab", "zbc", "abcy", ""):
+                for diagnostics in (True, False):
+                    errors = []
+                    for G in (merged, single):
+                        try:
+                            G.parse(source, diagnostics=diagnostics)
+                        except ParseError, e:
+                            errors.append(str(e))
+                    self.assertEqual(len(errors), 2)
+                    self.assertEqual(errors[0], errors[1])
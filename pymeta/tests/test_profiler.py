@@ -0,0 +1,127 @@
+from pymeta.grammar import OMeta
+from pymeta.profiler import Profiler
+from pymeta.runtime import ParseError
+from textwrap import dedent
+import unittest
+
+
+class ProfilerTests(unittest.TestCase):
+    """
+    Tests for L{pymeta.profiler}.
+    """
+
+    grammar = dedent("""
+    num = <digit+>:d -> int(d)
+    pair = '(' num:a ',' num:b ')' -> a * b
+    value = pair | num
+    grammar = value:a (' ' value)*:bs end -> a + sum(bs)
+    """)
+
+    def check(self, sentinel):
+        g = OMeta.makeGrammar(self.grammar, {}, name="Profiled",
+                              sentinel=sentinel)
+        profiler = Profiler()
+        self.assertEqual(g.parse("12 (2,3) 4", profiler=profiler), 22)
+        num = profiler.rules['num']
+        # 12 and 4 are tried as pairs first
+        self.assertEqual(num.calls, 4)
+        self.assertEqual(num.failures, 0)
+        self.assertEqual(num.consumed, 5)
+        pair = profiler.rules['pair']
+        self.assertEqual((pair.calls, pair.failures, pair.consumed),
+                         (3, 2, 5))
+        grammar = profiler.rules['grammar']
+        self.assertEqual((grammar.calls, grammar.consumed), (1, 10))
+        self.assertTrue(grammar.inclusive >= grammar.exclusive >= 0)
+        self.assertTrue(grammar.inclusive >= pair.inclusive)
+        # value is inlined in grammar, once for each of its applications
+        choices = profiler.choices.values()
+        self.assertEqual(set(c.rule for c in choices), set(['grammar']))
+        self.assertEqual(sum(c.calls for c in choices), 3)
+        self.assertEqual(sum(c.backtracks for c in choices), 2)
+
+    def test_rules(self):
+        """
+        The profiler counts the applications of each rule, their failures
+        and the input they consume, and the alternatives failing at each
+        choice.
+        """
+        self.check(False)
+
+    def test_sentinel(self):
+        """
+        Grammars compiled for the sentinel failure protocol are profiled the
+        same.
+        """
+        self.check(True)
+
+    def test_memo(self):
+        """
+        Applications answered from the memo are counted as hits.
+        """
+        g = OMeta.makeGrammar(dedent("""
+        word = letter+
+        grammar = word ' ' | word
+        """), {}, name="Memo")
+        profiler = Profiler()
+        g.parse("abc", profiler=profiler)
+        word = profiler.rules['word']
+        self.assertEqual((word.calls, word.hits, word.misses), (2, 1, 1))
+
+    def test_transient(self):
+        """
+        Rules the generated code calls directly, without memoization, are
+        counted too, each application as a miss.
+        """
+        for sentinel in (False, True):
+            g = OMeta.makeGrammar(dedent("""
+            @transient
+            sign = '-':s -> s
+            num = sign? <digit+>
+            grammar = num (' ' num)* end
+            """), {}, name="Transient", sentinel=sentinel)
+            self.assertEqual(g.directRules, ['sign'])
+            profiler = Profiler()
+            parser = profiler.install(g("-1 2 -3"))
+            parser.apply('grammar')
+            sign = profiler.rules['sign']
+            self.assertEqual((sign.calls, sign.hits, sign.misses,
+                              sign.failures, sign.consumed), (3, 0, 3, 1, 2))
+            self.assertTrue(g("1").directCalls)
+
+    def test_failure(self):
+        """
+        Failed parses are recorded too.
+        """
+        g = OMeta.makeGrammar("grammar = 'a' 'b'", {}, name="Failing")
+        profiler = Profiler()
+        self.assertRaises(ParseError, g.parse, "ac", profiler=profiler)
+        self.assertTrue(profiler.rules['grammar'].failures >= 1)
+
+    def test_report(self):
+        """
+        The report lists rules sorted by the requested statistic, largest
+        first, and the choices that backtracked.
+        """
+        g = OMeta.makeGrammar(self.grammar, {}, name="Reported")
+        profiler = Profiler()
+        g.parse("1 (2,3) 4", profiler=profiler)
+        self.assertEqual([s.name for s in profiler.stats('calls')][:2],
+                         ['digit', 'num'])
+        lines = profiler.report(sort='calls', limit=2).splitlines()
+        self.assertEqual(lines[0].split()[:3], ['rule', 'calls', 'hits'])
+        self.assertEqual([line.split()[0] for line in lines[1:3]],
+                         ['digit', 'num'])
+        self.assertEqual(lines[-3].split(), ['choice', 'in', 'rule', 'site',
+                                             'calls', 'backtracks'])
+        self.assertEqual(lines[-1].split()[0], 'grammar')
+
+    def test_uninstalled(self):
+        """
+        Parsers the profiler is not installed on are left as they are.
+        """
+        g = OMeta.makeGrammar(self.grammar, {}, name="Plain")
+        parser = g("1")
+        self.assertFalse('_apply' in parser.__dict__)
+        Profiler().install(parser)
+        self.assertTrue('_apply' in parser.__dict__)
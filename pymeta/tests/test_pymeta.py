@@ -1,8 +1,9 @@
 from pymeta.builder import TreeBuilder, moduleFromGrammar
 from pymeta.grammar import OMetaGrammar
-from pymeta.runtime import _MaybeParseError, OMetaBase, EOFError
+from pymeta.runtime import (_MaybeParseError, OMetaBase, EOFError, ParseError,
+    argsKey)
 from textwrap import dedent
-import unittest
+import os, unittest
 
 class HandyWrapper(object):
     """
@@ -28,7 +29,7 @@ class HandyWrapper(object):
             obj = self.klass(s)
             ret, err = obj.apply(name)
             try:
-                extra, _ = obj.input.head()
+                extra, _ = obj.head()
             except EOFError:
                 try:
                     return ''.join(ret)
@@ -426,6 +427,80 @@ class OMetaTestCase(unittest.TestCase):
         """)
         self.assertEqual(g.consumedby([['1','0','1']]), [['1','0','1']])
 
+    def test_annotations(self):
+        """
+        Rules can be annotated as C{@transient}, so that their results are
+        never memoized, or C{@memo}, so that they always are.
+        """
+        g = self.compile("""
+            @transient
+            xs = 'x'*
+            @memo
+            y = 'y'
+            start = xs y
+        """)
+        self.assertEqual(g.start("xxy"), "y")
+        xs, y = g.klass.ruleId("xs"), g.klass.ruleId("y")
+        parser = g.klass("xxy")
+        parser.apply("start")
+        self.assertEqual(parser.memo[xs], None)
+        self.assertEqual(parser.memo[y].keys(), [2])
+
+
+    def test_memoArgs(self):
+        """
+        Rules applied with arguments are memoized for each set of arguments,
+        unless they are transient.
+        """
+        g = self.compile("""
+            @memo
+            word :w = token(w)
+            @transient
+            tword :w = token(w)
+            start = (word('a') word('b') | word('a') word('c'))
+                    tword('d') end
+        """)
+        self.assertEqual(g.start("a c d"), True)
+        word = g.klass.ruleId("word")
+        tword = g.klass.ruleId("tword")
+        parser = g.klass("a c d")
+        parser.apply("start")
+        self.assertEqual(parser.argMemo[argsKey(word, ['a'])].keys(), [0])
+        self.assertEqual(parser.argMemo[argsKey(word, ['c'])].keys(), [1])
+        self.assertEqual(parser.argMemo[argsKey(word, ['b'])].keys(), [1])
+        self.assertFalse(argsKey(tword, ['d']) in parser.argMemo)
+
+
+    def test_memoArgsTypes(self):
+        """
+        Arguments equal to each other but of different types, such as C{1}
+        and C{True}, are memoized apart.
+        """
+        g = self.compile("""
+            @memo
+            item :k = anything -> repr(k)
+            start = ~~(item(1):a) ~~(item(True):b) item(1.0):c -> (a, b, c)
+        """)
+        self.assertEqual(g.klass("x").apply("start")[0], ("1", "True", "1.0"))
+
+    def test_argumentsOverridden(self):
+        """
+        Arguments are passed according to the signature of the rule applied
+        when a subclass overrides a rule of the grammar with a method taking
+        them as Python arguments.
+        """
+        g = self.compile("""
+            pair :a :b = -> a + b.upper()
+            start = letter:x pair(x 'y')
+        """)
+        self.assertEqual(g.start("a"), 'aY')
+        class Swapped(g.klass):
+            def rule_pair(self, a, b):
+                return b + a.upper(), None
+        parser = Swapped("a")
+        self.assertFalse(parser.argumentPassing)
+        self.assertEqual(parser.apply("start")[0], 'yA')
+
 class PyExtractorTest(unittest.TestCase):
     """
     Tests for finding Python expressions in OMeta grammars.
@@ -536,6 +611,43 @@ class SelfHostingTest(OMetaTestCase):
 
 
 
+class GeneratedRulesTest(unittest.TestCase):
+    """
+    Tests for the grammar rules compiled ahead of time into the package.
+    """
+
+    def test_upToDate(self):
+        """
+        The generated modules match the grammars in L{pymeta.grammar}; run
+        pymeta/rulesgenerator.py if this fails.
+        """
+        from pymeta.rulesgenerator import RULES_MODULES, generateRules, rulesPath
+        for module, _, _ in RULES_MODULES:
+            f = open(rulesPath(module), 'rb')
+            try:
+                self.assertEqual(f.read(), generateRules(module), module)
+            finally:
+                f.close()
+
+
+    def test_importCompilesNothing(self):
+        """
+        Importing L{pymeta.grammar} does not generate code for any grammar.
+        """
+        import subprocess, sys
+        script = ("import pymeta.builder\n"
+                  "def fail(tree): raise AssertionError(tree[1])\n"
+                  "pymeta.builder.writePython = fail\n"
+                  "import pymeta.grammar\n")
+        top = os.path.dirname(os.path.dirname(os.path.dirname(
+                    os.path.abspath(__file__))))
+        p = subprocess.Popen([sys.executable, '-c', script], cwd=top,
+                             stderr=subprocess.PIPE)
+        _, err = p.communicate()
+        self.assertEqual(p.returncode, 0, err)
+
+
+
 class NullOptimizerTest(OMetaTestCase):
     """
     Tests of OMeta grammar compilation via the null optimizer.
@@ -555,3 +667,542 @@ class NullOptimizerTest(OMetaTestCase):
         tree, err = opt.apply("grammar")
         grammarClass = moduleFromGrammar(tree, 'TestGrammar', OMetaBase, {})
         return HandyWrapper(grammarClass)
+
+
+class SentinelTest(OMetaTestCase):
+    """
+    Tests of OMeta grammar compilation for the sentinel failure protocol.
+    """
+
+    def compile(self, grammar):
+        """
+        Produce an object capable of parsing via this grammar.
+
+        @param grammar: A string containing an OMeta grammar.
+        """
+        g = self.classTested(dedent(grammar))
+        tree = g.parseGrammar('TestGrammar', TreeBuilder)
+        result = moduleFromGrammar(tree, 'TestGrammar', OMetaBase, {},
+                                   sentinel=True)
+        return HandyWrapper(result)
+
+
+    def test_mixedTransient(self):
+        """
+        Transient rules overridden by a subclass, compiled for either
+        failure protocol, still fail when they do not match.
+        """
+        from pymeta.grammar import OMeta
+        from pymeta.runtime import ParseError
+        grammar = dedent("""
+            @transient
+            x = 'b'
+            grammar = 'a' (x | -> 'none'):v end -> ('ok', v)
+            """)
+        override = "x = 'c'"
+        for sentinel in (False, True):
+            parent = OMeta.makeGrammar(grammar, {}, name="Parent",
+                                       sentinel=sentinel)
+            self.assertTrue(parent("a").directCalls)
+            child = parent.makeGrammar(override, {}, name="Child",
+                                       sentinel=not sentinel)
+            self.assertFalse(child("a").directCalls)
+            self.assertEqual(child.parse("a"), ('ok', 'none'))
+            self.assertEqual(child.parse("ac"), ('ok', 'c'))
+            self.assertRaises(ParseError, child.parse, "ab")
+            same = parent.makeGrammar(override, {}, name="Same",
+                                      sentinel=sentinel)
+            self.assertFalse(same("a").directCalls)
+            self.assertEqual(same.parse("a"), ('ok', 'none'))
+            self.assertRaises(ParseError, same.parse, "ab")
+
+
+    def test_noExceptions(self):
+        """
+        Backtracking does not raise parse errors in the sentinel mode.
+        """
+        import sys
+        g = self.compile("""
+            digits = digit+:ds -> ''.join(ds)
+            word = letter+:ls -> ''.join(ls)
+            item = digits | word | token("+") | ~~'!' :x ?(False) | <'?'>
+            items = item*:xs ?(len(xs) > 0) -> xs
+        """)
+        parser = g.klass("12ab + 34?!")
+        raised = []
+        def tracer(frame, event, arg):
+            if event == 'exception' and issubclass(arg[0], _MaybeParseError):
+                raised.append(arg[0])
+            return tracer
+        sys.settrace(tracer)
+        try:
+            result, err = parser.apply("items")
+        finally:
+            sys.settrace(None)
+        self.assertEqual(result, ["12", "ab", "+"])
+        self.assertEqual(raised, [])
+
+
+    def test_inheritedMode(self):
+        """
+        Grammars extending a grammar compiled for the sentinel failure
+        protocol use it too, unless told otherwise.
+        """
+        from pymeta.grammar import OMeta
+        G = OMeta.makeGrammar("x = 'x'", {}, name="G", sentinel=True)
+        H = G.makeGrammar("y = x 'y'", {}, name="H")
+        I = H.makeGrammar("z = x 'z' | y", {}, name="I", sentinel=False)
+        self.assertTrue(H.sentinelFailures)
+        self.assertEqual(H("xy").apply("y")[0], "y")
+        self.assertEqual(I("xy").apply("z")[0], "y")
+        self.assertRaises(_MaybeParseError, I("xx").apply, "z")
+
+
+class DispatchTest(OMetaTestCase):
+    """
+    Tests of OMeta grammar compilation, parsing without diagnostics so that
+    ordered choices dispatch on the next input character.
+    """
+
+    def compile(self, grammar):
+        """
+        Produce an object capable of parsing via this grammar.
+
+        @param grammar: A string containing an OMeta grammar.
+        """
+        klass = OMetaTestCase.compile(self, grammar).klass
+        class Fast(klass):
+            diagnostics = False
+        return HandyWrapper(Fast)
+
+
+    def test_dispatch(self):
+        """
+        Alternatives that cannot begin with the next character are not
+        tried.
+        """
+        from pymeta.grammar import OMeta
+        tried = []
+        G = OMeta.makeGrammar(dedent("""
+            start = !(tried.append(0)) 'a' 'b' | 'a' | spaces 'c' | 'd'
+            """), {'tried': tried}, name="DispatchGrammar")
+        table = G._G_module._G_dispatch_1
+        self.assertEqual(table.default, (0,))
+        self.assertEqual(table.table['a'], (0, 1))
+        self.assertEqual(table.table[' '], (0, 2))
+        for source, value, calls in [("ab", "b", [0]), ("a", "a", [0]),
+                                     (" c", "c", [0]), ("d", "d", [0])]:
+            del tried[:]
+            self.assertEqual(G(source, diagnostics=False).apply("start")[0],
+                             value)
+            self.assertEqual(tried, calls)
+
+
+    def test_diagnostics(self):
+        """
+        Parsers with diagnostics skip the alternatives that cannot begin
+        with the next character only when a failure farther in the input
+        was already recorded, so that their errors stay the same.
+        """
+        from pymeta.grammar import OMeta
+        from pymeta.trace import TraceLog
+        G = OMeta.makeGrammar(dedent("""
+            grammar = 'x' 'y' 'b' 'q' | 'x' 'y' c
+            c = a | b
+            a = 'a'
+            b = 'b'
+            """), {}, name="DispatchGrammar", trace=True, optimize=0)
+        log = TraceLog()
+        self.assertEqual(G.parse("xyb", tracer=log), "b")
+        self.assertEqual([e[1] for e in log.events if e[0] == 'enter'],
+                         ['grammar', 'c', 'b'])
+        log = TraceLog()
+        try:
+            G.parse("xyz", tracer=log)
+        except ParseError, e:
+            self.assertIn("expected one of 'b', or 'a'", str(e))
+        else:
+            self.fail("ParseError not raised")
+        self.assertEqual([e[1] for e in log.events if e[0] == 'enter'],
+                         ['grammar', 'c', 'a', 'b'])
+
+
+    def test_override(self):
+        """
+        Subclasses overriding a rule a choice was analyzed with try every
+        alternative.
+        """
+        from pymeta.grammar import OMeta
+        for sentinel in (False, True):
+            G = OMeta.makeGrammar(dedent("""
+                start = a | 'z'
+                a = 'x'
+                """), {}, name="DispatchGrammar", sentinel=sentinel)
+            H = G.makeGrammar("a = 'y'", {}, name="DispatchGrammar2")
+            self.assertTrue(G._G_module._G_dispatch_1.validFor(G))
+            self.assertFalse(G._G_module._G_dispatch_1.validFor(H))
+            self.assertEqual(H("y", diagnostics=False).apply("start")[0], "y")
+            self.assertRaises(_MaybeParseError,
+                              G("y", diagnostics=False).apply, "start")
+
+
+
+class InlineTest(unittest.TestCase):
+    """
+    Tests for grammars whose small rules are inlined at their call sites.
+    """
+
+    grammar = dedent("""
+        hspace = ' ' | '\t'
+        word = letter+:cs -> ''.join(cs)
+        words = word:first (hspace+ word)*:rest hspace* end -> [first] + rest
+        """)
+
+    def makeGrammar(self, **kw):
+        from pymeta.grammar import OMeta
+        return OMeta.makeGrammar(self.grammar, {}, name="InlineGrammar", **kw)
+
+
+    def parseError(self, G, source):
+        try:
+            G(source).apply("words")
+        except _MaybeParseError, e:
+            return e.formatError(source)
+        self.fail("%r parsed" % (source,))
+
+
+    def test_inline(self):
+        """
+        Inlined rules match the same input as applied ones, and fail with
+        the same errors.
+        """
+        for sentinel in (False, True):
+            G = self.makeGrammar(sentinel=sentinel)
+            applied = self.makeGrammar(sentinel=sentinel, optimize=0)
+            self.assertEqual(G.inlinedRules, ["hspace"])
+            self.assertEqual(applied.inlinedRules, ())
+            self.assertTrue(G("x").inlining)
+            for diagnostics in (True, False):
+                self.assertEqual(G("ab \tc ", diagnostics=diagnostics)
+                                 .apply("words")[0], ["ab", "c"])
+            for source in ("ab c!", "ab \n", "1"):
+                self.assertEqual(self.parseError(G, source),
+                                 self.parseError(applied, source))
+
+
+    def test_override(self):
+        """
+        Parsers of subclasses overriding an inlined rule apply it.
+        """
+        G = self.makeGrammar()
+        H = G.makeGrammar("hspace = ','", {}, name="InlineGrammar2")
+        class I(G):
+            def rule_hspace(self):
+                return self.exactly("-")
+        self.assertFalse(H("x").inlining)
+        self.assertFalse(I("x").inlining)
+        self.assertEqual(H("ab,c").apply("words")[0], ["ab", "c"])
+        self.assertEqual(I("ab-c").apply("words")[0], ["ab", "c"])
+        self.assertRaises(_MaybeParseError, H("ab c").apply, "words")
+
+
+    def test_noinline(self):
+        """
+        Rules annotated C{@noinline} are always applied.
+        """
+        from pymeta.grammar import OMeta
+        G = OMeta.makeGrammar("@noinline\n" + self.grammar.lstrip(), {},
+                              name="InlineGrammar")
+        self.assertEqual(G.inlinedRules, ())
+        self.assertEqual(G("ab c").apply("words")[0], ["ab", "c"])
+
+
+    def test_recursive(self):
+        """
+        Transient rules that can apply themselves are not inlined.
+        """
+        from pymeta.grammar import OMeta
+        for sentinel in (False, True):
+            G = OMeta.makeGrammar(dedent("""
+                @transient
+                parens = '(' parens ')' | 'x'
+                grammar = parens end
+                """), {}, name="InlineGrammar", sentinel=sentinel)
+            self.assertEqual(G.inlinedRules, ())
+            self.assertEqual(G.parse("((x))"), True)
+            self.assertRaises(ParseError, G.parse, "((x)")
+
+
+
+class LeftRecursionTest(unittest.TestCase):
+    """
+    Tests for finding left-recursive rules and growing their seeds.
+    """
+
+    grammar = dedent("""
+        expr = expr:a '+' num:b -> a + b
+             | num
+        num = digit+:ds -> int(''.join(ds))
+        a = b:x 'x' -> x + 'x'
+          | 'y'
+        b = 'z'
+        """)
+
+    def makeGrammar(self, **kw):
+        from pymeta.grammar import OMeta
+        return OMeta.makeGrammar(self.grammar, {}, name="LRGrammar", **kw)
+
+
+    def test_leftRecursiveRules(self):
+        """
+        Grammars record the rules found to be left-recursive, whose seeds
+        parsers grow.
+        """
+        for sentinel in (False, True):
+            G = self.makeGrammar(sentinel=sentinel)
+            self.assertEqual(G.leftRecursiveRules, ["expr"])
+            self.assertEqual(G("1+22+3").apply("expr")[0], 26)
+
+
+    def test_override(self):
+        """
+        Rules of a grammar can become left-recursive in a subclass
+        overriding others.
+        """
+        for sentinel in (False, True):
+            G = self.makeGrammar(sentinel=sentinel)
+            H = G.makeGrammar("b = a | 'w'", {}, name="LRGrammar2")
+            h = H("wx")
+            self.assertEqual(H.leftRecursiveRules, ["b"])
+            self.assertEqual(h.apply("a")[0], "wx")
+
+
+    def test_primitiveOverride(self):
+        """
+        Subclasses can override primitive rules the grammar compiler
+        assumed apply no other rule.
+        """
+        G = self.makeGrammar()
+        class H(G):
+            def rule_digit(self):
+                return self.exactly("7")
+        self.assertEqual(H("7+7").apply("expr")[0], 14)
+
+
+    def test_transientOverride(self):
+        """
+        Rules applied without memoization in a grammar are applied with it
+        in subclasses overriding them, which may grow a seed there.
+        """
+        from pymeta.grammar import OMeta
+        for sentinel in (False, True):
+            G = OMeta.makeGrammar(dedent("""
+                sp = ' '
+                grammar = 'x' sp 'y' -> 'ok'
+                """), {}, name="LRGrammar", sentinel=sentinel)
+            self.assertEqual(G.directRules, ['sp'])
+            S = G.makeGrammar(dedent("""
+                sp = sp:a ' ' -> a + ' '
+                   | ' '
+                """), {}, name="LRGrammar2")
+            self.assertFalse(S("x   y").directCalls)
+            self.assertEqual(S.parse("x   y"), 'ok')
+
+
+
+class DiagnosticsTest(unittest.TestCase):
+    """
+    Tests for parsing without diagnostics.
+    """
+
+    grammar = dedent("""
+        value = number | token("[") values:vs token("]") -> vs
+        number = spaces digit+:ds -> int(''.join(ds))
+        values = value:first (token(",") value)*:rest -> [first] + rest
+        grammar = value:v spaces end -> v
+        """)
+
+    def makeGrammar(self, **kw):
+        from pymeta.grammar import OMeta
+        return OMeta.makeGrammar(self.grammar, {}, name="ValueGrammar", **kw)
+
+
+    def parseError(self, G, source, **kw):
+        try:
+            G.parse(source, **kw)
+        except ParseError, e:
+            return str(e)
+        self.fail("ParseError not raised")
+
+
+    def test_success(self):
+        """
+        Parsing well-formed input gives the same result with or without
+        diagnostics, and does not turn them on.
+        """
+        G = self.makeGrammar()
+        source = "[1, [2, 3], 45]"
+        self.assertEqual(G.parse(source, diagnostics=False), [1, [2, 3], 45])
+        g = G(source, diagnostics=False)
+        self.assertEqual(g.apply("grammar")[0], [1, [2, 3], 45])
+        self.assertFalse(g.diagnostics)
+
+
+    def test_failure(self):
+        """
+        When parsing fails without diagnostics, the rule is run again with
+        them, raising the same error as a parser with diagnostics would.
+        """
+        reasons = {
+            "[1, [2, 3] 45]": "column 11: expected one of token ',', or "
+                              "token ']'",
+            "[1, x]": "column 4: expected one of a digit, or token '['",
+            "[1, 2": "column 5: expected one of end of input, token ',', "
+                     "or token ']'"}
+        for sentinel in (False, True):
+            G = self.makeGrammar(sentinel=sentinel)
+            for source, reason in reasons.iteritems():
+                error = self.parseError(G, source)
+                self.assertTrue(error.endswith("Parse error at line 1, %s\n"
+                                               % (reason,)), error)
+                self.assertEqual(self.parseError(G, source, diagnostics=False),
+                                 error)
+            g = G("[1, x]", diagnostics=False)
+            self.assertRaises(_MaybeParseError, g.apply, "grammar")
+            self.assertTrue(g.diagnostics)
+            d = G("[1, x]")
+            self.assertRaises(_MaybeParseError, d.apply, "grammar")
+            self.assertEqual(g.currentError, d.currentError)
+
+
+    def test_classDefault(self):
+        """
+        Grammar classes can turn diagnostics off for all their parsers.
+        """
+        class Fast(self.makeGrammar()):
+            diagnostics = False
+        self.assertFalse(Fast("1").diagnostics)
+        self.assertTrue(Fast("1", diagnostics=True).diagnostics)
+        self.assertEqual(Fast.parse("[7]"), [7])
+        self.assertEqual(self.parseError(Fast, "[7,]"),
+                         self.parseError(self.makeGrammar(), "[7,]"))
+
+
+class MemoPolicyTest(unittest.TestCase):
+    """
+    Tests for parsing with bounded memo tables.
+    """
+
+    grammar = dedent("""
+        @memo
+        x = 'a'
+        @memo
+        z = 'z'
+        xs = x*
+        s = xs:a 'b' -> ''.join(a) + 'b'
+          | xs:a 'c' -> ''.join(a) + 'c'
+        t = s:a z* 'y' -> a + 'y'
+          | s:a z* 'q' -> a + 'q'
+        """)
+    expected = "a" * 20 + "cq"
+
+    def parse(self, memoPolicy):
+        from pymeta.grammar import OMeta
+        G = OMeta.makeGrammar(self.grammar, {}, name="MemoPolicyGrammar")
+        g = G("a" * 20 + "c" + "z" * 20 + "q", memoPolicy=memoPolicy)
+        return g, g.apply("t")[0]
+
+    def records(self, g):
+        return sum(len(table) for table in g.memo if table)
+
+
+    def test_window(self):
+        """
+        L{WindowMemo} drops records too far behind the farthest position
+        reached and recomputes them when needed, without changing the result.
+        """
+        from pymeta.runtime import WindowMemo
+        policy = WindowMemo(2)
+        g, result = self.parse(policy)
+        self.assertEqual(result, self.expected)
+        self.assertNotEqual(policy.evictions, 0)
+        self.assertNotEqual(policy.recomputations, 0)
+        unbounded, _ = self.parse(None)
+        self.assertTrue(self.records(g) < self.records(unbounded))
+
+
+    def test_lru(self):
+        """
+        L{LRUMemo} keeps at most the given number of records, evicting the
+        least recently used ones, without changing the result.
+        """
+        from pymeta.runtime import LRUMemo
+        policy = LRUMemo(3)
+        g, result = self.parse(policy)
+        self.assertEqual(result, self.expected)
+        self.assertNotEqual(policy.evictions, 0)
+        self.assertNotEqual(policy.recomputations, 0)
+        self.assertTrue(self.records(g) <= 3)
+
+
+    def test_leftRecursion(self):
+        """
+        Left-recursive rules growing their seed keep it under tiny budgets,
+        in both failure protocols.
+        """
+        from pymeta.grammar import OMeta
+        from pymeta.runtime import LRUMemo, WindowMemo
+        grammar = dedent("""
+            num = <digit+>:d -> int(d)
+            expr = expr:a '+' num:b -> a + b
+                 | num
+            grammar = expr:e end -> e
+            """)
+        text = "+".join(["1", "22", "3"] * 20)
+        for sentinel in (False, True):
+            G = OMeta.makeGrammar(grammar, {}, name="LeftRecursive",
+                                  sentinel=sentinel)
+            for budget in (1, 2, 5, 10):
+                for policy in (LRUMemo(budget), WindowMemo(budget)):
+                    self.assertEqual(G.parse(text, memoPolicy=policy), 520)
+
+
+    def test_diagnosticRerun(self):
+        """
+        When a parse without diagnostics fails and runs again with them, the
+        policy forgets the tables of the failed run along with the parser.
+        """
+        from pymeta.runtime import LRUMemo, WindowMemo
+        text = "a" * 20 + "c" + "z" * 20 + "x"
+        unbounded = self.parse(None)[0].__class__(text)
+        self.assertRaises(_MaybeParseError, unbounded.apply, "t")
+        error = unbounded.currentError.formatError(text)
+        for policy in (LRUMemo(3), WindowMemo(2)):
+            g = unbounded.__class__(text, memoPolicy=policy,
+                                    diagnostics=False)
+            try:
+                g.apply("t")
+            except _MaybeParseError:
+                self.assertEqual(g.currentError.formatError(text), error)
+            else:
+                self.fail("%r parsed" % (text,))
+            self.assertTrue(g.diagnostics)
+            tables = [table for table in g.memo if table]
+            if isinstance(policy, LRUMemo):
+                self.assertTrue(0 < len(policy.order) <= 3)
+                for table in policy.order.itervalues():
+                    self.assertTrue(any(table is t for t in tables))
+            else:
+                self.assertEqual(len(policy.tables), len(tables))
+                for table in policy.tables:
+                    self.assertTrue(any(table is t for t in tables))
+
+
+    def test_unbounded(self):
+        """
+        Without a policy, every memo record is kept.
+        """
+        g, result = self.parse(None)
+        self.assertEqual(result, self.expected)
+        self.assertEqual(type(g.memo[g.ruleId("x")]), dict)
+        self.assertEqual(len(g.memo[g.ruleId("x")]), 21)
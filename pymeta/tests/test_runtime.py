@@ -1,5 +1,7 @@
-from pymeta.runtime import OMetaBase, _MaybeParseError, expected
-import unittest
+from pymeta.runtime import (OMetaBase, _MaybeParseError, FAIL, expected,
+    eof, ruleId, ruleNames, FailureTracker, StreamInput, WindowMemo,
+    unicodeCharacter, MappedInput, _DecodedMap, argsKey)
+import gzip, os, shutil, tempfile, unittest, warnings
 
 class RuntimeTests(unittest.TestCase):
     """
@@ -140,7 +142,7 @@ class RuntimeTests(unittest.TestCase):
     def test_orFalseSuccess(self):
         """
         When a failing branch of L{OMetaBase._or} gets further than a
-        succeeding one, its error is returned instead of the success branch's.
+        succeeding one, its error is the parser's current error.
         """
 
         data = "foozle"
@@ -149,8 +151,9 @@ class RuntimeTests(unittest.TestCase):
         v, e = o._or([lambda: o.token("fog"),
                       lambda: o.token("foozik"),
                       lambda: o.token("f")])
-        self.assertEqual(e[0], 4)
-        self.assertEqual(e[1], expected("token", "foozik"))
+        self.assertEqual(v, "f")
+        self.assertEqual(o.currentError[0], 4)
+        self.assertEqual(o.currentError[1], expected("token", "foozik"))
 
     def test_orErrorTie(self):
         """
@@ -164,8 +167,9 @@ class RuntimeTests(unittest.TestCase):
         v, e = o._or([lambda: o.token("fog"),
                       lambda: o.token("foz"),
                       lambda: o.token("f")])
-        self.assertEqual(e[0], 2)
-        self.assertEqual(e[1], [expected("token", "fog")[0], expected("token", "foz")[0]])
+        self.assertEqual(o.currentError[0], 2)
+        self.assertEqual(sorted(o.currentError[1]),
+                         [expected("token", "fog")[0], expected("token", "foz")[0]])
 
 
     def test_notError(self):
@@ -290,6 +294,21 @@ class RuntimeTests(unittest.TestCase):
         v, e = o.listpattern(lambda: o.exactly("a"))
         self.assertEqual((v, e), (["a"], [0, None]))
 
+    def test_listpatternCharacter(self):
+        """
+        L{OMetaBase.listpattern} does not match the characters of text input
+        as strings, though text input is not copied into one object per
+        character.
+        """
+        for data in "ab", u"ab":
+            o = OMetaBase(data)
+            self.assertTrue(o.data is data)
+            self.assertRaises(_MaybeParseError, o.listpattern,
+                              lambda: o.exactly("a"))
+            o = OMetaBase(data)
+            self.assertEqual(o.tryListpattern(lambda: o.tryExactly("a"))[0],
+                             FAIL)
+
     def test_consumed_by(self):
         """
         L{OMetaBase.consumed_by} return the full matched string, not each matched parts
@@ -316,3 +335,305 @@ class RuntimeTests(unittest.TestCase):
         self.assertEqual((v, e), (['a', ['b']], [1, None]))
         self.assertIn('x', d)
         self.assertEqual(d['x'], ['b'])
+
+    def test_integerInput(self):
+        """
+        The input state of L{OMetaBase} is an integer position into the
+        input data: consuming and backtracking are integer operations.
+        """
+        o = OMetaBase("abc")
+        self.assertEqual(o.input, 0)
+        self.assertEqual(o.head(), ('a', [0, None]))
+        o.rule_anything()
+        self.assertEqual(o.input, 1)
+        self.assertEqual(o.tail(), 2)
+        self.assertEqual(o.prev(), 0)
+        o.input = 0
+        self.assertEqual(o.rule_anything(), ('a', [0, None]))
+
+    def test_memoSideTable(self):
+        """
+        Memo records are stored on the parser, in a table per rule id keyed
+        by input position. Each record holds the end position, the value and
+        the error info.
+        """
+        o = OMetaBase("abc")
+        rid = ruleId("anything")
+        o.rule_anything()
+        o._apply(o.rule_anything, rid, [])
+        self.assertEqual(o.getMemo(1, rid), (2, 'b', [1, None]))
+        self.assertEqual(o.getMemo(0, rid), None)
+        self.assertEqual(o.memo[rid], {1: (2, 'b', [1, None])})
+
+    def test_ruleId(self):
+        """
+        L{ruleId} gives each rule name a stable small integer.
+        """
+        rid = ruleId("test_ruleId_rule")
+        self.assertEqual(ruleId("test_ruleId_rule"), rid)
+        self.assertEqual(ruleNames[rid], "test_ruleId_rule")
+        self.assertNotEqual(ruleId("test_ruleId_other"), rid)
+
+    def test_memoNewRule(self):
+        """
+        Rules registered after a parser was created still get memoized.
+        """
+        o = OMetaBase("abc")
+        rid = ruleId("test_memoNewRule_rule")
+        self.assertEqual(o._apply(o.rule_anything, rid, []), ('a', [0, None]))
+        self.assertEqual(o.getMemo(0, rid), (1, 'a', [0, None]))
+
+    def test_memoArgs(self):
+        """
+        Applications with hashable arguments are memoized by rule, arguments
+        and position. Unhashable arguments are not memoized.
+        """
+        o = OMetaBase("abc")
+        rid = ruleId("token")
+        self.assertEqual(o._apply(o.rule_token, rid, ["ab"]), ("ab", [1, None]))
+        self.assertEqual(o.argMemo, {argsKey(rid, ["ab"]): {0: (2, "ab", [1, None])}})
+        o.input = 0
+        self.assertEqual(o._apply(o.rule_token, rid, ["ab"]), ("ab", [1, None]))
+        self.assertEqual(o.input, 2)
+        o = OMetaBase([["a"], "b"])
+        self.assertEqual(o._apply(o.rule_exactly, ruleId("exactly"), [["a"]]),
+                         (["a"], [0, None]))
+        self.assertEqual(o.argMemo, {})
+
+    def test_listpatternFailureRestoresInput(self):
+        """
+        When the pattern inside L{OMetaBase.listpattern} fails, the parser
+        goes back to reading the enclosing input.
+        """
+        o = OMetaBase([["a"], "b"])
+        self.assertRaises(_MaybeParseError, o.listpattern,
+                          lambda: o.exactly("x"))
+        self.assertEqual(o.data, [["a"], "b"])
+        self.assertEqual(o.input, 1)
+
+    def test_tryExactly(self):
+        """
+        L{OMetaBase.tryExactly} returns C{FAIL} and the error instead of
+        raising when the requested item doesn't match the input.
+        """
+        o = OMetaBase("foo")
+        self.assertEqual(o.tryExactly("f"), ("f", [0, None]))
+        self.assertEqual(o.tryExactly("g"), (FAIL, [1, expected(None, "g")]))
+        self.assertEqual(o.input, 1)
+
+    def test_tryOr(self):
+        """
+        L{OMetaBase._tryOr} rewinds the input after each failed alternative,
+        whether it returned C{FAIL} or raised, and fails when all of them do.
+        """
+        o = OMetaBase("ab")
+        v, e = o._tryOr([lambda: o.tryMatchString("ax"),
+                         lambda: o.exactly("b"),
+                         lambda: o.tryMatchString("ab")])
+        self.assertEqual(v, "ab")
+        o = OMetaBase("ab")
+        v, e = o._tryOr([lambda: o.tryExactly("x"), lambda: o.exactly("y")])
+        self.assertEqual(v, FAIL)
+        self.assertEqual(o.input, 0)
+
+    def test_tryMany(self):
+        """
+        L{OMetaBase.tryMany} stops at the first C{FAIL}, leaving the input
+        where the failed attempt started.
+        """
+        o = OMetaBase("ooops")
+        self.assertEqual(o.tryMany(lambda: o.tryExactly('o')),
+                         (['o'] * 3, [3, expected(None, 'o')]))
+        self.assertEqual(o.input, 3)
+
+    def test_tryApply(self):
+        """
+        L{OMetaBase._tryApply} reports the failure of rules that raise as
+        C{FAIL}, and L{OMetaBase._apply} raises for rules that return
+        C{FAIL}.
+        """
+        o = OMetaBase("abc")
+        self.assertEqual(o._tryApply(o.rule_digit, ruleId("digit"), []),
+                         (FAIL, [0, expected("digit")]))
+        o = OMetaBase("abc")
+        self.assertEqual(o._tryApply(o.rule_token, ruleId("token"), ["ab"]),
+                         ("ab", [1, None]))
+        o = OMetaBase("abc")
+        self.assertRaises(_MaybeParseError, o._apply, o.tryDigit,
+                          ruleId("digit"), [])
+
+
+    def test_streamInput(self):
+        """
+        L{StreamInput} reads chunks as parsing moves forward, decoding them
+        incrementally, and drops what fell behind its window.
+        """
+        chunks = iter(['ab', '', 'c\xc3', '\xa9d', 'ef'])
+        s = StreamInput(chunks, 'utf8', window=2)
+        self.assertEqual(s.basetype, unicode)
+        o = OMetaBase(s)
+        self.assertEqual(type(o.memoPolicy), WindowMemo)
+        self.assertEqual(o.match_string(u"abc\xe9"), (u"abc\xe9", [3, None]))
+        self.assertEqual(o.rule_anything(), (u"d", [4, None]))
+        self.assertEqual(o.rule_anything(), (u"e", [5, None]))
+        self.assertEqual(type(o.rule_anything()[0]), unicodeCharacter)
+        self.assertRaises(_MaybeParseError, o.rule_anything)
+        self.assertEqual(o.tryAnything(), (FAIL, [7, eof()]))
+        self.assertEqual(s[5:7], u"ef")
+        self.assertRaises(ValueError, s.__getitem__, 0)
+        self.assertRaises(ValueError, s.__getitem__, slice(0, 2))
+
+    def test_streamInputFile(self):
+        """
+        L{StreamInput.open} reads files, decompressing gzip and bz2 files.
+        """
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        path = os.path.join(d, "input.gz")
+        f = gzip.open(path, 'wb')
+        f.write("x" * 1000 + "y")
+        f.close()
+        s = StreamInput.open(path, window=10, chunkSize=64)
+        self.assertEqual(s.basetype, str)
+        o = OMetaBase(s)
+        self.assertEqual(o.many(lambda: o.exactly("x"))[0], ["x"] * 1000)
+        self.assertEqual(o.exactly("y"), ("y", [1000, None]))
+        self.assertTrue(len(s.buffer) < 100)
+
+    def test_mappedInput(self):
+        """
+        L{MappedInput} is parsed in place, as bytes, or by character if it
+        is in an encoding.
+        """
+        d = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, d)
+        path = os.path.join(d, "input.txt")
+        f = open(path, 'wb')
+        f.write(u"caf\xe9 ok \u20ac1".encode('utf8'))
+        f.close()
+        m = MappedInput(path, 'utf8')
+        self.addCleanup(m.close)
+        o = OMetaBase(m)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(o.consumed_by(lambda: o.many(o.rule_letter))[0],
+                             u"caf\xe9")
+            self.assertEqual(o.token(u"ok"), (u"ok", [6, None]))
+            self.assertRaises(_MaybeParseError, o.token, u"\xe9")
+            self.assertEqual(o.token(u"\u20ac"), (u"\u20ac", [8, None]))
+            self.assertEqual(o.rule_digit(), (u"1", [9, None]))
+            self.assertRaises(_MaybeParseError, o.rule_anything)
+        self.assertEqual(caught, [])
+        m = MappedInput(path)
+        self.addCleanup(m.close)
+        o = OMetaBase(m)
+        self.assertEqual(o.consumed_by(lambda: o.many(o.rule_letter))[0],
+                         "caf")
+        self.assertEqual(o.exactly("\xc3"), ("\xc3", [3, None]))
+        path = os.path.join(d, "empty.txt")
+        open(path, 'wb').close()
+        o = OMetaBase(MappedInput(path))
+        self.assertEqual(o.tryAnything(), (FAIL, [0, eof()]))
+        o = OMetaBase(MappedInput(path, 'utf8'))
+        self.assertEqual(o.tryAnything(), (FAIL, [0, eof()]))
+
+    def test_decodedMap(self):
+        """
+        The text of a L{MappedInput} in an encoding is decoded a chunk at a
+        time, and chunks no longer kept are decoded again when read.
+        """
+        text = u"\xe9a\u20acb" * 10
+        d = _DecodedMap(text.encode('utf8'), 'utf8', chunkSize=4, keep=1)
+        self.assertEqual(d[0], u"\xe9")
+        self.assertEqual(d[3], u"b")
+        self.assertEqual(len(d.charOffsets), 3)
+        self.assertEqual(len(d), 40)
+        self.assertEqual(d[39], u"b")
+        self.assertEqual(d[2], u"\u20ac")
+        self.assertEqual(d[5:23], text[5:23])
+        self.assertEqual(d[30:], text[30:])
+        self.assertTrue(d.startswith(u"a\u20ac", 9))
+        self.assertFalse(d.startswith(u"ab", 9))
+        self.assertRaises(IndexError, lambda: d[40])
+        self.assertRaises(ValueError, _DecodedMap, u"\xe9".encode('utf16'),
+                          'utf16')
+
+    def test_failureTracker(self):
+        """
+        L{FailureTracker} keeps what was expected at the farthest position
+        where a match failed.
+        """
+        t = FailureTracker()
+        self.assertEqual(t.error(), _MaybeParseError(0, None))
+        t.record(2, expected("token", "fog"))
+        t.record(1, expected("token", "f"))
+        t.record(2, expected("token", "foz"))
+        t.record(2, expected("token", "fog"))
+        t.record(3, None)
+        self.assertEqual(t.error()[0], 2)
+        self.assertEqual(sorted(t.error()[1]),
+                         expected("token", "fog") + expected("token", "foz"))
+        t.record(4, expected("digit"))
+        self.assertEqual(t.error(), _MaybeParseError(4, expected("digit")))
+
+    def test_notQuiet(self):
+        """
+        Failures inside L{OMetaBase._not} are not recorded, since they make
+        the negative lookahead succeed.
+        """
+        o = OMetaBase("xy")
+        o.exactly("x")
+        o._not(lambda: o._or([lambda: o.exactly("z")]))
+        self.assertEqual(o.currentError, _MaybeParseError(0, None))
+        o = OMetaBase("xy")
+        o.exactly("x")
+        o._tryNot(lambda: o._tryOr([lambda: o.tryExactly("z")]))
+        self.assertEqual(o.currentError, _MaybeParseError(0, None))
+        self.assertEqual(o.failures.quiet, 0)
+
+    def test_formatReasonMessages(self):
+        """
+        Messages reached at the same position as expectations, like the end
+        of the input, are listed among them, worded as they are alone.
+        """
+        e = _MaybeParseError(2, eof() + expected("token", ","))
+        self.assertEqual(e.formatReason(),
+                         "expected one of end of input, or token ','")
+        self.assertEqual(_MaybeParseError(2, eof()).formatReason(),
+                         "end of input")
+        self.assertEqual(_MaybeParseError(2, expected("token", ","))
+                         .formatReason(), "expected the token ,")
+
+    def test_textPrimitives(self):
+        """
+        The primitives matching strings and characters against text input
+        give the same results and errors as matching one item at a time.
+        """
+        calls = [("exactly", ("f",)), ("exactly", ("x",)),
+                 ("match_string", ("foo",)), ("match_string", ("fox",)),
+                 ("match_string", ("food",)), ("match_string", ("",)),
+                 ("matchCharacters", ("fo",)), ("matchCharacters", ("fx",)),
+                 ("matchCharacters", ("food",)),
+                 ("token", ("foo",)), ("token", ("fox",)),
+                 ("letter", ()), ("digit", ()), ("letterOrDigit", ()),
+                 ("range", ("a", "m")), ("range", ("n", "z"))]
+        def run(o, name, args):
+            # callers rewind the input when a primitive fails
+            try:
+                v, e = getattr(o, name)(*args)
+            except _MaybeParseError, e:
+                return e.__class__, e.args
+            if v is FAIL:
+                return v, e
+            return v, e, o.input
+        for data in ["foo", "  foo", "fo", "", u"foo", "9"]:
+            for name, args in calls:
+                for variant in (name, "try" + name[0].upper() + name[1:]):
+                    if variant == "tryMatch_string":
+                        variant = "tryMatchString"
+                    text = OMetaBase(data)
+                    items = OMetaBase(data)
+                    items.text = None
+                    self.assertEqual(run(text, variant, args),
+                                     run(items, variant, args),
+                                     (data, variant, args))
@@ -0,0 +1,109 @@
+from pymeta.grammar import OMeta
+from pymeta.runtime import ParseError
+from pymeta.trace import TraceLog, Tracer
+from textwrap import dedent
+import unittest
+
+
+class TraceTests(unittest.TestCase):
+    """
+    Tests for grammars reporting parse events, see L{pymeta.trace}.
+    """
+
+    grammar = dedent("""
+    num = <digit+>:d -> int(d)
+    pair = '(' num:a ',' num:b ')' -> a * b
+    grammar = (pair | num):a end -> a
+    """)
+
+    def check(self, sentinel):
+        g = OMeta.makeGrammar(self.grammar, {}, name="Traced",
+                              sentinel=sentinel, trace=True)
+        log = TraceLog()
+        self.assertEqual(g.parse("12", tracer=log), 12)
+        self.assertEqual(log.events, [
+                ('enter', 'grammar', 0),
+                ('enter', 'pair', 0),
+                ('fail', 'pair', 0, 0),
+                ('backtrack', 0, 0),
+                ('enter', 'num', 0),
+                ('enter', 'digit', 0),
+                ('succeed', 'digit', 0, 1),
+                ('enter', 'digit', 1),
+                ('succeed', 'digit', 1, 2),
+                ('enter', 'digit', 2),
+                ('fail', 'digit', 2, 2),
+                ('succeed', 'num', 0, 2),
+                ('enter', 'end', 2),
+                ('succeed', 'end', 2, 2),
+                ('succeed', 'grammar', 0, 2)])
+
+    def test_events(self):
+        """
+        Traced grammars report rules entered, succeeding and failing, and
+        alternatives failing, with their positions.
+        """
+        self.check(False)
+
+    def test_sentinel(self):
+        """
+        Grammars compiled for the sentinel failure protocol report the same
+        events.
+        """
+        self.check(True)
+
+    def test_memoHit(self):
+        """
+        Applications answered from the memo are reported as hits rather
+        than entered.
+        """
+        g = OMeta.makeGrammar(dedent("""
+        word = letter+
+        grammar = word ' ' | word
+        """), {}, name="Memo", trace=True)
+        log = TraceLog()
+        g.parse("ab", tracer=log)
+        words = [e for e in log.events if e[1] == 'word']
+        self.assertEqual(words, [('enter', 'word', 0),
+                                 ('succeed', 'word', 0, 2),
+                                 ('memoHit', 'word', 0),
+                                 ('succeed', 'word', 0, 2)])
+
+    def test_failure(self):
+        """
+        The start rule failing is reported.
+        """
+        g = OMeta.makeGrammar("grammar = 'a' 'b'", {}, name="Failing",
+                              trace=True)
+        log = TraceLog()
+        self.assertRaises(ParseError, g.parse, "ac", tracer=log)
+        self.assertEqual(log.events[:2], [('enter', 'grammar', 0),
+                                          ('fail', 'grammar', 0, 1)])
+
+    def test_tracer(self):
+        """
+        Tracers need only define the events they want.
+        """
+        class Entered(Tracer):
+            def __init__(self):
+                self.rules = []
+            def enter(self, rule, position):
+                self.rules.append(rule)
+        g = OMeta.makeGrammar(self.grammar, {}, name="Entering", trace=True)
+        tracer = Entered()
+        g.parse("(2,3)", tracer=tracer)
+        self.assertEqual(tracer.rules[:3], ['grammar', 'pair', 'num'])
+
+    def test_untraced(self):
+        """
+        Traced grammars parse without a tracer, and grammars compiled
+        without tracing carry no tracing code.
+        """
+        traced = OMeta.makeGrammar(self.grammar, {}, name="Traced",
+                                   trace=True)
+        self.assertEqual(traced.parse("(2,3)"), 6)
+        self.assertTrue('_traceApply' in traced._G_definition[0])
+        plain = OMeta.makeGrammar(self.grammar, {}, name="Plain")
+        self.assertFalse(plain.traced)
+        self.assertFalse('_trace' in plain._G_definition[0])
+        self.assertEqual(plain.parse("(2,3)", tracer=TraceLog()), 6)
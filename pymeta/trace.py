@@ -0,0 +1,80 @@
+"""
+Reporting parse events, to follow what a grammar does on some input.
+
+Grammars made with C{makeGrammar(..., trace=True)} report the events of
+their parses to the tracer of the parser, if it has one::
+
+    Grammar = OMeta.makeGrammar(source, {}, trace=True)
+    log = TraceLog()
+    Grammar.parse(text, tracer=log)
+
+Rule applications are reported where rules apply them and for the rule
+applied at the top level. Each is reported by C{enter}, or by C{memoHit}
+when the memo answers it, then by C{succeed} or C{fail}. Rules whose code
+is generated in place of their applications, see
+L{OMetaBase.inlinedRules}, are reported as part of the rules they are
+inlined in. Grammars compiled without tracing carry no tracing code.
+"""
+
+
+class Tracer(object):
+    """
+    The object parse events are reported to, ignoring them. Subclasses
+    override the methods for the events they want.
+
+    Positions are the integer offsets of L{OMetaBase.position}.
+    """
+
+    def enter(self, rule, position):
+        """
+        A rule is run at C{position}.
+        """
+
+    def memoHit(self, rule, position):
+        """
+        A rule applied at C{position} is answered from the memo.
+        """
+
+    def succeed(self, rule, start, end):
+        """
+        A rule applied at C{start} matched the input up to C{end}.
+        """
+
+    def fail(self, rule, start, position):
+        """
+        A rule applied at C{start} failed, at C{position} if known, or
+        C{None}.
+        """
+
+    def backtrack(self, position, alternative):
+        """
+        The alternative of an ordered choice with index C{alternative}
+        failed, and the input goes back to the C{position} it started at.
+        """
+
+
+class TraceLog(Tracer):
+    """
+    A tracer keeping the events reported as tuples of their name and
+    arguments, such as C{('enter', 'num', 0)}.
+
+    @ivar events: The list of events, in order.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def enter(self, rule, position):
+        self.events.append(('enter', rule, position))
+
+    def memoHit(self, rule, position):
+        self.events.append(('memoHit', rule, position))
+
+    def succeed(self, rule, start, end):
+        self.events.append(('succeed', rule, start, end))
+
+    def fail(self, rule, start, position):
+        self.events.append(('fail', rule, start, position))
+
+    def backtrack(self, position, alternative):
+        self.events.append(('backtrack', position, alternative))
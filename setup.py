@@ -1,4 +1,5 @@
 from setuptools import setup, find_packages
+from pymeta import __version__
 
 DESCRIPTION = 'Parser generator'
 
@@ -9,6 +10,7 @@ except:
     pass
 
 setup(name='pymeta2',
+      version=__version__,
       packages=find_packages(exclude=('tests', 'tests.*')),
       author='Waldemar Kornewald',
       url='http://www.allbuttonspressed.com/projects/pymeta2',
@@ -16,4 +18,7 @@ setup(name='pymeta2',
       long_description=LONG_DESCRIPTION,
       platforms=['any'],
       install_requires=[],
+      entry_points={
+          'console_scripts': ['pymeta-compile = pymeta.compiler:main'],
+      },
 )